@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Batch generation of BioCypher pipeline projects.
+
+Generates one project per entry of a YAML or JSON manifest within a single
+process, so the template is loaded once and the BioCypher version is
+resolved once for all projects. Template variables under `defaults` apply to
+every project; each entry of `projects` overrides them:
+
+    defaults:
+      biocypher_version: latest
+      include_docker: n
+    projects:
+      - project_name: uniprot-pipeline
+        adapter_name: uniprot_adapter
+      - project_name: chembl-pipeline
+        adapter_name: chembl_adapter
+        data_source_type: api
+
+Usage:
+    python generate_batch.py manifest.yaml --output-dir build/ [--no-git] [--uv-lock]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+import yaml
+from cookiecutter.main import cookiecutter
+
+TEMPLATE_DIR = Path(__file__).resolve().parent
+
+
+def load_manifest(path: str | Path) -> list[dict]:
+    """
+    Read a manifest and return the template variables of each project.
+
+    Args:
+        path: Path to a YAML or JSON manifest with `defaults` and `projects`
+
+    Returns:
+        List of template variable dictionaries, one per project
+    """
+    path = Path(path)
+    text = path.read_text()
+    manifest = json.loads(text) if path.suffix == ".json" else yaml.safe_load(text)
+    if isinstance(manifest, list):
+        manifest = {"projects": manifest}
+    defaults = manifest.get("defaults") or {}
+    projects = manifest.get("projects") or []
+    for number, project in enumerate(projects):
+        if "project_name" not in project:
+            raise ValueError(f"Project {number} in {path} has no project_name")
+    return [{**defaults, **project} for project in projects]
+
+
+def generate_projects(
+    projects: list[dict],
+    output_dir: str | Path = ".",
+    git_init: bool = True,
+    overwrite: bool = False,
+    uv_lock: bool = False,
+) -> list[tuple]:
+    """
+    Generate projects from the template, continuing past failed projects.
+
+    Args:
+        projects: Template variables of each project, see `load_manifest`
+        output_dir: Directory the projects are generated in
+        git_init: Whether to initialize a git repository in each project
+        overwrite: Whether to overwrite existing project directories
+        uv_lock: Whether to lock the dependencies of each project with uv,
+            which needs network access
+
+    Returns:
+        List of (project_name, seconds, error) tuples, error is None on success
+    """
+    results = []
+    for context in projects:
+        context = {key: str(value) for key, value in context.items()}
+        context["_git_init"] = "y" if git_init else "n"
+        context["_uv_lock"] = "y" if uv_lock else "n"
+        start = time.perf_counter()
+        try:
+            cookiecutter(
+                str(TEMPLATE_DIR),
+                no_input=True,
+                extra_context=context,
+                output_dir=str(output_dir),
+                overwrite_if_exists=overwrite,
+            )
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        results.append((context["project_name"], time.perf_counter() - start, error))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate BioCypher pipeline projects from a manifest")
+    parser.add_argument("manifest", help="YAML or JSON manifest with `defaults` and `projects`")
+    parser.add_argument("--output-dir", "-o", default=".", help="Directory to generate the projects in")
+    parser.add_argument("--no-git", action="store_true", help="Do not initialize git repositories")
+    parser.add_argument("--overwrite", action="store_true", help="Overwrite existing project directories")
+    parser.add_argument("--uv-lock", action="store_true", help="Lock the dependencies of each project with uv (needs network access)")
+    args = parser.parse_args()
+
+    projects = load_manifest(args.manifest)
+    Path(args.output_dir).mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    results = generate_projects(
+        projects, args.output_dir, git_init=not args.no_git, overwrite=args.overwrite, uv_lock=args.uv_lock
+    )
+    total = time.perf_counter() - start
+
+    print(f"\nGenerated {sum(error is None for _, _, error in results)}/{len(results)} projects in {total:.1f}s")
+    for name, seconds, error in results:
+        print(f"  {'✓' if error is None else '✗'} {name} ({seconds:.2f}s){f': {error}' if error else ''}")
+    sys.exit(1 if any(error for _, _, error in results) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,32 +3,37 @@
 Post-generation hook for {{ cookiecutter.project_name }}.
 
 This script runs after the project is generated to:
-1. Initialize git repository
-2. Create initial commit
-3. Set up additional directories
+1. Set up additional directories
+2. Lock the dependencies with uv, if requested with `_uv_lock=y`
+3. Initialize git repository
+4. Create initial commit
 """
 
 import os
+import shutil
 import subprocess
 import sys
 from pathlib import Path
 
+# Seconds `uv lock` may take to resolve the dependencies
+UV_LOCK_TIMEOUT = 60
 
-def run_command(command, cwd=None):
-    """Run a shell command and return success status."""
+
+def run_command(command: list[str], cwd=None, timeout: float | None = None):
+    """Run a command without a shell and return success status."""
     try:
-        result = subprocess.run(
+        subprocess.run(
             command,
-            shell=True,
             cwd=cwd,
             capture_output=True,
             text=True,
-            check=True
+            check=True,
+            timeout=timeout,
         )
-        print(f"✓ {command}")
+        print(f"✓ {' '.join(command)}")
         return True
-    except subprocess.CalledProcessError as e:
-        print(f"✗ {command} failed: {e.stderr}")
+    except (OSError, subprocess.CalledProcessError, subprocess.TimeoutExpired) as e:
+        print(f"✗ {' '.join(command)} failed: {getattr(e, 'stderr', None) or e}")
         return False
 
 
@@ -38,40 +43,6 @@ def main():
     project_dir = Path(".")
     
     print(f"Setting up {{ cookiecutter.project_name }}...")
-    
-    # Read generated names from pre-gen hook
-    names_file = Path("generated_names.txt")
-    generated_names = {}
-    if names_file.exists():
-        with open(names_file, 'r') as f:
-            for line in f:
-                if '=' in line:
-                    key, value = line.strip().split('=', 1)
-                    generated_names[key] = value
-        names_file.unlink()  # Clean up temporary file
-        print(f"✓ Loaded generated names: {generated_names}")
-    
-    # Handle BioCypher version if "latest" was selected
-    if "{{ cookiecutter.biocypher_version }}" == "latest":
-        latest_version = get_latest_biocypher_version()
-        print(f"Using latest BioCypher version: {latest_version}")
-        
-        # Update pyproject.toml with the actual latest version
-        pyproject_path = project_dir / "pyproject.toml"
-        if pyproject_path.exists():
-            content = pyproject_path.read_text()
-            # Replace the version in the dependencies
-            content = content.replace(
-                'biocypher>={{ cookiecutter.biocypher_version }}',
-                f'biocypher>={latest_version}'
-            )
-            pyproject_path.write_text(content)
-            print(f"✓ Updated pyproject.toml with BioCypher version {latest_version}")
-    
-    # Update adapter files with generated names
-    if generated_names:
-        update_adapter_files(project_dir, generated_names)
-
 
     # Create additional directories
     additional_dirs = ["logs", "output", "data"]
@@ -80,10 +51,22 @@ def main():
         dir_path.mkdir(exist_ok=True)
         print(f"✓ Created directory: {dir_name}/")
     
+    # The Docker image installs the dependencies from uv.lock if there is one;
+    # locking resolves them on PyPI, so it is opt-in and skipped offline. A
+    # failed or timed out lock only leaves the project without uv.lock
+    if "{{ cookiecutter._uv_lock }}" == "y" and "{{ cookiecutter.include_docker }}" == "y":
+        if os.environ.get("BIOCYPHER_COOKIECUTTER_OFFLINE"):
+            print("! Offline, run `uv lock` to pin the dependencies of the Docker image")
+        elif not shutil.which("uv"):
+            print("! uv not found, run `uv lock` to pin the dependencies of the Docker image")
+        elif not run_command(["uv", "lock"], timeout=UV_LOCK_TIMEOUT):
+            print("! Locking failed, run `uv lock` to pin the dependencies of the Docker image")
+    
     # Initialize git repository
-    if run_command("git init"):
-        if run_command("git add ."):
-            run_command(f'git commit -m "Initial commit: {{ cookiecutter.project_name }}"')
+    if "{{ cookiecutter._git_init }}" == "y":
+        if run_command(["git", "init", "--quiet"]):
+            if run_command(["git", "add", "."]):
+                run_command(["git", "commit", "--quiet", "-m", "Initial commit: {{ cookiecutter.project_name }}"])
     
     print(f"\n🎉 {{ cookiecutter.project_name }} setup complete!")
     print(f"\n💡 For the best adaptation experience, use the BioCypher MCP Server:")
@@ -92,71 +75,10 @@ def main():
     print(f"\nNext steps:")
     print(f"1. cd {{ cookiecutter.project_name }}")
     print(f"2. pip install -e .  # or uv sync")
-    print(f"3. Configure your data source in create_knowledge_graph.py")
+    print(f"3. Configure your data sources in config/adapters.yaml")
     print(f"4. Update config/schema_config.yaml if needed")
     print(f"5. python create_knowledge_graph.py")
 
 
-def update_adapter_files(project_dir: Path, generated_names: dict):
-    """Update adapter files with generated standardized names."""
-    adapter_class_name = generated_names.get('adapter_class_name', 'MyResourceAdapter')
-    pascal_case_name = generated_names.get('pascal_case_name', 'MyResource')
-    snake_case_name = generated_names.get('snake_case_name', 'my_resource')
-    
-    # Update adapter file
-    adapter_file = project_dir / "src" / "{{ cookiecutter.package_name }}" / "adapters" / "{{ cookiecutter.adapter_name }}.py"
-    if adapter_file.exists():
-        content = adapter_file.read_text()
-        # Replace placeholders with actual generated names
-        content = content.replace('PLACEHOLDER_ADAPTER_CLASS_NAME', adapter_class_name)
-        content = content.replace('PLACEHOLDER_PASCAL_CASE_NAME', pascal_case_name)
-        adapter_file.write_text(content)
-        print(f"✓ Updated adapter file with {adapter_class_name}")
-    
-    # Update test file
-    test_file = project_dir / "tests" / "test_{{ cookiecutter.adapter_name }}.py"
-    if test_file.exists():
-        content = test_file.read_text()
-        # Replace placeholders with actual generated names
-        content = content.replace('PLACEHOLDER_ADAPTER_CLASS_NAME', adapter_class_name)
-        content = content.replace('PLACEHOLDER_PASCAL_CASE_NAME', pascal_case_name)
-        test_file.write_text(content)
-        print(f"✓ Updated test file with {adapter_class_name}")
-    
-    # Update main script
-    main_script = project_dir / "create_knowledge_graph.py"
-    if main_script.exists():
-        content = main_script.read_text()
-        # Replace placeholders with actual generated names
-        content = content.replace('PLACEHOLDER_ADAPTER_CLASS_NAME', adapter_class_name)
-        content = content.replace('PLACEHOLDER_PASCAL_CASE_NAME', pascal_case_name)
-        main_script.write_text(content)
-        print(f"✓ Updated main script with {adapter_class_name}")
-    
-    # Update adapters __init__.py file
-    adapters_init_file = project_dir / "src" / "{{ cookiecutter.package_name }}" / "adapters" / "__init__.py"
-    if adapters_init_file.exists():
-        content = adapters_init_file.read_text()
-        # Replace placeholders with actual generated names
-        content = content.replace('PLACEHOLDER_ADAPTER_CLASS_NAME', adapter_class_name)
-        adapters_init_file.write_text(content)
-        print(f"✓ Updated adapters __init__.py with {adapter_class_name}")
-
-
-def get_latest_biocypher_version():
-    """Fetch the latest BioCypher version from PyPI."""
-    try:
-        import json
-        import urllib.request
-        url = "https://pypi.org/pypi/biocypher/json"
-        with urllib.request.urlopen(url) as response:
-            data = json.load(response)
-            return data["info"]["version"]
-    except Exception as e:
-        print(f"Warning: Could not fetch latest BioCypher version from PyPI: {e}")
-        print("Falling back to version 0.10.1")
-        return "0.10.1"
-
-
 if __name__ == "__main__":
     main()
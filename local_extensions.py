@@ -0,0 +1,158 @@
+"""
+Jinja extensions for the BioCypher cookiecutter template.
+
+Loaded by cookiecutter through `_extensions` in cookiecutter.json. The
+derived adapter names and the BioCypher version are computed once while the
+context is rendered, so every generated file gets them in a single pass.
+"""
+
+import importlib.metadata
+import json
+import os
+import re
+import time
+import urllib.request
+from functools import lru_cache
+from pathlib import Path
+
+from cookiecutter.utils import simple_filter
+
+FALLBACK_BIOCYPHER_VERSION = "0.10.1"
+PYPI_URL = "https://pypi.org/pypi/biocypher/json"
+PYPI_TIMEOUT = 2.0
+VERSION_CACHE_MAX_AGE = 24 * 3600
+VERSION_CACHE_PATH = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "biocypher-cookiecutter"
+    / "versions.json"
+)
+
+
+def clean_and_convert_to_pascal_case(name: str) -> str:
+    """
+    Convert a name to PascalCase by:
+    1. Replacing all non-alphanumeric characters with spaces
+    2. Splitting on spaces
+    3. Capitalizing each word
+    4. Joining without spaces
+    """
+    # Replace all non-alphanumeric characters with spaces
+    cleaned = re.sub(r'[^a-zA-Z0-9]', ' ', name)
+
+    # Split on spaces and filter out empty strings
+    words = [word for word in cleaned.split() if word]
+
+    # Capitalize each word and join
+    return ''.join(word.capitalize() for word in words)
+
+
+def clean_and_convert_to_snake_case(name: str) -> str:
+    """
+    Convert a name to snake_case by:
+    1. Replacing all non-alphanumeric characters with underscores
+    2. Converting to lowercase
+    3. Removing multiple consecutive underscores
+    """
+    # Replace all non-alphanumeric characters with underscores
+    cleaned = re.sub(r'[^a-zA-Z0-9]', '_', name)
+
+    # Convert to lowercase
+    cleaned = cleaned.lower()
+
+    # Remove multiple consecutive underscores
+    cleaned = re.sub(r'_+', '_', cleaned)
+
+    # Remove leading/trailing underscores
+    cleaned = cleaned.strip('_')
+
+    return cleaned
+
+
+def get_adapter_class_name(name: str) -> str:
+    """PascalCase name with an "Adapter" suffix, unless it already ends with "Adapter"."""
+    pascal_case_name = clean_and_convert_to_pascal_case(name)
+    if pascal_case_name.endswith("Adapter"):
+        return pascal_case_name
+    return f"{pascal_case_name}Adapter"
+
+
+def _read_version_cache() -> dict:
+    try:
+        return json.loads(VERSION_CACHE_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_version_cache(version: str):
+    try:
+        VERSION_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = VERSION_CACHE_PATH.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"biocypher": version, "checked": time.time()}))
+        tmp_path.replace(VERSION_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _fetch_latest_version() -> str:
+    """Fetch the latest BioCypher version from PyPI, giving up after `PYPI_TIMEOUT` seconds."""
+    with urllib.request.urlopen(PYPI_URL, timeout=PYPI_TIMEOUT) as response:
+        return json.load(response)["info"]["version"]
+
+
+@lru_cache(maxsize=None)
+def resolve_biocypher_version(requested: str) -> str:
+    """
+    Resolve the requested BioCypher version, looking up "latest" offline first.
+
+    "latest" is answered from a version cache younger than a day. Otherwise
+    PyPI is asked, unless `BIOCYPHER_COOKIECUTTER_OFFLINE` is set; if that
+    is not possible, an outdated cached version, the installed BioCypher
+    version or a fixed fallback version is used, in that order. The result
+    is kept for the lifetime of the process.
+    """
+    if requested != "latest":
+        return requested
+
+    cached = _read_version_cache()
+    if cached and time.time() - cached.get("checked", 0) < VERSION_CACHE_MAX_AGE:
+        return cached["biocypher"]
+
+    if not os.environ.get("BIOCYPHER_COOKIECUTTER_OFFLINE"):
+        try:
+            version = _fetch_latest_version()
+            _write_version_cache(version)
+            return version
+        except Exception as e:
+            print(f"Warning: Could not fetch latest BioCypher version from PyPI: {e}")
+
+    if cached:
+        return cached["biocypher"]
+    try:
+        return importlib.metadata.version("biocypher")
+    except importlib.metadata.PackageNotFoundError:
+        print(f"Falling back to BioCypher version {FALLBACK_BIOCYPHER_VERSION}")
+        return FALLBACK_BIOCYPHER_VERSION
+
+
+@simple_filter
+def pascal_case(name: str) -> str:
+    """Jinja filter: `{{ "my-resource" | pascal_case }}` gives `MyResource`."""
+    return clean_and_convert_to_pascal_case(name)
+
+
+@simple_filter
+def snake_case(name: str) -> str:
+    """Jinja filter: `{{ "My Resource" | snake_case }}` gives `my_resource`."""
+    return clean_and_convert_to_snake_case(name)
+
+
+@simple_filter
+def adapter_class_name(name: str) -> str:
+    """Jinja filter: `{{ "my_resource" | adapter_class_name }}` gives `MyResourceAdapter`."""
+    return get_adapter_class_name(name)
+
+
+@simple_filter
+def biocypher_version(requested: str) -> str:
+    """Jinja filter resolving a BioCypher version, see `resolve_biocypher_version`."""
+    return resolve_biocypher_version(requested)
@@ -0,0 +1,6 @@
+"""
+Benchmarks for {{ cookiecutter.project_name }}.
+
+Run with `pytest benchmarks/ --bench-rows 1000000`; synthetic input data is
+generated from config/schema_config.yaml by `benchmarks.generate`.
+"""
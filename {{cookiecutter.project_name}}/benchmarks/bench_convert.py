@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark the batch DataFrame-to-tuple conversion against a per-row loop.
+
+Also times building columnar batches, and building them plus creating the
+tuples lazily from them as BioCypher would consume them, and the overhead of
+property type validation on those batches, as the pipeline validates them by
+default, relative to building them and creating the tuples.
+
+Uses the protein, gene and protein_encoded_by_gene entries of
+config/schema_config.yaml on synthetic chunks.
+
+Usage:
+    python benchmarks/bench_convert.py [--rows 100000]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+
+from {{ cookiecutter.package_name }}.columnar import dataframe_to_edge_batch, dataframe_to_node_batch
+from {{ cookiecutter.package_name }}.convert import dataframe_to_edges, dataframe_to_nodes
+from {{ cookiecutter.package_name }}.properties import PropertyValidator
+from {{ cookiecutter.package_name }}.schema import get_input_mappings, load_schema_config
+
+NAIVE_CASTS = {"integer": int, "float": float, "string": str}
+
+
+def naive_to_tuples(chunk: pd.DataFrame, mapping: dict, kind: str) -> list[tuple]:
+    """Reference implementation building and casting every row in Python."""
+    tuples = []
+    for _, row in chunk.iterrows():
+        properties = {}
+        for prop, column in mapping["properties"].items():
+            if column in row and not pd.isna(row[column]):
+                properties[prop] = NAIVE_CASTS.get(mapping["types"].get(prop), lambda v: v)(row[column])
+        if kind == "node":
+            tuples.append((str(row[mapping["columns"]["id"]]), mapping["label"], properties))
+        else:
+            tuples.append((
+                str(row[mapping["columns"]["source"]]),
+                str(row[mapping["columns"]["target"]]),
+                mapping["label"],
+                mapping["label"],
+                properties,
+            ))
+    return tuples
+
+
+def make_chunk(mapping: dict, rows: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Create a synthetic chunk with ~5% nulls in every property column."""
+    data = {column: [f"ID{i}" for i in range(rows)] for column in mapping["columns"].values()}
+    for prop, column in mapping["properties"].items():
+        schema_type = mapping["types"].get(prop)
+        if schema_type == "integer":
+            values = pd.Series(rng.integers(0, 10**8, rows), dtype="float64")
+        elif schema_type == "float":
+            values = pd.Series(rng.random(rows))
+        else:
+            values = pd.Series([f"{prop}-{i}" for i in range(rows)], dtype=object)
+        data[column] = values.mask(rng.random(rows) < 0.05)
+    return pd.DataFrame(data)
+
+
+def time_call(func, *args, repeat: int = 1) -> float:
+    """Return the shortest wall-clock time of `repeat` calls in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per synthetic chunk")
+    parser.add_argument("--schema", default="config/schema_config.yaml", help="Schema configuration path")
+    args = parser.parse_args()
+
+    schema = load_schema_config(args.schema)
+    rng = np.random.default_rng(0)
+    batch = {"node": dataframe_to_nodes, "edge": dataframe_to_edges}
+    columnar = {"node": dataframe_to_node_batch, "edge": dataframe_to_edge_batch}
+    validator = PropertyValidator(schema)
+
+    def columnar_to_tuples(chunk, mapping, kind):
+        for _ in columnar[kind](chunk, mapping):
+            pass
+
+    def validated_to_tuples(chunk, mapping, kind):
+        for _ in validator.validate(columnar[kind](chunk, mapping), kind):
+            pass
+
+    print(f"{'schema entry':<28}{'naive [s]':>12}{'batch [s]':>12}{'speedup':>10}{'columnar [s]':>14}{'+ tuples [s]':>14}{'validation':>12}")
+    for kind in ("node", "edge"):
+        for mapping in get_input_mappings(schema, kind):
+            chunk = make_chunk(mapping, args.rows, rng)
+            naive = time_call(naive_to_tuples, chunk, mapping, kind)
+            vectorized = time_call(batch[kind], chunk, mapping)
+            columns = time_call(columnar[kind], chunk, mapping)
+            lazy = time_call(columnar_to_tuples, chunk, mapping, kind, repeat=3)
+            validated = time_call(validated_to_tuples, chunk, mapping, kind, repeat=3)
+            print(
+                f"{mapping['name']:<28}{naive:>12.3f}{vectorized:>12.3f}{naive / vectorized:>9.1f}x"
+                f"{columns:>14.3f}{lazy:>14.3f}{validated / lazy - 1:>11.1%}"
+            )
+
+
+if __name__ == "__main__":
+    main()
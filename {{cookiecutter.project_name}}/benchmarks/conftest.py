@@ -0,0 +1,34 @@
+"""
+Fixtures for the benchmark suite.
+"""
+
+from pathlib import Path
+
+import pytest
+
+from .generate import generate_dataset
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCHEMA_CONFIG = PROJECT_ROOT / "config" / "schema_config.yaml"
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--bench-rows", type=int, default=100_000,
+        help="Rows per schema entry in the synthetic benchmark data (e.g. 1000000, 10000000)",
+    )
+
+
+@pytest.fixture(scope="session")
+def bench_rows(request) -> int:
+    return request.config.getoption("--bench-rows")
+
+
+@pytest.fixture(scope="session", params=["csv", "parquet"])
+def dataset(request, tmp_path_factory, bench_rows) -> dict:
+    """Synthetic dataset in CSV and Parquet format, generated once per session."""
+    if request.param == "parquet":
+        pytest.importorskip("pyarrow")
+    output_dir = tmp_path_factory.mktemp(f"synthetic-{request.param}")
+    paths = generate_dataset(SCHEMA_CONFIG, output_dir, bench_rows, file_format=request.param)
+    return {"format": request.param, "directory": output_dir, "paths": paths, "rows": bench_rows}
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Synthetic data generator following config/schema_config.yaml.
+
+Writes one input file per schema entry that declares `input_columns`, with
+the columns the adapter expects and values of the declared property types.
+Edge endpoints are drawn from the IDs of the generated source and target
+nodes. Files are written in chunks, so scales like 100M rows do not need
+more memory than one chunk.
+
+Usage:
+    python -m benchmarks.generate --rows 10000000 --format parquet --output data/synthetic
+"""
+
+import argparse
+import logging
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from {{ cookiecutter.package_name }}.schema import get_input_mappings, load_schema_config
+
+logger = logging.getLogger(__name__)
+
+SUFFIXES = {"csv": ".csv", "parquet": ".parquet"}
+
+
+def make_ids(name: str, index: np.ndarray) -> pd.Series:
+    """Create node IDs like `protein_42` for a schema entry."""
+    return f"{name}_" + pd.Series(index, dtype="int64").astype(str)
+
+
+def make_values(prop: str, schema_type: str | None, index: np.ndarray, rng: np.random.Generator) -> pd.Series:
+    """Create values of a schema property type for the given row indices."""
+    if schema_type in ("int", "integer", "long"):
+        return pd.Series(rng.integers(0, 10**9, len(index)))
+    if schema_type in ("float", "double"):
+        return pd.Series(rng.random(len(index)))
+    if schema_type in ("bool", "boolean"):
+        return pd.Series(rng.random(len(index)) < 0.5)
+    return f"{prop}_" + pd.Series(index % 10_000, dtype="int64").astype(str)
+
+
+def make_chunk(schema: dict, mapping: dict, kind: str, index: np.ndarray, node_counts: dict, rng) -> pd.DataFrame:
+    """Create the rows with the given indices for one schema entry."""
+    data = {}
+    if kind == "node":
+        data[mapping["columns"]["id"]] = make_ids(mapping["name"], index)
+    else:
+        entry = schema[mapping["name"]]
+        for field in ("source", "target"):
+            node_type = entry[field]
+            endpoints = rng.integers(0, node_counts.get(node_type, len(index)), len(index))
+            data[mapping["columns"][field]] = make_ids(node_type, endpoints)
+    for prop, column in mapping["properties"].items():
+        data[column] = make_values(prop, mapping["types"].get(prop), index, rng)
+    return pd.DataFrame(data)
+
+
+def get_output_path(output_dir: Path, mapping: dict, file_format: str) -> Path:
+    """Derive the output file from `input_file`, e.g. `proteins/*.csv` -> `proteins/part-00000.parquet`."""
+    name = (mapping["file"] or f"{mapping['name']}.csv").replace("*", "part-00000")
+    return (output_dir / name).with_suffix(SUFFIXES[file_format])
+
+
+def write_chunks(path: Path, chunks, file_format: str):
+    """Stream DataFrame chunks into a CSV or Parquet file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if file_format == "csv":
+        for number, chunk in enumerate(chunks):
+            chunk.to_csv(path, mode="w" if number == 0 else "a", header=number == 0, index=False)
+        return
+
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    writer = None
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def generate_dataset(
+    schema_config_path: str | Path,
+    output_dir: str | Path,
+    rows: int,
+    file_format: str = "csv",
+    chunk_size: int = 1_000_000,
+    seed: int = 0,
+) -> dict[str, Path]:
+    """
+    Generate synthetic input files for all mapped schema entries.
+
+    Args:
+        schema_config_path: Path to the schema configuration
+        output_dir: Directory the files are written to
+        rows: Number of rows per schema entry
+        file_format: Either "csv" or "parquet"
+        chunk_size: Number of rows generated and written at a time
+        seed: Seed of the random number generator
+
+    Returns:
+        Dictionary of written file paths keyed by schema entry name
+    """
+    schema = load_schema_config(schema_config_path)
+    output_dir = Path(output_dir)
+    rng = np.random.default_rng(seed)
+    node_counts = {}
+    paths = {}
+
+    for kind in ("node", "edge"):
+        for mapping in get_input_mappings(schema, kind):
+            path = get_output_path(output_dir, mapping, file_format)
+            chunks = (
+                make_chunk(schema, mapping, kind, np.arange(start, min(start + chunk_size, rows)), node_counts, rng)
+                for start in range(0, rows, chunk_size)
+            )
+            write_chunks(path, chunks, file_format)
+            if kind == "node":
+                node_counts[mapping["name"]] = rows
+            paths[mapping["name"]] = path
+            logger.info(f"Wrote {rows} rows for '{mapping['name']}' to {path}")
+
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic input data from the schema configuration")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Rows per schema entry (e.g. 1000000, 10000000, 100000000)")
+    parser.add_argument("--format", choices=sorted(SUFFIXES), default="csv", help="Output file format")
+    parser.add_argument("--output", default="data/synthetic", help="Output directory")
+    parser.add_argument("--schema", default="config/schema_config.yaml", help="Schema configuration path")
+    parser.add_argument("--chunk-size", type=int, default=1_000_000, help="Rows generated at a time")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    generate_dataset(args.schema, args.output, args.rows, args.format, args.chunk_size, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Extraction throughput, memory and end-to-end write benchmarks.
+
+Throughput is reported by pytest-benchmark; rows/s and peak traced memory
+are attached to each result as extra info.
+"""
+
+import tracemalloc
+from collections import deque
+
+import pytest
+
+from {{ cookiecutter.package_name }}.adapters.{{ cookiecutter.adapter_name }} import {{ cookiecutter.__adapter_class_name }}
+from {{ cookiecutter.package_name }}.parallel import extract_parallel
+
+from .conftest import PROJECT_ROOT, SCHEMA_CONFIG
+
+
+def make_adapter(dataset: dict) -> {{ cookiecutter.__adapter_class_name }}:
+    """Create an adapter reading the synthetic files of a dataset."""
+    adapter = {{ cookiecutter.__adapter_class_name }}(dataset["directory"], schema_config_path=SCHEMA_CONFIG)
+    for name, path in dataset["paths"].items():
+        adapter.schema[name]["input_file"] = str(path.relative_to(dataset["directory"]))
+    return adapter
+
+
+def consume(tuples) -> None:
+    """Exhaust an iterable without keeping its items."""
+    deque(tuples, maxlen=0)
+
+
+@pytest.mark.parametrize("kind", ["node", "edge"])
+def test_extraction_throughput(benchmark, dataset, kind):
+    """Sequential extraction of all nodes or edges."""
+    adapter = make_adapter(dataset)
+    extract = adapter.get_nodes if kind == "node" else adapter.get_edges
+    
+    benchmark.pedantic(lambda: consume(extract()), rounds=3, iterations=1)
+    
+    rows = dataset["rows"] * len(adapter.get_input_files(kind))
+    benchmark.extra_info["rows"] = rows
+    if benchmark.stats:  # None with --benchmark-disable
+        benchmark.extra_info["rows_per_s"] = rows / benchmark.stats.stats.mean
+
+
+@pytest.mark.parametrize("workers", [2, 4])
+def test_parallel_extraction_throughput(benchmark, dataset, workers):
+    """Extraction of all nodes in a process pool."""
+    if dataset["format"] != "csv":
+        pytest.skip("Byte-range sharding applies to CSV input")
+    adapter = make_adapter(dataset)
+    shard_size = max(1, dataset["paths"]["protein"].stat().st_size // (2 * workers))
+    
+    benchmark.pedantic(lambda: consume(extract_parallel(adapter, "node", workers, shard_size)), rounds=3, iterations=1)
+    
+    rows = dataset["rows"] * len(adapter.get_input_files("node"))
+    if benchmark.stats:  # None with --benchmark-disable
+        benchmark.extra_info["rows_per_s"] = rows / benchmark.stats.stats.mean
+
+
+def test_extraction_memory(benchmark, dataset):
+    """Peak memory of extracting all nodes; bounded by the chunk size, not the input size."""
+    adapter = make_adapter(dataset)
+    adapter.chunk_size = 50_000
+    
+    def run():
+        tracemalloc.start()
+        try:
+            consume(adapter.get_nodes())
+            return tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    
+    peak = benchmark.pedantic(run, rounds=1, iterations=1)
+    benchmark.extra_info["peak_traced_mb"] = round(peak / 1024**2, 1)
+
+
+def test_write_end_to_end(benchmark, dataset, tmp_path):
+    """Extraction plus BioCypher's Neo4j CSV writer for all nodes and edges."""
+    biocypher = pytest.importorskip("biocypher")
+    adapter = make_adapter(dataset)
+    
+    def run():
+        output_directory = tmp_path / f"output-{len(list(tmp_path.iterdir()))}"
+        bc = biocypher.BioCypher(
+            biocypher_config_path=str(PROJECT_ROOT / "config" / "biocypher_config.yaml"),
+            schema_config_path=str(SCHEMA_CONFIG),
+            output_directory=str(output_directory),
+        )
+        bc.write_nodes(adapter.get_nodes())
+        bc.write_edges(adapter.get_edges())
+    
+    try:
+        benchmark.pedantic(run, rounds=1, iterations=1)
+    except OSError as e:
+        pytest.skip(f"BioCypher could not load the ontology: {e}")
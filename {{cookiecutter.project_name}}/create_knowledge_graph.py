@@ -2,51 +2,180 @@
 """
 {{ cookiecutter.project_name }} - {{ cookiecutter.project_description }}
 
-This script creates a knowledge graph using BioCypher and the PLACEHOLDER_ADAPTER_CLASS_NAME.
+This script creates a knowledge graph using BioCypher and the adapters listed
+in config/adapters.yaml; the build itself is run by `build.KnowledgeGraphBuild`.
 """
 
+import argparse
 import logging
-from pathlib import Path
+import os
+import sys
 
-from biocypher import BioCypher
-from {{ cookiecutter.package_name }}.adapters.{{ cookiecutter.adapter_name }} import PLACEHOLDER_ADAPTER_CLASS_NAME
+from {{ cookiecutter.package_name }}.build import KnowledgeGraphBuild
+from {{ cookiecutter.package_name }}.checkpoint import DEFAULT_CHECKPOINT_ROWS
+from {{ cookiecutter.package_name }}.dedup import DEFAULT_MAX_NODES
+from {{ cookiecutter.package_name }}.load import DEFAULT_LOAD_SHARD_SIZE, HIGH_PARALLEL_IO, LOAD_MODES
+from {{ cookiecutter.package_name }}.parallel import DEFAULT_SHARD_SIZE
+from {{ cookiecutter.package_name }}.pipeline import DEFAULT_BATCH_SIZE, DEFAULT_DEPTH, PIPELINE_MODES
+from {{ cookiecutter.package_name }}.sample import NodeSample
 
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
 )
-logger = logging.getLogger(__name__)
+
+
+def parse_args(argv: list[str] | None = None):
+    """
+    Parse command line arguments.
+
+    Args:
+        argv: Arguments to parse, `sys.argv[1:]` by default
+    """
+    parser = argparse.ArgumentParser(description="Create the {{ cookiecutter.project_name }} knowledge graph")
+    parser.add_argument(
+        "--workers", type=int, default=1,
+        help="Number of worker processes for extraction (default: 1, sequential)",
+    )
+    parser.add_argument(
+        "--shard-size", type=int, default=DEFAULT_SHARD_SIZE,
+        help="Approximate size in bytes of the byte-range shards CSV files are split into for --workers and checkpoints",
+    )
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Rebuild all schema entries, even if their inputs are unchanged",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Continue schema entries interrupted by a crash after their last checkpoint instead of starting them over",
+    )
+    parser.add_argument(
+        "--checkpoint-rows", type=int, default=DEFAULT_CHECKPOINT_ROWS,
+        help=f"Rows written between two checkpoints (default: {DEFAULT_CHECKPOINT_ROWS}), 0 to only checkpoint whole schema entries",
+    )
+    parser.add_argument(
+        "--checksum", action="store_true",
+        help="Detect changed inputs by content hash instead of modification time and size",
+    )
+    parser.add_argument(
+        "--cache", action="store_true",
+        help="Cache converted batches in BioCypher's cache_directory and replay unchanged shards",
+    )
+    parser.add_argument(
+        "--cache-size", type=float, default=10,
+        help="Maximum size of the batch cache in GB (default: 10)",
+    )
+    parser.add_argument(
+        "--warm-cache", action="store_true",
+        help="Parse the ontologies and the schema configuration into the ontology cache and exit",
+    )
+    parser.add_argument(
+        "--no-ontology-cache", action="store_true",
+        help="Let BioCypher parse the ontologies instead of loading them from the ontology cache",
+    )
+    parser.add_argument(
+        "--prometheus", metavar="PATH",
+        help="Also write the pipeline metrics to a Prometheus textfile, e.g. for the node exporter",
+    )
+    parser.add_argument(
+        "--validate-edges", choices=["drop", "report"],
+        help="Check edge endpoints against the written node IDs and drop or only report dangling edges",
+    )
+    parser.add_argument(
+        "--no-property-validation", action="store_true",
+        help="Do not check property values against the types declared in the schema configuration",
+    )
+    parser.add_argument(
+        "--deduplicate", action="store_true",
+        help="Merge nodes with the same ID using the merge_strategy of their schema entry",
+    )
+    parser.add_argument(
+        "--dedup-max-nodes", type=int, default=DEFAULT_MAX_NODES,
+        help=f"Distinct node IDs held in memory before deduplication spills to disk (default: {DEFAULT_MAX_NODES})",
+    )
+    parser.add_argument(
+        "--pipeline", choices=PIPELINE_MODES,
+        help="Extract in a background thread or process that feeds the writer through a bounded queue",
+    )
+    parser.add_argument(
+        "--pipeline-depth", type=int, default=DEFAULT_DEPTH,
+        help=f"Batches of {DEFAULT_BATCH_SIZE} tuples buffered per stage with --pipeline (default: {DEFAULT_DEPTH})",
+    )
+    parser.add_argument(
+        "--concurrent-stages", action="store_true",
+        help="With --pipeline, extract all schema entries at once instead of one after the other",
+    )
+    parser.add_argument(
+        "--columnar", action="store_true",
+        help="Pass columnar batches instead of per-row tuples through the pipeline until they are written",
+    )
+    parser.add_argument(
+        "--parallel-adapters", type=int, default=1,
+        help="Extract up to this many adapters of config/adapters.yaml at once, each in a worker process",
+    )
+    sampling = parser.add_mutually_exclusive_group()
+    sampling.add_argument(
+        "--sample", type=int, metavar="N",
+        help="Only build a hash-stable sample of N nodes per schema entry, their edges and targets, in output/sample",
+    )
+    sampling.add_argument(
+        "--fraction", type=float, metavar="P",
+        help="Only build a hash-stable sample of this fraction of the nodes and their edges, in output/sample",
+    )
+    parser.add_argument(
+        "--load", choices=LOAD_MODES,
+        help="Bulk load the output into Neo4j with neo4j-admin, in the docker compose neo4j service or locally",
+    )
+    parser.add_argument(
+        "--load-threads", type=int, default=os.cpu_count(),
+        help="Threads of neo4j-admin database import with --load (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--high-parallel-io", choices=HIGH_PARALLEL_IO, default="auto",
+        help="Set to 'on' for SSD/NVMe storage with --load (default: auto)",
+    )
+    parser.add_argument(
+        "--load-shard-size", type=int, default=DEFAULT_LOAD_SHARD_SIZE,
+        help="Size in bytes above which CSV part files are copied into shards for --load (default: 0, no sharding)",
+    )
+    args = parser.parse_args(argv)
+    if args.concurrent_stages and not args.pipeline:
+        parser.error("--concurrent-stages requires --pipeline")
+    if args.parallel_adapters > 1 and args.pipeline:
+        parser.error("--parallel-adapters cannot be combined with --pipeline")
+    if args.resume and args.full:
+        parser.error("--resume cannot be combined with --full")
+    # These builds are only checkpointed once a schema entry is complete
+    unresumable = [
+        flag for flag, value in (
+            ("--deduplicate", args.deduplicate),
+            ("--validate-edges", args.validate_edges),
+            ("--pipeline", args.pipeline),
+            ("--parallel-adapters", args.parallel_adapters > 1),
+            ("--checkpoint-rows 0", args.checkpoint_rows <= 0),
+        )
+        if value
+    ]
+    if args.resume and unresumable:
+        parser.error(f"--resume cannot be combined with {', '.join(unresumable)}, which write whole schema entries")
+    if args.sample is not None or args.fraction is not None:
+        if args.load or args.resume:
+            parser.error("--sample and --fraction cannot be combined with --load or --resume")
+        try:
+            args.node_sample = NodeSample(fraction=args.fraction, size=args.sample)
+        except ValueError as e:
+            parser.error(str(e))
+    else:
+        args.node_sample = None
+    if args.warm_cache and args.no_ontology_cache:
+        parser.error("--warm-cache cannot be combined with --no-ontology-cache")
+    return args
 
 
 def main():
     """Main function to create the knowledge graph."""
-    logger.info("Starting {{ cookiecutter.project_name }} knowledge graph creation")
-    
-    # Initialize BioCypher
-    bc = BioCypher(
-        biocypher_config_path="config/biocypher_config.yaml",
-        schema_config_path="config/schema_config.yaml"
-    )
-    
-    # Initialize the adapter
-    # TODO: Configure your CSV data source path here
-    data_source = "data/your_data.csv"  # Update this with your actual CSV file path
-    
-    adapter = PLACEHOLDER_ADAPTER_CLASS_NAME(
-        data_source=data_source,
-        # Add any additional configuration parameters here
-    )
-    
-    # Create the knowledge graph
-    logger.info("Creating knowledge graph...")
-    bc.write_nodes(adapter.get_nodes())
-    bc.write_edges(adapter.get_edges())
-    
-    logger.info("Knowledge graph creation completed successfully!")
-
-    # Create final summary
-    bc.summary()
+    sys.exit(KnowledgeGraphBuild(parse_args()).run())
 
 
 if __name__ == "__main__":
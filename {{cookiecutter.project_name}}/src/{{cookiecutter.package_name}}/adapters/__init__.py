@@ -2,6 +2,6 @@
 Adapters for {{ cookiecutter.project_name }}.
 """
 
-from .{{ cookiecutter.adapter_name }} import PLACEHOLDER_ADAPTER_CLASS_NAME
+from .{{ cookiecutter.adapter_name }} import {{ cookiecutter.__adapter_class_name }}
 
-__all__ = ["PLACEHOLDER_ADAPTER_CLASS_NAME"]
+__all__ = ["{{ cookiecutter.__adapter_class_name }}"]
@@ -1,108 +1,335 @@
 """
-PLACEHOLDER_PASCAL_CASE_NAME Adapter
+{{ cookiecutter.__pascal_case_name }} Adapter
 
 This adapter handles CSV data source for BioCypher.
 """
 
+import io
 import logging
+import os
+import time
+from itertools import islice
 from pathlib import Path
+from urllib.parse import urljoin
 import pandas as pd
 
+from ..cache import BatchCache, make_key
+from ..columnar import dataframe_to_edge_batch, dataframe_to_node_batch
+from ..convert import dataframe_to_edges, dataframe_to_nodes
+from ..fetch import ApiClient, is_url
+from ..parallel import ByteRangeReader, read_header, split_byte_ranges, split_row_groups
+from ..readers import (
+    filter_dataframe,
+    get_compression,
+    get_delimiter,
+    get_format,
+    open_input,
+    read_arrow_batches,
+    read_columns,
+)
+from ..sample import NodeSample
+from ..schema import DEFAULT_SCHEMA_CONFIG_PATH, get_input_mappings, load_schema_config
+
 logger = logging.getLogger(__name__)
 
 
-class PLACEHOLDER_ADAPTER_CLASS_NAME:
+class {{ cookiecutter.__adapter_class_name }}:
     """
     Adapter for CSV data source.
     
-    This adapter implements the BioCypher adapter interface for CSV data.
+    This adapter implements the BioCypher adapter interface for CSV data,
+    with Parquet, Feather and Arrow IPC files as columnar alternatives
+    (detected by file suffix). CSV/TSV files may be gzip, bzip2 or zstd
+    compressed and are decompressed as they are read. Input files are read in
+    chunks, so memory use is bounded by the chunk size rather than by the
+    size of the data source.
+    The mapping from CSV columns to node and edge tuples is declared in the
+    schema configuration via the `input_file` and `input_columns` keys.
+    
+    Schema entries with an `input_url` are fetched from a paginated JSON API
+    instead, if an API client is configured; nested records are flattened,
+    so `input_columns` refer to dot-separated fields such as
+    `organism.scientificName`.
     """
     
-    def __init__(self, data_source: str | Path, **kwargs):
+    def __init__(
+        self,
+        data_source: str | Path,
+        schema_config_path: str | Path = DEFAULT_SCHEMA_CONFIG_PATH,
+        chunk_size: int = 100_000,
+        filters: dict[str, dict] | None = None,
+        cache: BatchCache | None = None,
+        base_url: str | None = None,
+        api_client: ApiClient | None = None,
+        sample: NodeSample | None = None,
+        **kwargs,
+    ):
         """
         Initialize the adapter.
         
         Args:
-            data_source: Path to the CSV data source
+            data_source: Path to a CSV file or to a directory of CSV files
+            schema_config_path: Path to the schema configuration holding the
+                column mapping
+            chunk_size: Number of rows read from a CSV file at a time
+            filters: Row filters per schema entry, e.g.
+                `{"protein": {"organism": "Homo sapiens"}}`; values may be
+                lists of accepted values. Pushed down to the scanner for
+                Parquet/Arrow input.
+            cache: Cache of converted batches to replay unchanged shards from
+            base_url: Base URL that relative `input_url` values are resolved against
+            api_client: Client used to fetch `input_url` resources; schema
+                entries with an `input_url` are skipped if None
+            sample: Only extract the sampled nodes and their edges; the
+                sample has to be drawn first, see `get_node_ids` and
+                `get_edge_ids`
             **kwargs: Additional configuration parameters
         """
         self.data_source = data_source
+        self.schema_config_path = schema_config_path
+        self.chunk_size = chunk_size
+        self.filters = filters or {}
+        self.cache = cache
+        self.base_url = base_url
+        self.api_client = api_client
+        self.sample = sample
         self.config = kwargs
-        logger.info(f"Initialized PLACEHOLDER_ADAPTER_CLASS_NAME with data source: {data_source}")
+        self._schema = None
+        # Page iterators of API resources being fetched, by entry name and URL
+        self._prefetched = {}
+        logger.info(f"Initialized {{ cookiecutter.__adapter_class_name }} with data source: {data_source}")
+    
+    @property
+    def schema(self) -> dict:
+        """Schema configuration, loaded on first access."""
+        if self._schema is None:
+            self._schema = load_schema_config(self.schema_config_path)
+        return self._schema
         
-    def get_nodes(self):
+    def get_nodes(self, entries: list[str] | None = None):
         """
         Extract nodes from the data source.
         
+        Args:
+            entries: Names of the schema entries to extract; all by default
+        
         Yields:
             Tuples of (node_id, node_label, properties_dict) for each node
         """
         logger.info("Extracting nodes from data source")
         
-        # Dummy protein nodes matching schema
-        protein_nodes = [
-            ("P12345", "protein", {
-                "name": "Insulin",
-                "description": "Hormone that regulates glucose metabolism",
-                "organism": "Homo sapiens",
-                "sequence": "MALWMRLLPLLALLALWGPDPAAAFVNQHLCGSHLVEALYLVCGERGFFYTPKTRREAEDLQVGQVELGGGPGAGSLQPLALEGSLQKRGIVEQCCTSICSLYQLENYCN"
-            }),
-            ("P01308", "protein", {
-                "name": "Insulin-like growth factor I",
-                "description": "Growth factor involved in cell growth and differentiation",
-                "organism": "Homo sapiens",
-                "sequence": "MGFPLRPVAVYFLHRGQHSRGEASLLCLKDQELVCGDREVFPLPPEVGQKVEVTTDINGQYKRVPQCSQCHSVECSVCQDLWELVDTQYCT"
-            }),
-        ]
-        
-        # Dummy gene nodes matching schema
-        gene_nodes = [
-            ("ENSG00000129965", "gene", {
-                "name": "INS",
-                "symbol": "INS",
-                "description": "Insulin gene",
-                "chromosome": "11",
-                "start_position": 2157796,
-                "end_position": 2160023
-            }),
-            ("ENSG00000117411", "gene", {
-                "name": "IGF1",
-                "symbol": "IGF1",
-                "description": "Insulin-like growth factor 1 gene",
-                "chromosome": "12",
-                "start_position": 102395880,
-                "end_position": 102481116
-            }),
-        ]
-        
-        for node in protein_nodes + gene_nodes:
-            yield node
-        
-        logger.info(f"Extracted {len(protein_nodes) + len(gene_nodes)} nodes")
-    
-    def get_edges(self):
+        for mapping, shard in self._iter_shards("node", entries):
+            yield from self.get_shard_nodes(mapping, shard)
+    
+    def get_edges(self, entries: list[str] | None = None):
         """
         Extract edges from the data source.
         
+        Args:
+            entries: Names of the schema entries to extract; all by default
+        
         Yields:
             Tuples of (source_id, target_id, edge_label, edge_type, properties_dict) for each edge
         """
         logger.info("Extracting edges from data source")
         
-        # Dummy edges matching schema (protein_encoded_by_gene with input_label "encoded_by")
-        edges = [
-            ("P12345", "ENSG00000129965", "encoded_by", "encoded_by", {
-                "confidence": 0.95,
-                "evidence": "experimental"
-            }),
-            ("P01308", "ENSG00000117411", "encoded_by", "encoded_by", {
-                "confidence": 0.98,
-                "evidence": "experimental"
-            }),
-        ]
-        
-        for edge in edges:
-            yield edge
+        for mapping, shard in self._iter_shards("edge", entries):
+            yield from self.get_shard_edges(mapping, shard)
+    
+    def get_node_batches(self, entries: list[str] | None = None):
+        """
+        Extract nodes from the data source as columnar batches.
+        
+        Cheaper than `get_nodes` for large inputs, as no dictionary is built
+        per row; pass the batches through `columnar.iter_tuples` to write them
+        with BioCypher.
+        
+        Args:
+            entries: Names of the schema entries to extract; all by default
+        
+        Yields:
+            One `ColumnarBatch` per chunk of input rows
+        """
+        for mapping, shard in self._iter_shards("node", entries):
+            yield from self.get_shard_batches("node", mapping, shard)
+    
+    def get_edge_batches(self, entries: list[str] | None = None):
+        """
+        Extract edges from the data source as columnar batches, see `get_node_batches`.
+        
+        Args:
+            entries: Names of the schema entries to extract; all by default
+        
+        Yields:
+            One `ColumnarBatch` per chunk of input rows
+        """
+        for mapping, shard in self._iter_shards("edge", entries):
+            yield from self.get_shard_batches("edge", mapping, shard)
+    
+    def _iter_shards(self, kind: str, entries: list[str] | None = None):
+        """
+        Iterate the shards of some schema entries for sequential extraction.
+        
+        API resources among them are all fetched at once on one connection
+        pool, each a few pages ahead, while the shards are extracted in turn.
+        """
+        shards = self.get_shards(kind, entries=entries)
+        resources = [(mapping, shard[0]) for mapping, shard in shards if is_url(shard[0])]
+        if len(resources) < 2:
+            yield from shards
+            return
+        fetcher = self.api_client.fetch_resources([(url, mapping["records"], mapping["pagination"]) for mapping, url in resources])
+        keys = [(mapping["name"], url) for mapping, url in resources]
+        self._prefetched.update((key, fetcher.pages(index)) for index, key in enumerate(keys))
+        try:
+            yield from shards
+        finally:
+            for key in keys:
+                self._prefetched.pop(key, None)
+            fetcher.close()
+    
+    def get_shards(self, kind: str, shard_size: int | None = None, entries: list[str] | None = None) -> list[tuple]:
+        """
+        List the shards of the data source for one kind of tuple.
+        
+        Every input file and every API resource is a shard of its own. With
+        `shard_size`, uncompressed CSV files are additionally split into
+        line-aligned byte ranges of about that size, and Parquet files into
+        byte ranges of whole row groups.
+        
+        Args:
+            kind: Either "node" or "edge"
+            shard_size: Approximate size of a byte-range shard in bytes
+            entries: Names of the schema entries to include; all by default
+        
+        Returns:
+            List of (mapping, (path, start, end)) tuples in extraction order;
+            `end` is None for a whole file, `path` is the URL of an API resource
+        """
+        shards = []
+        for mapping in get_input_mappings(self.schema, kind):
+            if entries is not None and mapping["name"] not in entries:
+                continue
+            if mapping["url"] and self.api_client is None:
+                logger.warning(f"Skipping '{mapping['name']}': no API client configured for its input_url")
+                continue
+            if mapping["url"]:
+                shards.extend((mapping, (url, 0, None)) for url in self._resolve_urls(mapping))
+                continue
+            for path in self._resolve_input_files(mapping):
+                if shard_size and get_format(path) == "csv" and get_compression(path) is None:
+                    shards.extend((mapping, shard) for shard in split_byte_ranges(path, shard_size))
+                elif shard_size and get_format(path) == "parquet":
+                    shards.extend((mapping, shard) for shard in split_row_groups(path, shard_size))
+                else:
+                    shards.append((mapping, (path, 0, None)))
+        return shards
+    
+    def get_input_files(self, kind: str) -> dict[str, list[Path]]:
+        """
+        List the input files of every schema entry of one kind.
+        
+        Args:
+            kind: Either "node" or "edge"
+        
+        Returns:
+            Dictionary of input file paths keyed by schema entry name; empty
+            for entries fetched from an API
+        """
+        return {mapping["name"]: self._resolve_input_files(mapping) for mapping in get_input_mappings(self.schema, kind)}
+    
+    def get_shard_nodes(self, mapping: dict, shard: tuple):
+        """
+        Extract the nodes of one shard.
+        
+        Yields:
+            Tuples of (node_id, node_label, properties_dict) for each node
+        """
+        for batch in self.get_shard_chunks("node", mapping, shard):
+            yield from batch
+    
+    def get_shard_edges(self, mapping: dict, shard: tuple):
+        """
+        Extract the edges of one shard.
+        
+        Yields:
+            Tuples of (source_id, target_id, edge_label, edge_type, properties_dict) for each edge
+        """
+        for batch in self.get_shard_chunks("edge", mapping, shard):
+            yield from batch
+    
+    def get_shard_batches(self, kind: str, mapping: dict, shard: tuple):
+        """
+        Extract the nodes or edges of one shard as columnar batches.
+        
+        Yields:
+            One `ColumnarBatch` per chunk of input rows
+        """
+        yield from self.get_shard_chunks(kind, mapping, shard, columnar=True)
+    
+    def get_shard_chunks(self, kind: str, mapping: dict, shard: tuple, columnar: bool = False, skip: int = 0):
+        """
+        Extract the nodes or edges of one shard chunk by chunk.
+        
+        Chunks are numbered in input order, so a checkpoint can record how
+        many chunks of a shard were written and `skip` resumes after them.
+        Skipped chunks are read but not converted.
+        
+        Args:
+            kind: Either "node" or "edge"
+            mapping: Input mapping of the schema entry
+            shard: Shard as returned by `get_shards`
+            columnar: Yield columnar batches instead of lists of tuples
+            skip: Number of leading chunks to leave out
+        
+        Yields:
+            One list of tuples or `ColumnarBatch` per chunk of input rows
+        """
+        if columnar:
+            convert = dataframe_to_node_batch if kind == "node" else dataframe_to_edge_batch
+        else:
+            convert = dataframe_to_nodes if kind == "node" else dataframe_to_edges
+        if skip:
+            # A partial shard is never cached
+            chunks = islice(self._read_chunks(mapping, shard), skip, None)
+            yield from (convert(chunk, mapping) for chunk in chunks)
+            return
+        yield from self._convert_shard(kind, mapping, shard, convert)
+    
+    def get_node_ids(self, entries: list[str] | None = None):
+        """
+        Read the node IDs of the data source, ignoring the sample.
+        
+        Used to draw a sample, whose nodes depend on all IDs of a schema
+        entry if it has a fixed size.
+        
+        Args:
+            entries: Names of the node schema entries to include; all by default
+        
+        Yields:
+            Tuples of (schema entry name, Series of IDs) per chunk
+        """
+        for mapping, shard in self.get_shards("node", entries=entries):
+            for chunk in self._read_shard(mapping, shard):
+                yield mapping["name"], chunk[mapping["columns"]["id"]]
+    
+    def get_edge_ids(self, entries: list[str] | None = None):
+        """
+        Read the source and target IDs of the edges, ignoring the sample.
+        
+        Used to pull the targets of sampled edges into the sample.
+        
+        Args:
+            entries: Names of the edge schema entries to include; all by default
+        
+        Yields:
+            Tuples of (schema entry name, Series of source IDs, Series of
+            target IDs) per chunk
+        """
+        for mapping, shard in self.get_shards("edge", entries=entries):
+            columns = mapping["columns"]
+            for chunk in self._read_shard(mapping, shard):
+                yield mapping["name"], chunk[columns["source"]], chunk[columns["target"]]
     
     def get_metadata(self) -> dict[str, any]:
         """
@@ -112,29 +339,226 @@ class PLACEHOLDER_ADAPTER_CLASS_NAME:
             Dictionary containing metadata
         """
         return {
-            'name': 'PLACEHOLDER_ADAPTER_CLASS_NAME',
+            'name': '{{ cookiecutter.__adapter_class_name }}',
             'data_source': str(self.data_source),
-            'data_type': 'csv',
+            'data_type': self._get_data_type(),
             'version': '{{ cookiecutter.version }}',
-            'adapter_class': 'PLACEHOLDER_ADAPTER_CLASS_NAME'
+            'adapter_class': '{{ cookiecutter.__adapter_class_name }}'
         }
     
     def validate_data_source(self) -> bool:
         """
         Validate that the CSV data source is accessible and properly formatted.
         
+        Only the header of each input file is read, so compressed files are
+        decompressed no further than their first block. For a directory, the
+        input files of all schema entries must contain the mapped ID columns.
+        
         Returns:
             True if data source is valid, False otherwise
         """
         try:
             data_path = Path(self.data_source)
-            if not data_path.exists() or not data_path.is_file():
+            if not data_path.exists():
                 return False
+            if data_path.is_file():
+                return len(read_columns(data_path)) > 0
             
-            # Try to read the CSV to validate format
-            df = pd.read_csv(data_path, nrows=1)  # Read just first row
-            return len(df.columns) > 0
+            checked = 0
+            for kind in ("node", "edge"):
+                for mapping in get_input_mappings(self.schema, kind):
+                    for path in self._resolve_input_files(mapping):
+                        missing = [c for c in mapping["columns"].values() if c not in read_columns(path)]
+                        if missing:
+                            logger.error(f"Input file {path} for '{mapping['name']}' lacks the columns {missing}")
+                            return False
+                        checked += 1
+            return checked > 0
             
         except Exception as e:
             logger.error(f"Data source validation failed: {e}")
             return False
+    
+    def _get_data_type(self) -> str:
+        """Describe the input format(s), e.g. "csv" or "csv,parquet"."""
+        if Path(self.data_source).suffix:
+            return get_format(self.data_source)
+        mappings = [m for kind in ("node", "edge") for m in get_input_mappings(self.schema, kind)]
+        formats = {get_format(m["file"]) for m in mappings if m["file"] and not m["url"]}
+        if self.api_client is not None and any(m["url"] for m in mappings):
+            formats.add("api")
+        return ",".join(sorted(formats)) or "csv"
+    
+    def _resolve_input_files(self, mapping: dict) -> list[Path]:
+        """
+        Resolve the input files of a schema entry against the data source.
+        
+        `input_file` may be a glob pattern such as `proteins/*.csv`; matches
+        are returned in sorted order. Missing files are logged and skipped.
+        """
+        if mapping["url"]:
+            return []
+        data_path = Path(self.data_source)
+        if mapping["file"] is None:
+            paths = [data_path]
+        else:
+            base = data_path.parent if data_path.is_file() else data_path
+            paths = sorted(base.glob(mapping["file"])) if any(c in mapping["file"] for c in "*?[") else [base / mapping["file"]]
+        
+        existing = [path for path in paths if path.is_file()]
+        if not existing:
+            logger.warning(f"Input file for '{mapping['name']}' not found: {mapping['file'] or data_path}")
+        return existing
+    
+    def _resolve_urls(self, mapping: dict) -> list[str]:
+        """Resolve the `input_url` (a URL or a list of URLs) of a schema entry against the base URL."""
+        urls = mapping["url"] if isinstance(mapping["url"], list) else [mapping["url"]]
+        if self.base_url is None:
+            return urls
+        return [urljoin(self.base_url.rstrip("/") + "/", url) for url in urls]
+    
+    def _convert_shard(self, kind: str, mapping: dict, shard: tuple, convert):
+        """
+        Convert the chunks of a shard, replaying them from the cache if possible.
+        
+        Shards are cached as columnar batches, whichever form is asked for,
+        so the cache can store them as Arrow files; tuples are created from
+        the batches on the way out.
+        
+        Returns:
+            Iterable of batches, one per chunk: lists of tuples, or columnar
+            batches for the `columnar` converters
+        """
+        # API responses are cached by the API client instead; samples are
+        # not cached
+        if self.cache is None or self.sample is not None or is_url(shard[0]):
+            return (convert(chunk, mapping) for chunk in self._read_chunks(mapping, shard))
+        
+        to_batch = dataframe_to_node_batch if kind == "node" else dataframe_to_edge_batch
+        path, start, end = shard
+        stat = os.stat(path)
+        key = make_key(mapping, self.filters.get(mapping["name"]), str(path), start, end,
+                       stat.st_size, stat.st_mtime_ns, self.chunk_size, to_batch.__name__)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"Replaying '{mapping['name']}' from cache for {path}")
+            batches = self._replay_shard(cached, mapping, shard, to_batch)
+        else:
+            batches = self.cache.put(key, (to_batch(chunk, mapping) for chunk in self._read_chunks(mapping, shard)))
+        if convert is to_batch:
+            return batches
+        return (list(batch.to_tuples()) for batch in batches)
+    
+    def _replay_shard(self, cached, mapping: dict, shard: tuple, convert):
+        """Replay a cached shard, converting the input from where the replay stopped if chunk files were evicted meanwhile."""
+        replayed = 0
+        try:
+            for batch in cached:
+                yield batch
+                replayed += 1
+        except FileNotFoundError:
+            logger.warning(f"Cached chunks of '{mapping['name']}' for {shard[0]} were evicted during the replay, reading the rest again")
+            chunks = islice(self._read_chunks(mapping, shard), replayed, None)
+            yield from (convert(chunk, mapping) for chunk in chunks)
+    
+    def _read_chunks(self, mapping: dict, shard: tuple):
+        """Read one shard in chunks, keeping only the sampled rows if a sample is set."""
+        chunks = self._read_shard(mapping, shard)
+        if self.sample is None:
+            return chunks
+        return (self.sample.filter_chunk(chunk, mapping) for chunk in chunks)
+    
+    def _read_shard(self, mapping: dict, shard: tuple):
+        """
+        Read one shard of a schema entry's input in chunks.
+        
+        Only the mapped columns are parsed and rows not matching the
+        configured filters are dropped. Throughput is logged once the
+        shard is exhausted; it includes the time spent by the consumer of
+        the generator.
+        
+        Yields:
+            DataFrames of at most `chunk_size` rows
+        """
+        path, start, end = shard
+        if is_url(path):
+            yield from self._log_throughput(self._read_api_chunks(mapping, path), mapping, path)
+            return
+        
+        file_format = get_format(path)
+        filters = self.filters.get(mapping["name"])
+        columns = list(mapping["columns"].values())
+        header = read_columns(path)
+        usecols = columns + [c for c in mapping["properties"].values() if c in header and c not in columns]
+        usecols += [c for c in (filters or {}) if c not in usecols]
+        
+        if file_format != "csv":
+            byte_range, location = (None, str(path)) if end is None else ((start, end), f"{path} [{start}:{end}]")
+            chunks = read_arrow_batches(path, file_format, usecols, filters, self.chunk_size, byte_range)
+            yield from self._log_throughput(chunks, mapping, location)
+            return
+        
+        # Keep IDs and string properties as text, e.g. to preserve leading zeros
+        dtype = {c: str for c in columns}
+        dtype.update({
+            column: str
+            for prop, column in mapping["properties"].items()
+            if mapping["types"].get(prop) == "string" and column in usecols
+        })
+        
+        if end is None and get_compression(path) is not None:
+            source, location = open_input(path), str(path)
+        elif end is None:
+            source, location = path, str(path)
+        else:
+            source = io.BufferedReader(ByteRangeReader(path, start, end, read_header(path)))
+            location = f"{path} [{start}:{end}]"
+        
+        try:
+            with pd.read_csv(source, chunksize=self.chunk_size, usecols=usecols, dtype=dtype, sep=get_delimiter(path)) as reader:
+                chunks = (filter_dataframe(chunk, filters) for chunk in reader)
+                yield from self._log_throughput(chunks, mapping, location)
+        finally:
+            if source is not path:
+                source.close()
+    
+    def _read_api_chunks(self, mapping: dict, url: str):
+        """
+        Fetch an API resource and collect its records into chunks.
+        
+        Yields:
+            DataFrames of at most `chunk_size` rows with the mapped columns
+        """
+        filters = self.filters.get(mapping["name"])
+        columns = list(mapping["columns"].values())
+        usecols = columns + [c for c in mapping["properties"].values() if c not in columns]
+        usecols += [c for c in (filters or {}) if c not in usecols]
+        
+        def to_frame(records: list) -> pd.DataFrame:
+            chunk = pd.json_normalize(records).reindex(columns=usecols)
+            return filter_dataframe(chunk, filters)
+        
+        pages = self._prefetched.pop((mapping["name"], url), None)
+        if pages is None:
+            pages = self.api_client.iter_pages(url, mapping["records"], mapping["pagination"])
+        records = []
+        for page in pages:
+            records.extend(page)
+            while len(records) >= self.chunk_size:
+                yield to_frame(records[:self.chunk_size])
+                records = records[self.chunk_size:]
+        if records:
+            yield to_frame(records)
+    
+    @staticmethod
+    def _log_throughput(chunks, mapping: dict, location: str):
+        """Pass chunks through and log the row throughput once exhausted."""
+        rows = 0
+        started = time.perf_counter()
+        for chunk in chunks:
+            rows += len(chunk)
+            yield chunk
+        
+        elapsed = time.perf_counter() - started
+        rate = rows / elapsed if elapsed > 0 else float("inf")
+        logger.info(f"Read {rows} rows for '{mapping['name']}' from {location} in {elapsed:.2f}s ({rate:,.0f} rows/s)")
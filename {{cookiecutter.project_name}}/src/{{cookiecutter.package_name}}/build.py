@@ -0,0 +1,621 @@
+"""
+Knowledge graph builds for {{ cookiecutter.project_name }}.
+
+`KnowledgeGraphBuild` runs one build with the adapters listed in
+`config/adapters.yaml`. It plans the stages (the nodes or the edges of one
+schema entry) whose inputs changed since the last build, draws the sample of
+a sampled build, and extracts the stages one after the other, in the
+background or per adapter in worker processes. A stage listed by several
+adapters is extracted from each of them, and with --deduplicate the node
+stages of all entries sharing an `input_label` are merged into one. BioCypher
+writes every stage while the build checks its properties and edge endpoints
+and keeps the build manifest, the checkpoints and the metrics up to date. The
+reports and the optional bulk load into Neo4j follow once all stages are
+written.
+"""
+
+import logging
+import pickle
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+from functools import partial
+from itertools import chain
+from pathlib import Path
+
+import yaml
+from biocypher import BioCypher
+from biocypher._config import config as get_biocypher_setting
+
+from . import __version__
+from .cache import BatchCache, compute_namespace
+from .checkpoint import BuildCheckpoint, CheckpointedStream, iter_shard_chunks, remove_orphaned_parts
+from .columnar import iter_tuples
+from .dedup import NodeDeduplicator, get_list_properties
+{%- if cookiecutter.data_source_type == "api" %}
+from .fetch import ApiClient
+{%- endif %}
+from .instrumentation import PipelineMetrics
+from .load import load_graph
+from .manifest import BuildManifest
+from .ontology import OntologyCache, attach_ontology, parse_ontology
+from .parallel import extract_parallel
+from .pipeline import DEFAULT_BATCH_SIZE, BackgroundStage
+from .properties import PropertyValidator
+from .registry import DEFAULT_REGISTRY_PATH, create_adapter, load_adapter_registry, read_spill, run_adapters
+from .sample import SchemaCoverage
+from .schema import get_input_mappings, load_schema_config
+from .validation import NodeIdIndex
+
+logger = logging.getLogger(__name__)
+
+BIOCYPHER_CONFIG_PATH = "config/biocypher_config.yaml"
+SCHEMA_CONFIG_PATH = "config/schema_config.yaml"
+DANGLING_REPORT_PATH = Path("logs") / "dangling_edges.tsv"
+
+
+def load_biocypher_config(config_path: str) -> dict:
+    """Read the `biocypher` section of the BioCypher configuration."""
+    with open(config_path, "r") as f:
+        return yaml.safe_load(f)["biocypher"]
+
+
+def get_error_message(error: str) -> str:
+    """Return the last line of a traceback, i.e. the exception message."""
+    return error.strip().splitlines()[-1]
+
+
+def use_columnar(adapter, args) -> bool:
+    """
+    Return whether to extract columnar batches from an adapter.
+
+    Besides with --columnar, batches are extracted whenever properties are
+    validated, as a batch is checked by the dtype of each property array
+    rather than value by value; they become tuples right before they are
+    written.
+    """
+    return hasattr(adapter, "get_node_batches") and (args.columnar or not args.no_property_validation)
+
+
+def extract(adapter, kind: str, entries: list[str], args):
+    """Extract the nodes or edges (or columnar batches) of some schema entries, in parallel if requested."""
+    columnar = use_columnar(adapter, args)
+    if args.workers > 1:
+        return extract_parallel(adapter, kind, args.workers, args.shard_size, entries=entries, columnar=columnar)
+    if columnar:
+        return adapter.get_node_batches(entries) if kind == "node" else adapter.get_edge_batches(entries)
+    if kind == "node":
+        return adapter.get_nodes(entries)
+    return adapter.get_edges(entries)
+
+
+def create_stage(adapter, kind: str, name: str, args, progress: dict | None = None):
+    """Set up the extraction of one schema entry, in the background with --pipeline or chunk by chunk for checkpoints."""
+    if progress is not None:
+        shards = adapter.get_shards(kind, args.shard_size, entries=[name])
+        return iter_shard_chunks(adapter, kind, shards, progress, columnar=use_columnar(adapter, args), workers=args.workers)
+    if not args.pipeline:
+        return extract(adapter, kind, [name], args)
+    return BackgroundStage(
+        partial(extract, adapter, kind, [name], args),
+        mode=args.pipeline,
+        batch_size=1 if use_columnar(adapter, args) else DEFAULT_BATCH_SIZE,  # Columnar batches are passed on one by one
+        depth=args.pipeline_depth,
+        name=name,
+    )
+
+
+class KnowledgeGraphBuild:
+    """
+    One build of the knowledge graph.
+
+    Holds the state the stages of a build share: the BioCypher instance and
+    the adapters, the build manifest and checkpoint, the node ID index of
+    edge validation, the property validator, the schema coverage of a
+    sample, the metrics and the adapters that failed. A failing adapter is
+    skipped from then on; the stages of all other adapters are still
+    written.
+
+    Stages are written in units: the stages of one schema entry from all
+    adapters listing it, or with --deduplicate the node stages of all
+    entries sharing an `input_label`, merged while they are written.
+    """
+
+    def __init__(
+        self,
+        args,
+        biocypher_config_path: str = BIOCYPHER_CONFIG_PATH,
+        schema_config_path: str = SCHEMA_CONFIG_PATH,
+        registry_path: str = DEFAULT_REGISTRY_PATH,
+    ):
+        """
+        Initialize the build.
+
+        Args:
+            args: Parsed command line arguments of `create_knowledge_graph.py`
+            biocypher_config_path: Path to the BioCypher configuration
+            schema_config_path: Path to the schema configuration
+            registry_path: Path to the adapter registry
+        """
+        self.args = args
+        self.biocypher_config_path = biocypher_config_path
+        self.schema_config_path = schema_config_path
+        self.registry_path = registry_path
+        self.metrics = PipelineMetrics()
+        self.plan = []
+        self.units = []
+        self.progress = {}
+        self.failed = {}
+        self.adapter_seconds = defaultdict(float)
+        self.index_finalized = False
+        self.reading = None
+
+    def run(self) -> int:
+        """
+        Run the build.
+
+        Returns:
+            Exit status: 0 on success, 1 if an adapter, the ontology or the
+            load into Neo4j failed
+        """
+        args = self.args
+        logger.info("Starting {{ cookiecutter.project_name }} knowledge graph creation")
+        biocypher_config = load_biocypher_config(self.biocypher_config_path)
+        if args.load and biocypher_config["dbms"] != "neo4j":
+            logger.error(f"--load requires dbms: neo4j, not {biocypher_config['dbms']}")
+            return 1
+
+        # The parsed ontology is loaded from cache_directory instead of parsing
+        # the ontologies and the schema configuration on every run
+        ontology_cache = None if args.no_ontology_cache else OntologyCache.from_config(biocypher_config, self.schema_config_path)
+        ontology = None
+        cache_failed = False
+        if ontology_cache is not None:
+            try:
+                ontology = ontology_cache.get()
+            except (OSError, ValueError, pickle.PickleError) as e:
+                # e.g. an unreachable ontology URL, a schema class missing from
+                # the ontology or an ontology that cannot be pickled
+                logger.warning(f"Could not use the ontology cache, letting BioCypher parse the ontology instead: {e}")
+                ontology_cache.clear()
+                cache_failed = True
+        if args.warm_cache:
+            if cache_failed:
+                logger.error("Could not warm the ontology cache, see the warning above")
+                return 1
+            logger.info(f"Ontology cache is ready: {ontology_cache.path}" if ontology else "No head ontology configured, nothing to cache")
+            return 0
+
+        self._setup(biocypher_config, ontology)
+        if cache_failed:
+            try:
+                parse_ontology(self.bc)
+            except (OSError, ValueError) as e:
+                logger.error(f"Could not load the ontology, check the head_ontology and tail_ontologies URLs and the schema configuration: {e}")
+                return 1
+        logger.info(f"Creating knowledge graph from {len(self.registry)} adapters...")
+        if args.workers > 1:
+            logger.info(f"Extracting with {args.workers} worker processes")
+        self._plan()
+        if self.sample is not None:
+            self._draw_sample()
+        self._prepare_checkpoints()
+        if args.parallel_adapters > 1:
+            self._write_parallel()
+        else:
+            self._write_sequential()
+        self.manifest.save()
+        return self._finish()
+
+    def _setup(self, biocypher_config: dict, ontology):
+        """Create BioCypher, the adapters and the state of the build."""
+        args = self.args
+
+        # A sample is always built from scratch, next to the output of full builds
+        self.sample = args.node_sample
+        self.output_directory = Path(biocypher_config["output_directory"])
+        if self.sample is not None:
+            self.output_directory = self.output_directory / "sample"
+            shutil.rmtree(self.output_directory, ignore_errors=True)
+            logger.info(f"Building a sample of {self.sample} in {self.output_directory}")
+            if not args.validate_edges:
+                args.validate_edges = "report"
+
+        self.bc = BioCypher(
+            biocypher_config_path=self.biocypher_config_path,
+            schema_config_path=self.schema_config_path,
+            output_directory=str(self.output_directory) if self.sample is not None else None,
+        )
+        if ontology is not None:
+            attach_ontology(self.bc, ontology)
+
+        self.cache_directory = biocypher_config.get("cache_directory", ".cache")
+        cache = None
+        if args.cache:
+            cache = BatchCache(
+                self.cache_directory,
+                compute_namespace(self.schema_config_path),
+                max_size=int(args.cache_size * 1024**3),
+            )
+
+        # Initialize the adapters listed in config/adapters.yaml; each one has its
+        # own data source and extracts the schema entries assigned to it
+        self.schema = load_schema_config(self.schema_config_path)
+        self.registry = load_adapter_registry(self.registry_path, self.schema)
+
+        # Property values are checked against the types declared in the schema
+        # configuration on their way to the writer, whichever adapter made them
+        self.validator = None if args.no_property_validation else PropertyValidator(self.schema)
+        self.common = {
+            "schema_config_path": self.schema_config_path,
+            "cache": cache,
+{%- if cookiecutter.data_source_type == "api" %}
+            # Schema entries with an `input_url` are fetched with this client
+            "api_client": ApiClient(
+                concurrency=8,  # Requests in flight at once
+                retries=3,
+                cache_directory=Path(self.cache_directory) / "http",
+                cache_max_age=7 * 24 * 3600,  # Refetch cached responses after a week
+                cache_max_size=1024**3,  # Prune the oldest responses beyond 1 GB
+            ),
+{%- else %}
+            # "api_client": ApiClient(concurrency=8, cache_directory=".cache/http"),  # from .fetch
+{%- endif %}
+        }
+        if self.sample is not None:
+            self.common["sample"] = self.sample
+        self.adapters = {spec["name"]: create_adapter(spec, **self.common) for spec in self.registry}
+        self.owners = defaultdict(list)
+        for spec in self.registry:
+            for entry in spec["entries"]:
+                self.owners[entry].append(spec["name"])
+
+        # Only schema entries whose inputs changed since the last build are rebuilt;
+        # the output files of all other entries are reused
+        self.manifest = BuildManifest(
+            self.output_directory,
+            self.schema_config_path,
+            adapter_version=__version__,
+            checksum=args.checksum,
+        )
+
+        # Edge endpoints are checked against a compact index of the node IDs
+        self.index = NodeIdIndex(self.output_directory / "node_ids") if args.validate_edges else None
+        DANGLING_REPORT_PATH.unlink(missing_ok=True)
+        self.node_mappings = {mapping["name"]: mapping for mapping in get_input_mappings(self.schema, "node")}
+        self.coverage = None
+
+    def _plan(self):
+        """Plan the stages to rebuild, nodes before edges, and group them into units."""
+        nodes_rebuilt = False
+        for kind in ("node", "edge"):
+            input_files = {}
+            for spec in self.registry:
+                adapter_files = self.adapters[spec["name"]].get_input_files(kind)
+                for name in spec["entries"]:
+                    if name in adapter_files:
+                        input_files.setdefault(name, []).extend(adapter_files[name])
+            stale = list(input_files) if self.args.full else self.manifest.get_stale_entries(input_files)
+            if self.args.deduplicate and kind == "node":
+                # Entries merged into one unit share their output files
+                labels = {self.node_mappings[name]["label"] for name in stale}
+                stale = [name for name in input_files if self.node_mappings[name]["label"] in labels]
+            if self.index is not None and kind == "node":
+                # Unchanged entries without recorded IDs have to be extracted again
+                stale = [name for name in input_files if name in stale or not self.index.has_entry(name)]
+                nodes_rebuilt = bool(stale)
+            if self.index is not None and kind == "edge" and nodes_rebuilt:
+                stale = list(input_files)
+            self.manifest.remove_outputs(stale)
+            self.plan.extend((kind, name, input_files[name]) for name in stale)
+
+        groups = {}
+        for kind, name, _ in self.plan:
+            key = (kind, self.node_mappings[name]["label"]) if self.args.deduplicate and kind == "node" else (kind, name)
+            if key not in groups:
+                groups[key] = []
+                self.units.append((kind, groups[key]))
+            groups[key].append(name)
+
+    def _draw_sample(self):
+        """
+        Draw the sample of a sampled build.
+
+        A sample of fixed size holds the nodes with the smallest ID hashes of
+        each entry, the edges from them and their targets, which takes a pass
+        over all node IDs and then over all edge endpoints. A fraction is
+        applied by hash while the rows are read and needs no pass.
+        """
+        self.coverage = SchemaCoverage(self.schema, self.sample.rows)
+        if self.sample.size is None:
+            return
+        for kind, name, _ in self.plan:
+            for adapter in map(self.adapters.get, self.owners[name]):
+                if kind == "node" and hasattr(adapter, "get_node_ids"):
+                    for entry, ids in adapter.get_node_ids([name]):
+                        self.sample.add_ids(entry, ids)
+        self.sample.finalize()
+        for kind, name, _ in self.plan:
+            for adapter in map(self.adapters.get, self.owners[name]):
+                if kind == "edge" and hasattr(adapter, "get_edge_ids"):
+                    for entry, sources, targets in adapter.get_edge_ids([name]):
+                        self.sample.add_edges(entry, sources, targets)
+
+    def _prepare_checkpoints(self):
+        """
+        Restore the progress of interrupted entries and remove orphaned part files.
+
+        Entries are written in segments of whole chunks; after every segment,
+        its part files and the chunks written per shard are checkpointed. Part
+        files of an interrupted segment are removed, and with --resume an
+        interrupted entry continues after its last checkpoint.
+        """
+        args = self.args
+        self.checkpoint = BuildCheckpoint(self.output_directory, dict(self.manifest.build, shard_size=args.shard_size))
+        chunk_checkpoints = args.checkpoint_rows > 0 and not (
+            args.deduplicate or args.validate_edges or args.pipeline or args.parallel_adapters > 1
+        )
+        if self.checkpoint.entries and not args.resume:
+            logger.info(f"Starting interrupted schema entries {sorted(self.checkpoint.entries)} over, pass --resume to continue them")
+        self.checkpoint.retain([name for _, name, _ in self.plan] if args.resume and chunk_checkpoints else [])
+        for kind, name, files in self.plan:
+            # Only entries extracted by a single adapter have one sequence of shards
+            if not chunk_checkpoints or len(self.owners[name]) > 1:
+                continue
+            adapter = self.adapters[self.owners[name][0]]
+            if not hasattr(adapter, "get_shard_chunks"):
+                continue
+            self.progress[name] = {}
+            if files:
+                # Entries fetched from an API have no fingerprint and always start over
+                inputs = self.manifest.fingerprint_inputs(files)
+                self.progress[name] = self.checkpoint.get_progress(name, inputs, getattr(adapter, "chunk_size", None))
+            if self.progress[name]:
+                logger.info(f"Resuming '{name}' after {sum(state['chunks'] for state in self.progress[name].values())} chunks")
+        self.checkpoint.retain(list(self.progress))
+        self.checkpoint.save()
+        self.manifest.save()
+        remove_orphaned_parts(self.output_directory, self.manifest.list_recorded_outputs() | self.checkpoint.list_outputs())
+
+    def _write_segments(self, write, kind: str, name: str, adapter: str, files: list[Path], chunks) -> set[str]:
+        """Write the chunks of one stage in checkpointed segments and return the names of the files written."""
+        inputs = self.manifest.fingerprint_inputs(files)
+        chunk_size = getattr(self.adapters[adapter], "chunk_size", None)
+        outputs = set(self.checkpoint.entries.get(name, {}).get("outputs", []))
+        if self.validator is not None:
+            chunks = ((key, number, self.validator.validate(batch, kind)) for key, number, batch in chunks)
+        stream = CheckpointedStream(chunks, self.progress[name], self.args.checkpoint_rows)
+        tuples = stream.tuples()
+        if self.coverage is not None:
+            tuples = self.coverage.track(tuples, name)
+        tuples = self.metrics.instrument(tuples, kind, name, adapter=adapter)
+        for segment in stream.segments(tuples):
+            existing = self.manifest.list_outputs()
+            try:
+                write(segment)
+            except Exception:
+                # Files of checkpointed segments are kept for --resume
+                for file_name in self.manifest.list_outputs() - existing:
+                    (self.output_directory / file_name).unlink()
+                raise
+            outputs |= self.manifest.list_outputs() - existing
+            self.checkpoint.update(name, inputs, chunk_size, stream.progress, outputs)
+        return outputs
+
+    def _read_source(self, kind: str, adapter: str, tuples):
+        """Validate the tuples (or columnar batches) of one adapter and turn them into tuples."""
+        self.reading = adapter
+        if use_columnar(self.adapters[adapter], self.args):
+            if self.validator is not None:
+                tuples = (self.validator.validate(batch, kind) for batch in tuples)
+            # Property dictionaries are only created while BioCypher consumes the tuples
+            tuples = iter_tuples(tuples)
+        elif self.validator is not None:
+            tuples = self.validator.validate_stream(tuples, kind)
+        yield from tuples
+
+    def _write_unit(self, kind: str, names: list[str], sources: list[tuple]):
+        """
+        Write the stages of one unit in a single pass; partial output of a failing unit is deleted.
+
+        Args:
+            kind: Either "node" or "edge"
+            names: Names of the schema entries of the unit
+            sources: List of (name, adapter, tuples) tuples, one per adapter
+                extracting an entry, in order
+        """
+        args = self.args
+        files = {name: paths for _, name, paths in self.plan}
+        write = self.bc.write_nodes if kind == "node" else self.bc.write_edges
+        name = names[0]
+        adapters = list(dict.fromkeys(adapter for _, adapter, _ in sources))
+        self.reading = adapters[0]
+        if name in self.progress:
+            # Checkpointed entries have a single adapter, see _prepare_checkpoints
+            [(_, adapter, chunks)] = sources
+            outputs = self._write_segments(write, kind, name, adapter, files[name], chunks)
+            self.manifest.record(name, files[name], outputs)
+            self.manifest.save()
+            self.checkpoint.remove(name)
+            return
+        tuples = chain.from_iterable(self._read_source(kind, adapter, tuples) for _, adapter, tuples in sources)
+        if self.index is not None and kind == "edge" and not self.index_finalized:
+            self.index.finalize(list(self.node_mappings))
+            self.index_finalized = True
+        if args.deduplicate and kind == "node":
+            mappings = [self.node_mappings[entry] for entry in names]
+            if len({mapping["merge_strategy"] for mapping in mappings}) > 1:
+                logger.warning(f"Schema entries {names} share a label but not a merge_strategy, using that of '{name}'")
+            deduplicator = NodeDeduplicator(
+                mappings[0]["merge_strategy"],
+                set().union(*map(get_list_properties, mappings)),
+                max_nodes=args.dedup_max_nodes,
+                directory=self.cache_directory,
+            )
+            tuples = deduplicator.deduplicate(tuples)
+        if self.index is not None and kind == "node":
+            tuples = self.index.track(tuples, name)
+        elif self.index is not None:
+            tuples = self.index.check_edges(
+                tuples,
+                drop=args.validate_edges == "drop",
+                report_path=DANGLING_REPORT_PATH,
+            )
+        if self.coverage is not None:
+            tuples = self.coverage.track(tuples, name)
+        existing = self.manifest.list_outputs()
+        try:
+            write(self.metrics.instrument(tuples, kind, " + ".join(names), adapter=", ".join(adapters)))
+        except Exception:
+            # Not recorded in the manifest, so the unit is rebuilt on the next run
+            for file_name in self.manifest.list_outputs() - existing:
+                (self.output_directory / file_name).unlink()
+            raise
+        outputs = self.manifest.list_outputs() - existing
+        for entry in names:
+            self.manifest.record(entry, files[entry], outputs)
+        if self.index is not None and kind == "node":
+            # The IDs of the unit are recorded with its first entry
+            for entry in names[1:]:
+                for _ in self.index.track((), entry):
+                    pass
+        self.manifest.save()
+
+    def _unit_sources(self, names: list[str]) -> list[tuple]:
+        """Return the (name, adapter) pairs extracted for the entries of a unit, in order."""
+        return [(name, adapter) for name in names for adapter in self.owners[name]]
+
+    def _fail_unit(self, names: list[str], error: Exception):
+        """Record the adapter that was being read when writing a unit failed."""
+        adapter = self.reading
+        logger.exception(f"Stage '{' + '.join(names)}' of adapter '{adapter}' failed, skipping its remaining stages")
+        self.failed[adapter] = f"{type(error).__name__}: {error}"
+
+    def _write_spilled_unit(self, kind: str, names: list[str], spills: dict):
+        """Write a unit from the stages spilled by the adapters' worker processes and delete the spills."""
+        sources = self._unit_sources(names)
+        try:
+            if not any(adapter in self.failed for _, adapter in sources):
+                self._write_unit(kind, names, [(name, adapter, read_spill(spills[name, adapter])) for name, adapter in sources])
+        except Exception as e:
+            self._fail_unit(names, e)
+        finally:
+            for source in sources:
+                Path(spills.pop(source)).unlink()
+
+    def _write_parallel(self):
+        """Extract the adapters in worker processes and write each unit once all of its stages are spilled."""
+        logger.info(f"Extracting up to {self.args.parallel_adapters} adapters at once")
+        jobs = []
+        for spec in self.registry:
+            stages = [(kind, name) for kind, name, _ in self.plan if spec["name"] in self.owners[name]]
+            if stages:
+                jobs.append((spec, self.common, stages))
+
+        spills = {}
+        pending = list(self.units)
+
+        def write_ready(deferred: bool):
+            # Edges are only validated once the nodes of all adapters are indexed
+            for unit in list(pending):
+                kind, names = unit
+                if self.index is not None and kind == "edge" and deferred:
+                    continue
+                if all(source in spills for source in self._unit_sources(names)):
+                    pending.remove(unit)
+                    self._write_spilled_unit(kind, names, spills)
+
+        Path(self.cache_directory).mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="adapters-", dir=self.cache_directory) as directory:
+            extract_stage = partial(extract, args=self.args)
+            for status, adapter, payload in run_adapters(jobs, extract_stage, self.args.parallel_adapters, directory):
+                if status != "stage":
+                    seconds, error = payload
+                    self.adapter_seconds[adapter] = seconds
+                    if error is not None and adapter not in self.failed:
+                        logger.error(f"Adapter '{adapter}' failed:\n{error}")
+                        self.failed[adapter] = get_error_message(error)
+                    continue
+                kind, name, path, _, _ = payload
+                spills[name, adapter] = path
+                write_ready(deferred=True)
+            write_ready(deferred=False)
+            # Spills of units with a failed adapter are removed with the directory
+
+    def _write_sequential(self):
+        """Extract and write the units one after the other, or with --concurrent-stages extract all stages at once."""
+        stages = {
+            (name, adapter): create_stage(self.adapters[adapter], kind, name, self.args, self.progress.get(name))
+            for kind, name, _ in self.plan
+            for adapter in self.owners[name]
+        }
+        if self.args.concurrent_stages:
+            logger.info(f"Extracting {len(stages)} stages concurrently ({self.args.pipeline} mode)")
+            for stage in stages.values():
+                stage.start()
+        try:
+            for kind, names in self.units:
+                sources = self._unit_sources(names)
+                adapters = {adapter for _, adapter in sources}
+                if adapters & set(self.failed):
+                    continue
+                started = time.perf_counter()
+                try:
+                    self._write_unit(kind, names, [(name, adapter, stages[name, adapter]) for name, adapter in sources])
+                except Exception as e:
+                    self._fail_unit(names, e)
+                for adapter in adapters:
+                    self.adapter_seconds[adapter] += (time.perf_counter() - started) / len(adapters)
+        finally:
+            for stage in stages.values():
+                if isinstance(stage, BackgroundStage):
+                    stage.close()
+
+    def _finish(self) -> int:
+        """Report on the build, load it into Neo4j if requested and return the exit status."""
+        args = self.args
+        metrics = self.metrics
+        for spec in self.registry:
+            name = spec["name"]
+            metrics.record_adapter(name, "failed" if name in self.failed else "done", self.adapter_seconds[name], self.failed.get(name))
+        if self.coverage is not None:
+            self.coverage.log_summary()
+            metrics.record_coverage(self.coverage.report())
+        if self.validator is not None:
+            self.validator.log_summary()
+            metrics.record_properties(self.validator.report())
+        load_error = None
+        if args.load and self.failed:
+            logger.error("Not loading the knowledge graph into Neo4j, as adapters failed")
+        elif args.load:
+            try:
+                # The files of all schema entries are loaded, including those
+                # reused from earlier builds
+                metrics.record_load(load_graph(
+                    self.output_directory,
+                    get_biocypher_setting("neo4j") or {},
+                    mode=args.load,
+                    threads=args.load_threads,
+                    high_parallel_io=args.high_parallel_io,
+                    shard_size=args.load_shard_size,
+                ))
+            except (OSError, RuntimeError, ValueError) as e:
+                logger.error(f"Loading the knowledge graph into Neo4j failed: {e}")
+                load_error = str(e)
+        metrics.write_json("logs")
+        if args.prometheus:
+            metrics.write_prometheus(args.prometheus)
+
+        # BioCypher can only summarize a build that wrote something, not one
+        # that reused all outputs
+        if self.plan:
+            self.bc.summary()
+
+        if self.failed:
+            logger.error(f"Knowledge graph created without the failed adapters {sorted(self.failed)}")
+            return 1
+        if load_error:
+            return 1
+        logger.info("Knowledge graph creation completed successfully!")
+        return 0
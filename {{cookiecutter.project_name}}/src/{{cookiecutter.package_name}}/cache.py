@@ -0,0 +1,220 @@
+"""
+On-disk cache of converted node and edge batches.
+
+Converted batches are stored per input chunk under the configured cache
+directory, so repeated runs can replay a shard without parsing it again.
+Columnar batches are stored as Arrow IPC files when pyarrow is installed,
+other batches (and columnar ones Arrow cannot represent) are pickled. Entries are grouped in a namespace derived from the schema
+configuration and the package source code; changing either starts a fresh
+namespace and the old one is removed. The total cache size is capped, least
+recently used shards are evicted first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+from pathlib import Path
+
+from .columnar import ColumnarBatch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 10 * 1024**3
+PACKAGE_DIRECTORY = Path(__file__).parent
+
+
+def compute_namespace(schema_config_path: str | Path, source_directory: str | Path = PACKAGE_DIRECTORY) -> str:
+    """
+    Hash the schema configuration and the adapter source code.
+
+    Args:
+        schema_config_path: Path to the schema configuration
+        source_directory: Directory whose Python files are hashed
+
+    Returns:
+        Hex digest identifying the cache namespace
+    """
+    digest = hashlib.sha256(Path(schema_config_path).read_bytes())
+    for path in sorted(Path(source_directory).rglob("*.py")):
+        digest.update(str(path.relative_to(source_directory)).encode())
+        digest.update(path.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def make_key(*parts) -> str:
+    """Derive a cache key from JSON-serializable parts."""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class BatchCache:
+    """
+    Size-capped LRU cache of converted batches.
+
+    A shard is stored as numbered chunk files plus an index file that is
+    written last; shards without an index (e.g. from an interrupted run or
+    still being written by another worker) are never replayed nor evicted.
+    Reading a shard refreshes the modification time of its index, which
+    serves as the last-used time for eviction. Chunk files are only opened
+    as the replay reaches them, so a shard evicted by another worker
+    meanwhile raises FileNotFoundError part way through.
+    """
+
+    def __init__(self, directory: str | Path, namespace: str, max_size: int = DEFAULT_CACHE_SIZE):
+        """
+        Initialize the cache and drop entries of other namespaces.
+
+        Args:
+            directory: Base cache directory, e.g. BioCypher's `cache_directory`
+            namespace: Namespace as returned by `compute_namespace`
+            max_size: Maximum total size of cached batches in bytes
+        """
+        self.root = Path(directory) / "batches"
+        self.directory = self.root / namespace
+        self.max_size = max_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        for path in self.root.iterdir():
+            if path.is_dir() and path.name != namespace:
+                logger.info(f"Removing outdated batch cache {path}")
+                shutil.rmtree(path, ignore_errors=True)
+
+    def _index_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _chunk_path(self, key: str, number: int) -> Path:
+        """Path of a chunk file, without the suffix of its format."""
+        return self.directory / f"{key}-{number:05d}"
+
+    def get(self, key: str):
+        """
+        Look up a cached shard.
+
+        Args:
+            key: Cache key of the shard
+
+        Returns:
+            Generator of cached batches, or None if the shard is not cached
+            or some of its chunk files are missing
+        """
+        index_path = self._index_path(key)
+        try:
+            files = json.loads(index_path.read_text())["files"]
+            os.utime(index_path)
+        except (OSError, ValueError, KeyError):
+            return None
+        if not all((self.directory / name).exists() for name in files):
+            return None
+        return self._replay(files)
+
+    def _replay(self, files: list[str]):
+        for name in files:
+            yield _read_chunk(self.directory / name)
+
+    def put(self, key: str, batches):
+        """
+        Store batches while passing them through.
+
+        The shard is only committed once `batches` is exhausted.
+
+        Args:
+            key: Cache key of the shard
+            batches: Iterable of batches (`ColumnarBatch` or lists of tuples)
+
+        Yields:
+            The batches from `batches`
+        """
+        files = []
+        for number, batch in enumerate(batches):
+            path = _write_chunk(batch, self._chunk_path(key, number))
+            files.append(path.name)
+            yield batch
+
+        tmp_path = self._index_path(key).with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"files": files}))
+        tmp_path.replace(self._index_path(key))
+        self.evict()
+
+    def size(self) -> int:
+        """Return the total size of the cached files in bytes."""
+        return sum(path.stat().st_size for path in self.directory.iterdir() if path.is_file())
+
+    def evict(self):
+        """Remove least recently used shards until the cache fits its size cap."""
+        entries = {}
+        committed = {path.stem for path in self.directory.glob("*.json")}
+        for path in self.directory.iterdir():
+            key = path.stem.split("-")[0]
+            if key not in committed:
+                # Being written by another worker, or left over from an interrupted run
+                continue
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            size, last_used = entries.get(key, (0, 0))
+            entries[key] = (size + stat.st_size, max(last_used, stat.st_mtime))
+
+        total = sum(size for size, _ in entries.values())
+        for key, (size, _) in sorted(entries.items(), key=lambda item: item[1][1]):
+            if total <= self.max_size:
+                break
+            for path in self.directory.glob(f"{key}*"):
+                path.unlink(missing_ok=True)
+            total -= size
+            logger.debug(f"Evicted cached shard {key}")
+
+
+def _to_arrow(batch):
+    """Convert a columnar batch to Arrow, or return None if pyarrow is missing or cannot represent it."""
+    if not isinstance(batch, ColumnarBatch):
+        return None
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+    try:
+        return batch.to_arrow()
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        # e.g. an undeclared property column mixing numbers and strings
+        return None
+
+
+def _write_chunk(batch, path: Path) -> Path:
+    """
+    Write one batch as an Arrow IPC file if possible, as a pickle otherwise.
+
+    Args:
+        batch: `ColumnarBatch` or list of tuples
+        path: Path of the file without suffix
+
+    Returns:
+        Path of the written file, ending in `.arrow` or `.pkl`
+    """
+    record_batch = _to_arrow(batch)
+    if record_batch is None:
+        path = path.with_suffix(".pkl")
+        with open(path, "wb") as f:
+            pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+        return path
+
+    import pyarrow as pa
+
+    path = path.with_suffix(".arrow")
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, record_batch.schema) as writer:
+        writer.write_batch(record_batch)
+    return path
+
+
+def _read_chunk(path: Path):
+    """Read a batch written by `_write_chunk`."""
+    if path.suffix == ".pkl":
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    import pyarrow as pa
+
+    with pa.OSFile(str(path), "rb") as source:
+        return ColumnarBatch.from_arrow(pa.ipc.open_file(source).get_batch(0))
@@ -0,0 +1,280 @@
+"""
+Checkpoints for resumable builds.
+
+A schema entry is written in segments of about `DEFAULT_CHECKPOINT_ROWS`
+rows that end on chunk boundaries, one BioCypher write call per segment.
+BioCypher flushes all part files of a write call before it returns; only
+then are the part files and the number of chunks processed per input shard
+recorded in `build_checkpoint.json` in the output directory, which is
+replaced atomically.
+
+Part files that are neither recorded in the build manifest nor in the
+checkpoint are left over from an interrupted write call and removed before
+the next build, so a segment is either fully part of the output or not at
+all. With `--resume`, an interrupted entry continues after its last recorded
+chunk instead of starting over.
+"""
+
+import json
+import logging
+import os
+from itertools import chain, islice
+from pathlib import Path
+
+from .load import PART_PATTERN
+from .manifest import CHECKPOINT_NAME
+from .parallel import extract_chunks_parallel
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHECKPOINT_ROWS = 1_000_000
+
+
+def shard_key(shard: tuple) -> str:
+    """Return a key identifying a shard as returned by `get_shards`."""
+    path, start, end = shard
+    return f"{path}:{start}:{end}"
+
+
+def remove_orphaned_parts(output_directory: str | Path, keep: set[str]) -> list[str]:
+    """
+    Delete the part and header files not written by a completed segment.
+
+    Args:
+        output_directory: Directory BioCypher writes its files to
+        keep: Names of the files recorded in the manifest or the checkpoint
+
+    Returns:
+        Names of the deleted files
+    """
+    output_directory = Path(output_directory)
+    if not output_directory.exists():
+        return []
+    removed = []
+    for path in sorted(output_directory.iterdir()):
+        written = PART_PATTERN.match(path.name) or path.name.endswith("-header.csv")
+        if path.is_file() and written and path.name not in keep:
+            path.unlink()
+            removed.append(path.name)
+    if removed:
+        logger.info(f"Removed {len(removed)} files of an interrupted build: {removed}")
+    return removed
+
+
+class BuildCheckpoint:
+    """
+    Progress of the schema entries that are not completely written yet.
+
+    Per entry, the checkpoint holds the fingerprints of its input files, the
+    adapter's chunk size, the number of chunks written per shard and the
+    part files written so far. Completed entries are recorded in the build
+    manifest instead and removed from the checkpoint.
+    """
+
+    def __init__(self, output_directory: str | Path, build: dict):
+        """
+        Initialize the checkpoint and load the previous one, if any.
+
+        Args:
+            output_directory: Directory BioCypher writes its files to
+            build: Settings a checkpoint is only valid for, e.g. the schema
+                hash, the adapter version and the shard size
+        """
+        self.output_directory = Path(output_directory)
+        self.path = self.output_directory / CHECKPOINT_NAME
+        self.build = build
+        previous = self._load()
+        if previous and previous.get("build") != build:
+            logger.info("Schema configuration, adapter version or shard size changed, ignoring the checkpoint")
+            previous = {}
+        self.entries = previous.get("entries", {})
+
+    def _load(self) -> dict:
+        """Load the previous checkpoint, or an empty one."""
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable build checkpoint {self.path}: {e}")
+            return {}
+
+    def get_progress(self, name: str, inputs: dict, chunk_size: int | None) -> dict:
+        """
+        Return the chunks written per shard of an entry, for resuming it.
+
+        Args:
+            name: Name of the schema entry
+            inputs: Fingerprints of its input files
+            chunk_size: Chunk size of the adapter
+
+        Returns:
+            Dictionary mapping `shard_key` to a dictionary with the number of
+            `chunks` written and whether the shard is `complete`; empty if
+            the entry has no valid checkpoint
+        """
+        entry = self.entries.get(name)
+        if entry is None:
+            return {}
+        if entry["inputs"] != inputs or entry["chunk_size"] != chunk_size:
+            logger.info(f"Inputs of '{name}' changed since the checkpoint, starting it over")
+            self.entries.pop(name)
+            return {}
+        return {key: dict(state) for key, state in entry["shards"].items()}
+
+    def retain(self, names: list[str]):
+        """Forget the entries that are not going to be resumed."""
+        self.entries = {name: entry for name, entry in self.entries.items() if name in names}
+
+    def list_outputs(self) -> set[str]:
+        """Return the names of the files written by the checkpointed entries."""
+        return {file_name for entry in self.entries.values() for file_name in entry["outputs"]}
+
+    def update(self, name: str, inputs: dict, chunk_size: int | None, progress: dict, outputs: set[str]):
+        """
+        Record the progress of an entry after a completed segment.
+
+        Args:
+            name: Name of the schema entry
+            inputs: Fingerprints of its input files
+            chunk_size: Chunk size of the adapter
+            progress: Chunks written per shard, see `get_progress`
+            outputs: Names of all files written for the entry so far
+        """
+        self.entries[name] = {
+            "inputs": inputs,
+            "chunk_size": chunk_size,
+            "shards": progress,
+            "outputs": sorted(outputs),
+        }
+        self.save()
+
+    def remove(self, name: str):
+        """Remove a completed entry."""
+        if self.entries.pop(name, None) is not None:
+            self.save()
+
+    def save(self):
+        """Write the checkpoint to the output directory, or delete it if no entry is in progress."""
+        if not self.entries:
+            self.path.unlink(missing_ok=True)
+            return
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+        checkpoint = {"build": self.build, "entries": self.entries}
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(checkpoint, indent=2, sort_keys=True))
+        os.replace(tmp_path, self.path)
+
+
+def iter_shard_chunks(adapter, kind: str, shards: list[tuple], progress: dict, columnar: bool = False, workers: int = 1):
+    """
+    Extract the chunks of some shards, leaving out those already written.
+
+    Args:
+        adapter: Adapter providing `get_shard_chunks`
+        kind: Either "node" or "edge"
+        shards: List of (mapping, shard) tuples as returned by `get_shards`
+        progress: Chunks written per shard, see `BuildCheckpoint.get_progress`
+        columnar: Extract columnar batches instead of lists of tuples
+        workers: Number of worker processes; shards are extracted in
+            order either way
+
+    Yields:
+        Tuples of (shard key, number of chunks written once this one is,
+        batch) for every chunk, followed by (shard key, None, []) once a
+        shard is exhausted
+    """
+    tasks = []
+    for mapping, shard in shards:
+        state = progress.get(shard_key(shard), {"chunks": 0, "complete": False})
+        if not state["complete"]:
+            tasks.append((mapping, shard, state["chunks"]))
+    if workers > 1:
+        results = extract_chunks_parallel(adapter, kind, tasks, workers, columnar)
+    else:
+        results = (adapter.get_shard_chunks(kind, mapping, shard, columnar, skip) for mapping, shard, skip in tasks)
+    for (_, shard, skip), chunks in zip(tasks, results):
+        key = shard_key(shard)
+        for number, batch in enumerate(chunks, start=skip + 1):
+            yield key, number, batch
+        yield key, None, []
+
+
+class CheckpointedStream:
+    """
+    Split the chunks of one schema entry into segments of whole chunks.
+
+    `tuples` flattens the chunks into the tuples for BioCypher, e.g. wrapped
+    by `PipelineMetrics.instrument`; `segments` cuts the resulting stream into
+    iterators of at least `segment_rows` tuples, one per write call. Once a
+    segment is exhausted, `progress` covers exactly the chunks it contained.
+    """
+
+    def __init__(self, chunks, progress: dict, segment_rows: int):
+        """
+        Initialize the stream.
+
+        Args:
+            chunks: Chunks as yielded by `iter_shard_chunks`
+            progress: Chunks written per shard, updated in place
+            segment_rows: Minimum number of tuples per segment
+        """
+        self.chunks = chunks
+        self.progress = progress
+        self.segment_rows = segment_rows
+        self.rows = 0
+        self._pending = None
+
+    def _commit(self):
+        """Mark the chunk whose last tuple was handed out as written."""
+        if self._pending is not None:
+            key, number = self._pending
+            self.progress[key] = {"chunks": number, "complete": False}
+            self._pending = None
+
+    def tuples(self):
+        """
+        Yield the tuples of all chunks.
+
+        Progress is tracked per chunk rather than per tuple: the last tuple
+        of a chunk is handed out separately, so that a segment can end right
+        after it.
+        """
+        for key, number, batch in self.chunks:
+            self._commit()
+            if number is None:
+                self.progress[key] = {"chunks": self.progress.get(key, {}).get("chunks", 0), "complete": True}
+                continue
+            size = len(batch)
+            if not size:
+                self.progress[key] = {"chunks": number, "complete": False}
+                continue
+            items = iter(batch)
+            yield from islice(items, size - 1)
+            self.rows += size
+            self._pending = (key, number)
+            yield next(items)
+        self._commit()
+
+    def _segment(self, first, tuples):
+        started = self.rows
+        for item in chain([first], tuples):
+            yield item
+            if self._pending is not None and self.rows - started >= self.segment_rows:
+                self._commit()
+                return
+
+    def segments(self, tuples):
+        """
+        Cut a stream of tuples into segments.
+
+        Args:
+            tuples: The iterator returned by `tuples`, possibly wrapped
+
+        Yields:
+            One non-empty iterator of tuples per write call; each has to be
+            exhausted before the next one is requested
+        """
+        tuples = iter(tuples)
+        for first in tuples:
+            yield self._segment(first, tuples)
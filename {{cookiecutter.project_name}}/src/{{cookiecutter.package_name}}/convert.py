@@ -0,0 +1,177 @@
+"""
+Batch conversion of DataFrame chunks into BioCypher tuples.
+
+Casting, renaming and null detection are done column-wise on the whole
+chunk, so the only per-row work left is assembling the output tuples.
+"""
+
+import logging
+from itertools import repeat
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Schema property types mapped to pandas dtypes. Nullable dtypes keep integer
+# columns integral when some rows are empty.
+PANDAS_DTYPES = {
+    "int": "Int64",
+    "integer": "Int64",
+    "long": "Int64",
+    "float": "float64",
+    "double": "float64",
+    "bool": "boolean",
+    "boolean": "boolean",
+    "str": "string",
+    "string": "string",
+}
+
+
+# Text representations of booleans, compared in lowercase
+BOOLEAN_VALUES = {"true": True, "t": True, "yes": True, "1": True, "false": False, "f": False, "no": False, "0": False}
+
+
+def to_boolean(value) -> bool | None:
+    """Convert a boolean, 0 or 1, or a text such as "yes" to a boolean; None if it is none of these."""
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, str):
+        return BOOLEAN_VALUES.get(value.strip().lower())
+    if isinstance(value, (int, float, np.number)) and value in (0, 1):
+        return bool(value)
+    return None
+
+
+def coerce_column(column: pd.Series, schema_type: str | None) -> tuple[pd.Series, int]:
+    """
+    Cast a column to the pandas dtype matching a schema property type.
+
+    Unknown types (e.g. `str[]`) are left as read.
+
+    Args:
+        column: Column to cast
+        schema_type: Property type declared in the schema configuration
+
+    Returns:
+        Tuple of the cast column and the number of values that could not be
+        converted and became null
+    """
+    dtype = PANDAS_DTYPES.get(schema_type)
+    if dtype is None or column.dtype == dtype:
+        return column, 0
+
+    if dtype in ("Int64", "float64"):
+        numeric = pd.to_numeric(column, errors="coerce")
+        if dtype == "Int64":
+            numeric = numeric.mask(numeric.notna() & (numeric % 1 != 0))
+        cast = numeric.astype(dtype)
+    elif dtype == "boolean" and column.dtype != bool:
+        cast = column.map(to_boolean, na_action="ignore").astype(dtype)
+    else:
+        cast = column.astype(dtype)
+    return cast, int(cast.isna().sum() - column.isna().sum())
+
+
+def cast_column(column: pd.Series, schema_type: str | None) -> pd.Series:
+    """
+    Cast a column to the pandas dtype matching a schema property type.
+
+    Values that cannot be converted become null and are reported with a
+    warning, see `coerce_column`.
+
+    Args:
+        column: Column to cast
+        schema_type: Property type declared in the schema configuration
+
+    Returns:
+        The cast column
+    """
+    cast, invalid = coerce_column(column, schema_type)
+    if invalid:
+        logger.warning(f"{invalid} values in column '{column.name}' are not {schema_type} and were dropped")
+    return cast
+
+
+def get_property_frame(chunk: pd.DataFrame, mapping: dict) -> pd.DataFrame:
+    """
+    Select, rename and cast the property columns of a chunk.
+
+    Args:
+        chunk: Chunk of input rows
+        mapping: Input mapping as returned by `schema.get_input_mappings`
+
+    Returns:
+        DataFrame with one column per property present in the chunk
+    """
+    return pd.DataFrame({
+        prop: cast_column(chunk[column], mapping["types"].get(prop))
+        for prop, column in mapping["properties"].items()
+        if column in chunk.columns
+    }, index=chunk.index)
+
+
+def get_property_records(chunk: pd.DataFrame, mapping: dict) -> list[dict]:
+    """
+    Build one property dictionary per row, leaving out null values.
+
+    Records are zipped from whole columns converted to Python lists, which
+    is considerably faster than `to_dict("records")`; only rows that
+    actually contain nulls are filtered afterwards.
+
+    Args:
+        chunk: Chunk of input rows
+        mapping: Input mapping as returned by `schema.get_input_mappings`
+
+    Returns:
+        List of property dictionaries in row order
+    """
+    properties = get_property_frame(chunk, mapping)
+    if properties.empty:
+        return [{} for _ in range(len(chunk))]
+
+    keys = list(properties.columns)
+    columns = [properties[key].tolist() for key in keys]
+    records = [dict(zip(keys, values)) for values in zip(*columns)]
+    null_mask = properties.isna().to_numpy()
+    for i in np.flatnonzero(null_mask.any(axis=1)):
+        record = records[i]
+        records[i] = {key: record[key] for key, is_null in zip(keys, null_mask[i]) if not is_null}
+    return records
+
+
+def get_id_column(chunk: pd.DataFrame, column: str) -> list[str]:
+    """Return an ID column as a list of strings."""
+    return chunk[column].astype(str).tolist()
+
+
+def dataframe_to_nodes(chunk: pd.DataFrame, mapping: dict) -> list[tuple]:
+    """
+    Convert a chunk into node tuples.
+
+    Args:
+        chunk: Chunk of input rows
+        mapping: Node input mapping as returned by `schema.get_input_mappings`
+
+    Returns:
+        List of (node_id, node_label, properties_dict) tuples
+    """
+    ids = get_id_column(chunk, mapping["columns"]["id"])
+    return list(zip(ids, repeat(mapping["label"]), get_property_records(chunk, mapping)))
+
+
+def dataframe_to_edges(chunk: pd.DataFrame, mapping: dict) -> list[tuple]:
+    """
+    Convert a chunk into edge tuples.
+
+    Args:
+        chunk: Chunk of input rows
+        mapping: Edge input mapping as returned by `schema.get_input_mappings`
+
+    Returns:
+        List of (source_id, target_id, edge_label, edge_type, properties_dict) tuples
+    """
+    sources = get_id_column(chunk, mapping["columns"]["source"])
+    targets = get_id_column(chunk, mapping["columns"]["target"])
+    label = mapping["label"]
+    return list(zip(sources, targets, repeat(label), repeat(label), get_property_records(chunk, mapping)))
@@ -0,0 +1,182 @@
+"""
+Streaming deduplication of nodes.
+
+Several input files of one schema entry may emit the same node ID. Nodes are
+merged in a dictionary keyed by ID; once it holds more than `max_nodes` IDs,
+it is written to disk as a run sorted by ID and cleared. At the end, all runs
+are merged with a k-way merge, so memory use is bounded by `max_nodes` no
+matter how large the ID space is.
+
+Properties of duplicates are merged with one of these strategies:
+
+- `first`: the first non-null value of each property wins
+- `last`: the last non-null value of each property wins
+- `union`: list-typed properties (e.g. `str[]`) are unioned, other
+  properties behave as with `first`
+"""
+
+import heapq
+import logging
+import pickle
+import tempfile
+from itertools import groupby
+from operator import itemgetter
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MERGE_STRATEGIES = ("first", "last", "union")
+DEFAULT_MAX_NODES = 1_000_000
+RUN_BLOCK_SIZE = 10_000
+
+
+def get_list_properties(mapping: dict) -> set[str]:
+    """Return the properties declared with a list type (e.g. `str[]`) in an input mapping."""
+    return {prop for prop, schema_type in mapping["types"].items() if str(schema_type).endswith("[]")}
+
+
+def _as_list(value) -> list:
+    return list(value) if isinstance(value, (list, tuple)) else [value]
+
+
+def _union(old, new) -> list:
+    """Union two list values, keeping the order of first occurrence."""
+    merged = _as_list(old)
+    seen = set(merged)
+    for item in _as_list(new):
+        if item not in seen:
+            seen.add(item)
+            merged.append(item)
+    return merged
+
+
+class NodeDeduplicator:
+    """
+    Merges nodes with the same ID using bounded memory.
+
+    Without spilling, nodes are emitted in the order their IDs were first
+    seen; once runs were written to disk, they are emitted sorted by ID.
+    """
+
+    def __init__(
+        self,
+        strategy: str = "first",
+        list_properties: set[str] | None = None,
+        max_nodes: int = DEFAULT_MAX_NODES,
+        directory: str | Path | None = None,
+    ):
+        """
+        Initialize the deduplicator.
+
+        Args:
+            strategy: Merge strategy, one of `MERGE_STRATEGIES`
+            list_properties: Properties unioned by the `union` strategy
+            max_nodes: Number of distinct IDs held in memory before spilling
+            directory: Directory for the sorted runs, a temporary directory if None
+        """
+        if strategy not in MERGE_STRATEGIES:
+            raise ValueError(f"Unknown merge strategy '{strategy}', expected one of {MERGE_STRATEGIES}")
+        self.strategy = strategy
+        self.list_properties = set(list_properties or ()) if strategy == "union" else set()
+        self.max_nodes = max_nodes
+        self.directory = directory
+        self.duplicates = 0
+        self.conflicts = 0
+
+    def merge(self, node: tuple, duplicate: tuple) -> tuple:
+        """
+        Merge a later duplicate into a node.
+
+        Differing labels or differing values of properties that are not
+        unioned are counted as conflicts. None values count as missing: they
+        are replaced by values of the duplicate and never replace a value.
+
+        Args:
+            node: (node_id, node_label, properties_dict) tuple seen first
+            duplicate: Tuple with the same ID seen later
+
+        Returns:
+            The merged node tuple
+        """
+        node_id, label, properties = node
+        _, other_label, other = duplicate
+        self.duplicates += 1
+        conflict = other_label != label
+
+        merged = {key: value for key, value in properties.items() if value is not None}
+        for key, value in other.items():
+            if value is None:
+                continue
+            if key not in merged:
+                merged[key] = value
+            elif key in self.list_properties:
+                merged[key] = _union(merged[key], value)
+            elif merged[key] != value:
+                conflict = True
+                if self.strategy == "last":
+                    merged[key] = value
+        if conflict:
+            self.conflicts += 1
+        return (node_id, label, merged)
+
+    def deduplicate(self, nodes):
+        """
+        Merge duplicate nodes of a stream.
+
+        Args:
+            nodes: Iterable of (node_id, node_label, properties_dict) tuples
+
+        Yields:
+            One merged node tuple per distinct ID
+        """
+        if self.directory is not None:
+            Path(self.directory).mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(prefix="dedup-", dir=self.directory) as run_directory:
+            runs = []
+            buffer = {}
+            for node in nodes:
+                existing = buffer.get(node[0])
+                buffer[node[0]] = node if existing is None else self.merge(existing, node)
+                if len(buffer) >= self.max_nodes:
+                    runs.append(self._write_run(buffer, Path(run_directory) / f"run-{len(runs):05d}.pkl"))
+                    buffer = {}
+
+            if not runs:
+                yield from buffer.values()
+            else:
+                if buffer:
+                    runs.append(self._write_run(buffer, Path(run_directory) / f"run-{len(runs):05d}.pkl"))
+                    buffer = {}
+                logger.info(f"Merging {len(runs)} sorted runs of nodes from disk")
+                # heapq.merge is stable, so duplicates arrive in the order they were seen
+                merged = heapq.merge(*(self._read_run(path) for path in runs), key=itemgetter(0))
+                for _, group in groupby(merged, key=itemgetter(0)):
+                    node = next(group)
+                    for duplicate in group:
+                        node = self.merge(node, duplicate)
+                    yield node
+
+        if self.duplicates:
+            logger.info(
+                f"Merged {self.duplicates} duplicate nodes with strategy '{self.strategy}', "
+                f"{self.conflicts} had conflicting labels or properties"
+            )
+
+    @staticmethod
+    def _write_run(buffer: dict, path: Path) -> Path:
+        """Write buffered nodes sorted by ID, in pickled blocks."""
+        nodes = sorted(buffer.values(), key=itemgetter(0))
+        with open(path, "wb") as f:
+            for start in range(0, len(nodes), RUN_BLOCK_SIZE):
+                pickle.dump(nodes[start:start + RUN_BLOCK_SIZE], f, protocol=pickle.HIGHEST_PROTOCOL)
+        logger.debug(f"Spilled {len(nodes)} nodes to {path}")
+        return path
+
+    @staticmethod
+    def _read_run(path: Path):
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    yield from pickle.load(f)
+                except EOFError:
+                    return
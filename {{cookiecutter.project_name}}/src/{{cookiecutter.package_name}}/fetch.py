@@ -0,0 +1,408 @@
+"""
+Fetching of paginated REST resources.
+
+Pages are requested with asyncio over a pooled aiohttp session, so several
+requests are in flight at once while the number of open connections stays
+bounded. The event loop runs in a background thread and keeps a few pages
+of every resource ahead of the consumer, so fetching overlaps with parsing,
+and several resources can be fetched at once on one connection pool. Failed
+requests are retried with exponential backoff and successful responses can
+be cached on disk, so repeated runs do not hit the API again. aiohttp is an
+optional dependency, install it with `pip install -e ".[api]"`.
+
+Two pagination styles are supported:
+
+- `link` (default): follow the `rel="next"` URL of the `Link` header, or a
+  `next` URL in the JSON body. Pages of one resource are fetched in
+  sequence, each requested as soon as the previous one arrived, so a
+  resource costs one round-trip per page; only other resources fetched at
+  the same time overlap with it.
+- `offset` / `page`: set an offset or page number query parameter. Windows
+  of `concurrency` pages are fetched at once until a page comes back short.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_PREFETCH = 2
+DEFAULT_RESPONSE_CACHE_SIZE = 1024**3
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+LINK_NEXT_PATTERN = re.compile(r'<([^>]+)>\s*;\s*rel="?next"?')
+
+
+def is_url(location) -> bool:
+    """Whether a data source location is an HTTP(S) URL."""
+    return str(location).startswith(("http://", "https://"))
+
+
+def _import_aiohttp():
+    """Import aiohttp, which is only needed for API data sources."""
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise ImportError(
+            'Reading from an API requires aiohttp, install it with `pip install -e ".[api]"`'
+        ) from e
+    return aiohttp
+
+
+def set_query_params(url: str, params: dict) -> str:
+    """Return `url` with the given query parameters added or replaced."""
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query, keep_blank_values=True))
+    query.update({key: str(value) for key, value in params.items()})
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def get_records(payload, records_path: str | None = None) -> list:
+    """
+    Extract the list of records from a JSON response.
+
+    Args:
+        payload: Decoded JSON body
+        records_path: Dot-separated key of the records, e.g. `data.items`;
+            by default the body itself if it is a list, else its `results`
+
+    Returns:
+        List of records
+    """
+    if records_path is None:
+        return payload if isinstance(payload, list) else payload.get("results", [])
+    for key in records_path.split("."):
+        payload = payload.get(key, []) if isinstance(payload, dict) else []
+    return payload
+
+
+def get_next_url(link_header: str | None, payload) -> str | None:
+    """Return the URL of the next page from the `Link` header or the body."""
+    if link_header:
+        match = LINK_NEXT_PATTERN.search(link_header)
+        if match:
+            return match.group(1)
+    if isinstance(payload, dict) and isinstance(payload.get("next"), str):
+        return payload["next"]
+    return None
+
+
+class ResponseCache:
+    """
+    On-disk cache of JSON responses, one file per URL.
+
+    Entries older than `max_age` seconds are ignored and removed by `prune`,
+    which also removes the least recently written entries until the cache
+    fits `max_size`. The cache is pruned when it is opened and whenever a
+    tenth of `max_size` has been written since.
+    """
+
+    def __init__(self, directory: str | Path, max_age: float | None = None, max_size: int = DEFAULT_RESPONSE_CACHE_SIZE):
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.max_size = max_size
+        self.written = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.prune()
+
+    def _path(self, url: str) -> Path:
+        return self.directory / f"{hashlib.sha256(url.encode()).hexdigest()}.json"
+
+    def get(self, url: str) -> dict | None:
+        """Return the cached `payload` and `link` header of a URL, or None."""
+        path = self._path(url)
+        try:
+            if self.max_age is not None and time.time() - path.stat().st_mtime > self.max_age:
+                return None
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def put(self, url: str, payload, link: str | None):
+        """Store a response."""
+        path = self._path(url)
+        tmp_path = path.with_suffix(".tmp")
+        data = json.dumps({"url": url, "payload": payload, "link": link})
+        tmp_path.write_text(data)
+        tmp_path.replace(path)
+        self.written += len(data)
+        if self.written > self.max_size // 10:
+            self.prune()
+
+    def prune(self):
+        """Remove expired responses, then the oldest ones until the cache fits `max_size`."""
+        self.written = 0
+        entries = []
+        for path in self.directory.glob("*.json"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for mtime, size, path in sorted(entries, key=lambda entry: entry[0]):
+            expired = self.max_age is not None and now - mtime > self.max_age
+            if not expired and total <= self.max_size:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        if removed:
+            logger.debug(f"Pruned {removed} cached responses from {self.directory}")
+
+
+class PageFetcher:
+    """
+    Event loop thread fetching the pages of some resources.
+
+    Every resource has a producer task putting its pages into a queue of at
+    most `prefetch` pages; the consumer takes them from its own thread. Once
+    all resources are closed, the session and the loop are shut down.
+    """
+
+    def __init__(self, client: "ApiClient", resources: list[tuple]):
+        """
+        Start fetching.
+
+        Args:
+            client: Client whose settings are used
+            resources: List of (url, records, pagination) tuples, see `ApiClient.iter_pages`
+        """
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name="api-fetch", daemon=True)
+        self.thread.start()
+        self.session = self._call(client._open_session())
+        self.queues = [asyncio.Queue(maxsize=client.prefetch) for _ in resources]
+        self.tasks = self._call(self._start(client, resources))
+        self.open = set(range(len(resources)))
+
+    def _call(self, coroutine):
+        """Run a coroutine on the loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def _start(self, client: "ApiClient", resources: list[tuple]) -> list[asyncio.Task]:
+        """Create one producer task per resource."""
+        return [
+            asyncio.create_task(self._produce(client.iter_pages_async(self.session, *resource), queue))
+            for resource, queue in zip(resources, self.queues)
+        ]
+
+    async def _shutdown(self):
+        """Wait for the cancelled producers and close the session."""
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        await self.session.close()
+
+    @staticmethod
+    async def _produce(pages, queue: asyncio.Queue):
+        """Put the pages of a resource into its queue, followed by None or the error raised."""
+        try:
+            async for page in pages:
+                await queue.put((page, None))
+            await queue.put((None, None))
+        except Exception as e:
+            await queue.put((None, e))
+
+    def pages(self, index: int):
+        """
+        Yield the pages of one resource as they arrive.
+
+        Yields:
+            Lists of records, one per page, in page order
+        """
+        try:
+            while True:
+                page, error = self._call(self.queues[index].get())
+                if error is not None:
+                    raise error
+                if page is None:
+                    return
+                yield page
+        finally:
+            self.close(index)
+
+    def close(self, index: int | None = None):
+        """Stop fetching one resource, or all of them; the loop stops with the last one."""
+        for i in list(self.open) if index is None else [index]:
+            if i in self.open:
+                self.open.discard(i)
+                self.loop.call_soon_threadsafe(self.tasks[i].cancel)
+        if self.open or self.loop.is_closed():
+            return
+        self._call(self._shutdown())
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+        self.loop.close()
+
+
+class ApiClient:
+    """
+    Concurrent client for paginated JSON APIs.
+
+    The client holds only its settings, so it can be passed to worker
+    processes; every call to `iter_pages` or `fetch_resources` runs its own
+    event loop and connection pool.
+    """
+
+    def __init__(
+        self,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        retries: int = 3,
+        backoff: float = 0.5,
+        timeout: float = 60,
+        headers: dict | None = None,
+        cache_directory: str | Path | None = None,
+        cache_max_age: float | None = None,
+        cache_max_size: int = DEFAULT_RESPONSE_CACHE_SIZE,
+        prefetch: int = DEFAULT_PREFETCH,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            concurrency: Maximum number of requests in flight
+            retries: Number of retries of a failed request
+            backoff: Delay before the first retry in seconds, doubled for
+                every further retry
+            timeout: Total timeout of a request in seconds
+            headers: Headers sent with every request
+            cache_directory: Directory to cache responses in, no caching if None
+            cache_max_age: Maximum age of cached responses in seconds
+            cache_max_size: Maximum total size of cached responses in bytes
+            prefetch: Pages fetched ahead of the consumer per resource
+        """
+        self.concurrency = concurrency
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.headers = {"Accept": "application/json", **(headers or {})}
+        self.cache = ResponseCache(cache_directory, cache_max_age, cache_max_size) if cache_directory else None
+        self.prefetch = prefetch
+
+    async def _open_session(self):
+        aiohttp = _import_aiohttp()
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency),
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers=self.headers,
+        )
+
+    async def _fetch(self, session, url: str) -> tuple:
+        """
+        Fetch one page, from the cache if possible.
+
+        Returns:
+            Tuple of the decoded JSON body and the URL of the next page
+        """
+        if self.cache is not None:
+            cached = self.cache.get(url)
+            if cached is not None:
+                return cached["payload"], get_next_url(cached["link"], cached["payload"])
+
+        aiohttp = _import_aiohttp()
+        for attempt in range(self.retries + 1):
+            try:
+                async with session.get(url) as response:
+                    if response.status not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        payload = await response.json(content_type=None)
+                        link = response.headers.get("Link")
+                        break
+                    retry_after = response.headers.get("Retry-After", "")
+                    error = f"HTTP {response.status}"
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                retry_after = ""
+                error = repr(e)
+            if attempt == self.retries:
+                raise RuntimeError(f"Request to {url} failed after {self.retries} retries: {error}")
+            delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2**attempt
+            logger.warning(f"Request to {url} failed ({error}), retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+        if self.cache is not None:
+            self.cache.put(url, payload, link)
+        return payload, get_next_url(link, payload)
+
+    async def _fetch_all(self, session, urls: list[str]) -> list[tuple]:
+        """Fetch several pages concurrently, see `_fetch`."""
+        return await asyncio.gather(*(self._fetch(session, url) for url in urls))
+
+    async def iter_pages_async(self, session, url: str, records: str | None = None, pagination: dict | None = None):
+        """Fetch all pages of a resource on a session, see `iter_pages`."""
+        pagination = pagination or {}
+        if pagination.get("type", "link") == "link":
+            next_url = url
+            while next_url:
+                payload, next_url = await self._fetch(session, next_url)
+                yield get_records(payload, records)
+            return
+
+        size = pagination.get("size", DEFAULT_PAGE_SIZE)
+        offset = pagination["type"] == "offset"
+        param = pagination.get("param", "offset" if offset else "page")
+        size_param = pagination.get("size_param", "limit" if offset else "per_page")
+        number = pagination.get("start", 0 if offset else 1)
+        step = size if offset else 1
+        while True:
+            urls = [
+                set_query_params(url, {param: number + i * step, size_param: size})
+                for i in range(self.concurrency)
+            ]
+            number += len(urls) * step
+            for payload, _ in await self._fetch_all(session, urls):
+                page = get_records(payload, records)
+                if page:
+                    yield page
+                if len(page) < size:
+                    return
+
+    def fetch_resources(self, resources: list[tuple]) -> PageFetcher:
+        """
+        Start fetching several resources at once on one connection pool.
+
+        Up to `prefetch` pages per resource are fetched ahead of the
+        consumer. The connection pool is released once the pages of every
+        resource are exhausted, or by `PageFetcher.close`.
+
+        Args:
+            resources: List of (url, records, pagination) tuples, see `iter_pages`
+
+        Returns:
+            `PageFetcher` whose `pages(index)` yields the pages of the
+            resource at that index
+        """
+        return PageFetcher(self, resources)
+
+    def iter_pages(self, url: str, records: str | None = None, pagination: dict | None = None):
+        """
+        Fetch all pages of a resource.
+
+        The next page is fetched in the background while the current one is
+        consumed, see `fetch_resources`.
+
+        Args:
+            url: URL of the first page
+            records: Dot-separated key of the records in a response, see `get_records`
+            pagination: Pagination settings: `type` (`link`, `offset` or
+                `page`), `param` (query parameter of the offset or page
+                number), `size_param` and `size` (page size) and `start`
+                (number of the first page)
+
+        Yields:
+            Lists of records, one per page, in page order
+        """
+        fetcher = self.fetch_resources([(url, records, pagination)])
+        try:
+            yield from fetcher.pages(0)
+        finally:
+            fetcher.close()
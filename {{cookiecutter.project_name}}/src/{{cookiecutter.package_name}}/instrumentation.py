@@ -0,0 +1,255 @@
+"""
+Pipeline instrumentation for {{ cookiecutter.project_name }}.
+
+Wraps the node and edge generators handed to BioCypher to measure how much
+time is spent producing tuples (adapter) versus consuming them (BioCypher's
+writer), counts rows per label and records the peak resident set size. The
+results, together with the throughput of the bulk load into the database,
+the schema coverage of sampled builds and the property type violations, are
+written as a JSON report and optionally as a Prometheus textfile.
+"""
+
+import json
+import logging
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+
+def get_peak_rss() -> dict:
+    """
+    Return the peak resident set size of this process and its children.
+
+    Returns:
+        Dictionary with `self` and `children` in bytes, None where unavailable
+    """
+    if resource is None:
+        return {"self": None, "children": None}
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    scale = 1 if sys.platform == "darwin" else 1024
+    return {
+        "self": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        "children": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale,
+    }
+
+
+def _escape_label_value(value) -> str:
+    """Escape backslashes, double quotes and line feeds in a Prometheus label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(**labels) -> str:
+    """Format Prometheus metric labels, e.g. `{stage="protein"}`."""
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels.items()) + "}"
+
+
+class PipelineMetrics:
+    """
+    Collects per-stage timing and row counts of a pipeline run.
+
+    A stage is one generator passed to BioCypher, e.g. the nodes of one
+    schema entry.
+    """
+
+    def __init__(self):
+        self.started = datetime.now(timezone.utc)
+        self._start = time.perf_counter()
+        self.stages = []
+        self.adapters = {}
+        self.load = None
+        self.coverage = None
+        self.properties = None
+
+    def instrument(self, tuples, kind: str, name: str, adapter: str | None = None):
+        """
+        Wrap a node or edge generator to record its timing and row counts.
+
+        Time spent inside the wrapped generator is attributed to the adapter,
+        time between handing out a tuple and the next request to the writer.
+
+        Args:
+            tuples: Iterable of node or edge tuples
+            kind: Either "node" or "edge"
+            name: Name of the stage, e.g. the schema entry
+            adapter: Name of the adapter the tuples come from
+
+        Yields:
+            The tuples from `tuples`
+        """
+        stage = {"name": name, "kind": kind, "adapter": adapter, "rows": 0, "adapter_s": 0.0, "writer_s": 0.0, "labels": {}}
+        self.stages.append(stage)
+        label_index = 1 if kind == "node" else 2
+        labels = stage["labels"]
+        adapter_time = writer_time = 0.0
+        clock = time.perf_counter
+        started = last = clock()
+
+        try:
+            for item in tuples:
+                now = clock()
+                adapter_time += now - last
+                label = item[label_index]
+                labels[label] = labels.get(label, 0) + 1
+                yield item
+                last = clock()
+                writer_time += last - now
+        finally:
+            wall = clock() - started
+            stage["rows"] = sum(labels.values())
+            stage["adapter_s"] = round(adapter_time, 3)
+            stage["writer_s"] = round(writer_time, 3)
+            stage["wall_s"] = round(wall, 3)
+            stage["rows_per_s"] = round(stage["rows"] / wall, 1) if wall > 0 else None
+            stage["labels"] = {
+                label: {"rows": rows, "rows_per_s": round(rows / wall, 1) if wall > 0 else None}
+                for label, rows in labels.items()
+            }
+            logger.info(
+                f"{kind} stage '{name}': {stage['rows']} rows in {wall:.2f}s "
+                f"(adapter {adapter_time:.2f}s, writer {writer_time:.2f}s)"
+            )
+
+    def record_adapter(self, name: str, status: str, seconds: float, error: str | None = None):
+        """
+        Record the outcome of an adapter.
+
+        Args:
+            name: Name of the adapter
+            status: Either "done" or "failed"
+            seconds: Time the adapter spent extracting
+            error: Error message of a failed adapter
+        """
+        self.adapters[name] = {"status": status, "seconds": round(seconds, 3), "error": error}
+        if error:
+            logger.error(f"Adapter '{name}' failed after {seconds:.2f}s: {error}")
+        else:
+            logger.info(f"Adapter '{name}' finished in {seconds:.2f}s")
+
+    def record_load(self, result: dict):
+        """
+        Record the outcome of the bulk load into the database.
+
+        Args:
+            result: Import counts and throughput as returned by `load.load_graph`
+        """
+        self.load = result
+
+    def record_coverage(self, coverage: dict):
+        """
+        Record the schema coverage of a sampled build.
+
+        Args:
+            coverage: Coverage as returned by `sample.SchemaCoverage.report`
+        """
+        self.coverage = coverage
+
+    def record_properties(self, properties: dict):
+        """
+        Record the property type violations of a build.
+
+        Args:
+            properties: Violations as returned by `properties.PropertyValidator.report`
+        """
+        self.properties = properties
+
+    def report(self) -> dict:
+        """Return the collected metrics as a JSON-serializable dictionary."""
+        return {
+            "started": self.started.isoformat(),
+            "duration_s": round(time.perf_counter() - self._start, 3),
+            "peak_rss_bytes": get_peak_rss(),
+            "adapter_s": round(sum(stage["adapter_s"] for stage in self.stages), 3),
+            "writer_s": round(sum(stage["writer_s"] for stage in self.stages), 3),
+            "adapters": {
+                name: dict(
+                    outcome,
+                    rows=sum(stage["rows"] for stage in self.stages if stage["adapter"] == name),
+                )
+                for name, outcome in self.adapters.items()
+            },
+            "stages": self.stages,
+            "load": self.load,
+            "coverage": self.coverage,
+            "properties": self.properties,
+        }
+
+    def write_json(self, log_directory: str | Path = "logs") -> Path:
+        """
+        Write the report as JSON into the log directory.
+
+        Args:
+            log_directory: Directory for the report file
+
+        Returns:
+            Path of the written report
+        """
+        log_directory = Path(log_directory)
+        log_directory.mkdir(parents=True, exist_ok=True)
+        path = log_directory / f"pipeline_report-{self.started.strftime('%Y%m%d-%H%M%S')}.json"
+        path.write_text(json.dumps(self.report(), indent=2))
+        logger.info(f"Wrote pipeline report to {path}")
+        return path
+
+    def write_prometheus(self, path: str | Path):
+        """
+        Write the metrics in the Prometheus text exposition format.
+
+        The file is replaced atomically, as expected by the node exporter's
+        textfile collector.
+
+        Args:
+            path: Path of the `.prom` file
+        """
+        report = self.report()
+        lines = [
+            "# TYPE biocypher_pipeline_duration_seconds gauge",
+            f"biocypher_pipeline_duration_seconds {report['duration_s']}",
+            "# TYPE biocypher_pipeline_peak_rss_bytes gauge",
+        ]
+        for process, value in report["peak_rss_bytes"].items():
+            if value is not None:
+                lines.append(f"biocypher_pipeline_peak_rss_bytes{_format_labels(process=process)} {value}")
+        lines.append("# TYPE biocypher_pipeline_stage_seconds gauge")
+        for stage in self.stages:
+            for component in ("adapter", "writer"):
+                selector = _format_labels(stage=stage["name"], kind=stage["kind"], component=component)
+                lines.append(f"biocypher_pipeline_stage_seconds{selector} {stage[component + '_s']}")
+        lines.append("# TYPE biocypher_pipeline_adapter_seconds gauge")
+        for name, outcome in report["adapters"].items():
+            lines.append(f"biocypher_pipeline_adapter_seconds{_format_labels(adapter=name)} {outcome['seconds']}")
+        lines.append("# TYPE biocypher_pipeline_adapter_failed gauge")
+        for name, outcome in report["adapters"].items():
+            lines.append(f"biocypher_pipeline_adapter_failed{_format_labels(adapter=name)} {int(outcome['status'] == 'failed')}")
+        lines.append("# TYPE biocypher_pipeline_rows gauge")
+        for stage in self.stages:
+            for label, counts in stage["labels"].items():
+                selector = _format_labels(stage=stage["name"], kind=stage["kind"], label=label)
+                lines.append(f"biocypher_pipeline_rows{selector} {counts['rows']}")
+        if self.load:
+            lines.append("# TYPE biocypher_pipeline_load_seconds gauge")
+            lines.append(f"biocypher_pipeline_load_seconds {self.load['seconds']}")
+            lines.append("# TYPE biocypher_pipeline_load_rows gauge")
+            for kind in ("nodes", "relationships"):
+                if self.load[kind] is not None:
+                    lines.append(f"biocypher_pipeline_load_rows{_format_labels(kind=kind)} {self.load[kind]}")
+        if self.properties:
+            lines.append("# TYPE biocypher_pipeline_property_violations gauge")
+            for label, counts in self.properties.items():
+                for violation in ("coerced", "invalid", "unknown"):
+                    for prop, count in counts[violation].items():
+                        selector = _format_labels(label=label, property=prop, violation=violation)
+                        lines.append(f"biocypher_pipeline_property_violations{selector} {count}")
+
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text("\n".join(lines) + "\n")
+        tmp_path.replace(path)
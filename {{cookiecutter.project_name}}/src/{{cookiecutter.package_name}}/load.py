@@ -0,0 +1,373 @@
+"""
+Bulk loading of the BioCypher output into Neo4j.
+
+The import files are collected from the output directory itself rather than
+from BioCypher's generated import script: with incremental builds, the files
+of unchanged schema entries come from earlier runs, which the script of the
+current run does not know about. Files are grouped per label into node and
+edge inputs. CSV part files larger than the shard size are split into
+line-aligned shards in a staging directory, so `neo4j-admin` can read one
+label from several files; smaller files are imported in place.
+
+`neo4j-admin database import full` runs with tuned `--threads` and
+`--high-parallel-io` either through the `neo4j` service of
+docker-compose.yml, which is stopped for the import and started again
+afterwards, or with a local `neo4j-admin`. The result reports the imported
+nodes, relationships and properties and the import throughput.
+"""
+
+import logging
+import os
+import re
+import shutil
+import subprocess
+import time
+from pathlib import Path, PurePosixPath
+
+logger = logging.getLogger(__name__)
+
+LOAD_MODES = ("compose", "local")
+HIGH_PARALLEL_IO = ("on", "off", "auto")
+# Sharding copies the split parts, so it is opt-in
+DEFAULT_LOAD_SHARD_SIZE = 0
+STAGING_NAME = "neo4j-import"
+# Where docker-compose.yml mounts the output directory in the neo4j service
+COMPOSE_IMPORT_DIRECTORY = "/var/lib/neo4j/import"
+COMPOSE_SERVICE = "neo4j"
+
+PART_PATTERN = re.compile(r"^(?P<label>.+)-part\d+\.(?P<format>csv|parquet)$")
+SUMMARY_PATTERN = re.compile(r"(\d+) (nodes|relationships|properties)\b")
+
+
+def detect_delimiter(header_path: str | Path) -> str:
+    """Return the column delimiter of a BioCypher CSV header file, which starts with `:ID` or `:START_ID`."""
+    header = Path(header_path).read_text(encoding="utf-8").splitlines()[0]
+    first = re.match(r"^[^:]*:\w+", header).group(0)
+    return header[len(first):len(first) + 1] or ","
+
+
+def _read_columns(path: Path) -> list[str]:
+    """Return the column names of a CSV header file or a Parquet part file."""
+    if path.suffix == ".parquet":
+        from .columnar import _import_pyarrow
+
+        _import_pyarrow()
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path).names
+    header = path.read_text(encoding="utf-8").splitlines()[0]
+    return header.split(detect_delimiter(path))
+
+
+def find_import_files(directory: str | Path) -> list[dict]:
+    """
+    Collect the import files in BioCypher's output directory.
+
+    Args:
+        directory: Output directory
+
+    Returns:
+        List of dictionaries with the keys `kind` ("node" or "edge"),
+        `label` (file name prefix, e.g. `Protein`), `format` ("csv" or
+        "parquet"), `header` (CSV header file, or None) and `parts` (data
+        files), sorted by kind and label
+    """
+    directory = Path(directory)
+    groups = {}
+    for path in sorted(directory.iterdir()):
+        match = PART_PATTERN.match(path.name)
+        if path.is_file() and match:
+            group = groups.setdefault(match["label"], {"label": match["label"], "format": match["format"], "parts": []})
+            group["parts"].append(path)
+
+    files = []
+    for label, group in groups.items():
+        header = directory / f"{label}-header.csv"
+        if group["format"] == "csv" and not header.exists():
+            logger.warning(f"Skipping {label}: {header.name} is missing")
+            continue
+        group["header"] = header if group["format"] == "csv" else None
+        columns = _read_columns(group["header"] or group["parts"][0])
+        group["kind"] = "edge" if ":START_ID" in columns else "node"
+        files.append(group)
+    return sorted(files, key=lambda group: (group["kind"] != "node", group["label"]))
+
+
+def split_file(path: str | Path, directory: str | Path, shard_size: int) -> list[Path]:
+    """
+    Split a headerless CSV part file into line-aligned shards.
+
+    Neo4j's importer does not accept line breaks inside fields unless
+    `--multiline-fields` is set, so every line is one record and shards can
+    be cut at line boundaries.
+
+    Args:
+        path: Part file
+        directory: Directory for the shards
+        shard_size: Approximate size of a shard in bytes
+
+    Returns:
+        Paths of the shards, in order
+    """
+    path = Path(path)
+    shards = []
+    with open(path, "rb") as source:
+        while True:
+            block = source.read(min(shard_size, 1024 * 1024))
+            if not block:
+                break
+            shard = Path(directory) / f"{path.stem}-shard{len(shards):03d}{path.suffix}"
+            with open(shard, "wb") as target:
+                written = 0
+                while block:
+                    target.write(block)
+                    written += len(block)
+                    if written >= shard_size:
+                        break
+                    block = source.read(min(shard_size - written, 1024 * 1024))
+                target.write(source.readline())
+            shards.append(shard)
+    return shards
+
+
+def shard_import_files(files: list[dict], staging_directory: str | Path, shard_size: int = DEFAULT_LOAD_SHARD_SIZE) -> list[dict]:
+    """
+    Split large CSV part files into shards.
+
+    The staging directory is emptied first, so shards of earlier loads never
+    end up in the import.
+
+    Args:
+        files: Import files as returned by `find_import_files`
+        staging_directory: Directory for the shards
+        shard_size: Maximum size of a part file in bytes before it is split;
+            0 disables sharding
+
+    Returns:
+        The import files with the split parts replaced by their shards
+    """
+    staging_directory = Path(staging_directory)
+    shutil.rmtree(staging_directory, ignore_errors=True)
+    sharded = []
+    for group in files:
+        parts = []
+        for path in group["parts"]:
+            if shard_size and group["format"] == "csv" and path.stat().st_size > shard_size:
+                staging_directory.mkdir(parents=True, exist_ok=True)
+                shards = split_file(path, staging_directory, shard_size)
+                logger.info(f"Split {path.name} into {len(shards)} shards")
+                parts.extend(shards)
+            else:
+                parts.append(path)
+        sharded.append(dict(group, parts=parts))
+    return sharded
+
+
+def get_import_settings(neo4j_config: dict) -> dict:
+    """
+    Read the import settings from the `neo4j` section of the BioCypher configuration.
+
+    Both the current (`csv_column_delimiter`, ...) and the older
+    (`delimiter`, ...) key names are understood, the current ones take
+    precedence, like in BioCypher's writer.
+    """
+    return {
+        "database": neo4j_config.get("database_name") or "neo4j",
+        "delimiter": neo4j_config.get("csv_column_delimiter") or neo4j_config.get("delimiter") or ",",
+        "array_delimiter": neo4j_config.get("csv_array_delimiter") or neo4j_config.get("array_delimiter") or "|",
+        "quote": neo4j_config.get("csv_string_quote_character") or neo4j_config.get("quote_character") or '"',
+        "wipe": bool(neo4j_config.get("wipe", True)),
+        "skip_bad_relationships": bool(neo4j_config.get("skip_bad_relationships")),
+        "skip_duplicate_nodes": bool(neo4j_config.get("skip_duplicate_nodes")),
+        "bin_prefix": neo4j_config.get("import_call_bin_prefix") or "",
+    }
+
+
+def _escape_delimiter(delimiter: str) -> str:
+    return "TAB" if delimiter in ("\t", "\\t") else delimiter
+
+
+def build_import_command(
+    files: list[dict],
+    settings: dict,
+    root: str | Path,
+    file_prefix: str | None = None,
+    threads: int | None = None,
+    high_parallel_io: str = "auto",
+) -> list[str]:
+    """
+    Build the `neo4j-admin database import full` command.
+
+    Args:
+        files: Import files as returned by `find_import_files`
+        settings: Import settings as returned by `get_import_settings`
+        root: Directory the file paths are relative to, i.e. the output
+            directory
+        file_prefix: Path of `root` as seen by `neo4j-admin`, e.g. the
+            import directory of a container; None keeps the local paths
+        threads: Number of importer threads; None lets Neo4j decide
+        high_parallel_io: "on" for SSD/NVMe storage, "off" for spinning
+            disks or "auto"
+
+    Returns:
+        Command as a list of arguments
+    """
+    def location(path: Path) -> str:
+        if file_prefix is None:
+            return str(path)
+        return str(PurePosixPath(file_prefix) / Path(path).relative_to(root).as_posix())
+
+    command = [f"{settings['bin_prefix']}neo4j-admin", "database", "import", "full"]
+    if threads:
+        command.append(f"--threads={threads}")
+    command.append(f"--high-parallel-io={high_parallel_io}")
+    if settings["wipe"]:
+        command.append("--overwrite-destination=true")
+    if any(group["format"] == "parquet" for group in files):
+        command.append("--input-type=parquet")
+    else:
+        delimiter = detect_delimiter(files[0]["header"]) if files else settings["delimiter"]
+        command += [
+            f"--delimiter={_escape_delimiter(delimiter)}",
+            f"--array-delimiter={_escape_delimiter(settings['array_delimiter'])}",
+            f"--quote={settings['quote']}",
+        ]
+    if settings["skip_bad_relationships"]:
+        command.append("--skip-bad-relationships=true")
+    if settings["skip_duplicate_nodes"]:
+        command.append("--skip-duplicate-nodes=true")
+    for group in files:
+        paths = ([group["header"]] if group["header"] else []) + group["parts"]
+        option = "--nodes" if group["kind"] == "node" else "--relationships"
+        command.append(f"{option}={','.join(location(path) for path in paths)}")
+    command.append(settings["database"])
+    return command
+
+
+def parse_import_summary(output: str) -> dict:
+    """
+    Read the imported counts from the output of `neo4j-admin database import`.
+
+    Returns:
+        Dictionary with `nodes`, `relationships` and `properties`, None for
+        counts missing from the output
+    """
+    counts = {"nodes": None, "relationships": None, "properties": None}
+    summary = output[output.rfind("Imported:"):] if "Imported:" in output else output
+    for number, name in SUMMARY_PATTERN.findall(summary):
+        counts[name] = int(number)
+    return counts
+
+
+def _run(command: list[str]) -> str:
+    """Run a command, streaming its output to the log, and return the output."""
+    logger.info(f"Running {' '.join(command)}")
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    lines = []
+    for line in process.stdout:
+        lines.append(line)
+        logger.info(line.rstrip())
+    if process.wait() != 0:
+        raise RuntimeError(f"{command[0]} exited with code {process.returncode}")
+    return "".join(lines)
+
+
+def run_import(command: list[str], mode: str = "compose", service: str = COMPOSE_SERVICE, runner: list[str] | None = None) -> tuple[str, float]:
+    """
+    Run the import command.
+
+    Args:
+        command: Command as returned by `build_import_command`
+        mode: "compose" runs the command in a one-off container of the
+            docker compose `service`, which is stopped during the import
+            (an online database cannot be imported into) and started again
+            afterwards; "local" runs it directly
+        service: Name of the Neo4j service in docker-compose.yml
+        runner: Command prefix to run the import with instead, e.g. a
+            `docker run` invocation; overrides `mode`
+
+    Returns:
+        Tuple of the output of `neo4j-admin` and the import time in seconds
+    """
+    if runner is not None or mode == "local":
+        started = time.perf_counter()
+        output = _run([*(runner or []), *command])
+        return output, time.perf_counter() - started
+
+    _run(["docker", "compose", "stop", service])
+    try:
+        started = time.perf_counter()
+        output = _run(["docker", "compose", "run", "--rm", "--no-deps", "-T", service, *command])
+        seconds = time.perf_counter() - started
+    finally:
+        _run(["docker", "compose", "start", service])
+    return output, seconds
+
+
+def load_graph(
+    output_directory: str | Path,
+    neo4j_config: dict,
+    mode: str = "compose",
+    threads: int | None = None,
+    high_parallel_io: str = "auto",
+    shard_size: int = DEFAULT_LOAD_SHARD_SIZE,
+    runner: list[str] | None = None,
+    file_prefix: str | None = None,
+) -> dict:
+    """
+    Shard the import files and bulk load them into Neo4j.
+
+    Args:
+        output_directory: BioCypher's output directory
+        neo4j_config: `neo4j` section of the BioCypher configuration
+        mode: How to run `neo4j-admin`, see `run_import`
+        threads: Number of importer threads, defaults to the CPU count
+        high_parallel_io: "on", "off" or "auto", see `build_import_command`
+        shard_size: Size in bytes above which CSV part files are split, 0 (the
+            default) to import them as written
+        runner: Command prefix overriding `mode`, see `run_import`
+        file_prefix: Path of the output directory as seen by `neo4j-admin`;
+            defaults to the compose import directory in "compose" mode
+
+    Returns:
+        Dictionary with the number of `files` and `bytes` imported, the
+        imported `nodes`, `relationships` and `properties`, the import time
+        `seconds` and the throughput `rows_per_s` and `mb_per_s`
+    """
+    output_directory = Path(output_directory)
+    files = find_import_files(output_directory)
+    if not files:
+        raise ValueError(f"No import files found in {output_directory}")
+    files = shard_import_files(files, output_directory / STAGING_NAME, shard_size)
+    if file_prefix is None and mode == "compose" and runner is None:
+        file_prefix = COMPOSE_IMPORT_DIRECTORY
+
+    threads = threads or os.cpu_count()
+    command = build_import_command(
+        files,
+        get_import_settings(neo4j_config),
+        output_directory,
+        file_prefix=file_prefix,
+        threads=threads,
+        high_parallel_io=high_parallel_io,
+    )
+    output, seconds = run_import(command, mode, runner=runner)
+
+    paths = [path for group in files for path in ([group["header"]] if group["header"] else []) + group["parts"]]
+    size = sum(path.stat().st_size for path in paths)
+    result = {
+        "files": len(paths),
+        "bytes": size,
+        "threads": threads,
+        "high_parallel_io": high_parallel_io,
+        **parse_import_summary(output),
+        "seconds": round(seconds, 3),
+    }
+    rows = (result["nodes"] or 0) + (result["relationships"] or 0)
+    result["rows_per_s"] = round(rows / seconds, 1) if seconds else None
+    result["mb_per_s"] = round(size / 1024**2 / seconds, 2) if seconds else None
+    logger.info(
+        f"Imported {result['nodes']} nodes and {result['relationships']} relationships "
+        f"from {len(paths)} files in {seconds:.2f}s ({result['rows_per_s']} rows/s, {result['mb_per_s']} MB/s)"
+    )
+    return result
@@ -0,0 +1,181 @@
+"""
+Build manifest for incremental rebuilds.
+
+The manifest records, per schema entry, a fingerprint of every input file
+and the output files BioCypher wrote for it, together with a hash of the
+schema configuration and the adapter version. On the next run only the
+entries whose inputs changed are extracted again; the output files of all
+other entries are kept as they are.
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = "build_manifest.json"
+# Written by `checkpoint.BuildCheckpoint`, not an output of any entry
+CHECKPOINT_NAME = "build_checkpoint.json"
+
+
+def hash_file(path: str | Path) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, "sha256").hexdigest()
+
+
+def fingerprint_file(path: str | Path, checksum: bool = False) -> dict:
+    """
+    Fingerprint an input file.
+
+    Args:
+        path: Path to the file
+        checksum: Identify the file by its content hash instead of its
+            modification time, so that rewritten but identical files
+            count as unchanged
+
+    Returns:
+        Dictionary with `size` and either `mtime_ns` or `sha256`
+    """
+    stat = os.stat(path)
+    if checksum:
+        return {"size": stat.st_size, "sha256": hash_file(path)}
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+class BuildManifest:
+    """
+    Manifest of the inputs and outputs of the last build.
+
+    The manifest is stored as JSON in the output directory.
+    """
+
+    def __init__(
+        self,
+        output_directory: str | Path,
+        schema_config_path: str | Path,
+        adapter_version: str,
+        checksum: bool = False,
+    ):
+        """
+        Initialize the manifest and load the previous one, if any.
+
+        Args:
+            output_directory: Directory BioCypher writes its files to
+            schema_config_path: Path to the schema configuration
+            adapter_version: Version of the adapter package
+            checksum: Compare input files by content hash instead of
+                modification time and size
+        """
+        self.output_directory = Path(output_directory)
+        self.path = self.output_directory / MANIFEST_NAME
+        self.checksum = checksum
+        self._fingerprints = {}
+        self.build = {
+            "schema_hash": hash_file(schema_config_path),
+            "adapter_version": adapter_version,
+        }
+        self.previous = self._load()
+        self.entries = dict(self.previous.get("entries", {})) if self._is_compatible() else {}
+
+    def _load(self) -> dict:
+        """Load the previous manifest, or an empty one."""
+        if not self.path.exists():
+            return {}
+        try:
+            return json.loads(self.path.read_text())
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable build manifest {self.path}: {e}")
+            return {}
+
+    def _is_compatible(self) -> bool:
+        """Whether the previous build used the same schema and adapter version."""
+        return all(self.previous.get(key) == value for key, value in self.build.items())
+
+    def fingerprint_inputs(self, paths: list[Path]) -> dict:
+        """Fingerprint a list of input files, keyed by path; each file is fingerprinted once."""
+        for path in paths:
+            if str(path) not in self._fingerprints:
+                self._fingerprints[str(path)] = fingerprint_file(path, self.checksum)
+        return {str(path): self._fingerprints[str(path)] for path in paths}
+
+    def get_stale_entries(self, input_files: dict[str, list[Path]]) -> list[str]:
+        """
+        Determine the schema entries that have to be rebuilt.
+
+        An entry is stale if it was not part of the previous build, if any of
+        its input files was added, removed or changed, or if the schema
+        configuration or adapter version changed since. Entries without
+        input files, e.g. fetched from an API, cannot be fingerprinted and
+        are always stale.
+
+        Args:
+            input_files: Input files per schema entry name
+
+        Returns:
+            Names of the stale entries, in the order of `input_files`
+        """
+        if self.previous and not self._is_compatible():
+            logger.info("Schema configuration or adapter version changed, rebuilding everything")
+
+        stale = []
+        for name, paths in input_files.items():
+            recorded = self.entries.get(name)
+            if not paths or recorded is None or recorded["inputs"] != self.fingerprint_inputs(paths):
+                stale.append(name)
+        logger.info(f"{len(stale)} of {len(input_files)} schema entries changed: {stale}")
+        return stale
+
+    def remove_outputs(self, names: list[str]):
+        """
+        Delete the output files recorded for schema entries.
+
+        For an incompatible previous build, the outputs of all its entries
+        are deleted.
+
+        Args:
+            names: Names of the entries whose outputs are deleted
+        """
+        recorded = self.previous.get("entries", {})
+        if not self._is_compatible():
+            names = list(recorded)
+        for name in names:
+            for file_name in recorded.get(name, {}).get("outputs", []):
+                (self.output_directory / file_name).unlink(missing_ok=True)
+            self.entries.pop(name, None)
+
+    def list_outputs(self) -> set[str]:
+        """Return the names of all files currently in the output directory."""
+        if not self.output_directory.exists():
+            return set()
+        files = {path.name for path in self.output_directory.iterdir() if path.is_file()}
+        return files - {MANIFEST_NAME, CHECKPOINT_NAME}
+
+    def list_recorded_outputs(self) -> set[str]:
+        """Return the names of the output files of all recorded entries."""
+        return {file_name for entry in self.entries.values() for file_name in entry["outputs"]}
+
+    def record(self, name: str, input_files: list[Path], outputs: set[str]):
+        """
+        Record the inputs and outputs of a rebuilt schema entry.
+
+        Args:
+            name: Name of the schema entry
+            input_files: Input files the entry was extracted from
+            outputs: Names of the files written for the entry
+        """
+        self.entries[name] = {
+            "inputs": self.fingerprint_inputs(input_files),
+            "outputs": sorted(outputs),
+        }
+
+    def save(self):
+        """Write the manifest to the output directory."""
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+        manifest = dict(self.build, entries=self.entries)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+        tmp_path.replace(self.path)
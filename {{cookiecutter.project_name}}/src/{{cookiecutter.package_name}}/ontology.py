@@ -0,0 +1,250 @@
+"""
+Warm cache of the parsed ontology for {{ cookiecutter.project_name }}.
+
+Before any data is written, BioCypher parses the head ontology and any tail
+ontologies, joins them and extends the result with the classes of the schema
+configuration. This takes a long time on every run and needs the network
+when the ontologies are given by URL. `OntologyCache` builds the ontology
+once and stores it as a pickle under `cache_directory/ontology`, so later
+runs, containers and tests load it in milliseconds.
+
+The cache is versioned: its key covers the ontology settings, the contents of
+the schema configuration, the size and modification time of local ontology
+files and the BioCypher version. Changing any of them builds a new cache
+entry and removes the old one. Remote ontology files are downloaded once and
+kept next to the cache, so a changed schema does not need the network either.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+import time
+import urllib.request
+from pathlib import Path
+
+import biocypher
+from biocypher._mapping import OntologyMapping
+from biocypher._ontology import Ontology
+
+from .cache import make_key
+from .fetch import is_url
+
+logger = logging.getLogger(__name__)
+
+# Increase when the layout of the cached ontology changes
+CACHE_FORMAT_VERSION = 1
+DOWNLOAD_TIMEOUT = 120
+
+
+def download_ontology(url: str, directory: str | Path) -> Path:
+    """
+    Download a remote ontology file unless it was downloaded before.
+
+    The file name keeps the original name, from which BioCypher derives the
+    ontology format.
+
+    Args:
+        url: URL of the ontology file
+        directory: Directory for downloaded files
+
+    Returns:
+        Path of the local copy
+    """
+    directory = Path(directory)
+    name = url.rstrip("/").rsplit("/", 1)[-1]
+    path = directory / f"{hashlib.sha256(url.encode()).hexdigest()[:12]}-{name}"
+    if path.exists():
+        return path
+
+    directory.mkdir(parents=True, exist_ok=True)
+    logger.info(f"Downloading ontology {url}")
+    partial = path.with_name(path.name + ".part")
+    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as response, open(partial, "wb") as f:
+        shutil.copyfileobj(response, f)
+    os.replace(partial, path)
+    return path
+
+
+class OntologyCache:
+    """
+    Versioned on-disk cache of BioCypher's `Ontology`.
+
+    The RDF graphs of the ontologies are only needed by BioCypher's OWL
+    writer; they are left out of the cache unless `keep_rdf` is set, which
+    keeps the cache small and fast to load.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        head_ontology: dict,
+        tail_ontologies: dict | None = None,
+        schema_config_path: str | Path = "config/schema_config.yaml",
+        keep_rdf: bool = False,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Base cache directory, e.g. BioCypher's `cache_directory`
+            head_ontology: `head_ontology` section of the BioCypher configuration
+            tail_ontologies: `tail_ontologies` section of the BioCypher configuration
+            schema_config_path: Path to the schema configuration
+            keep_rdf: Whether to keep the RDF graphs of the ontologies
+        """
+        self.directory = Path(directory) / "ontology"
+        self.head_ontology = dict(head_ontology)
+        self.tail_ontologies = {name: dict(meta) for name, meta in (tail_ontologies or {}).items()}
+        self.schema_config_path = Path(schema_config_path)
+        self.keep_rdf = keep_rdf
+        self.key = self.compute_key()
+        self.path = self.directory / f"{self.key}.pkl"
+
+    @classmethod
+    def from_config(cls, biocypher_config: dict, schema_config_path: str | Path) -> "OntologyCache | None":
+        """
+        Create the cache for a BioCypher configuration.
+
+        Args:
+            biocypher_config: `biocypher` section of the BioCypher configuration
+            schema_config_path: Path to the schema configuration
+
+        Returns:
+            The cache, or None if no head ontology is configured (headless
+            mode), in which case there is nothing to parse
+        """
+        if not biocypher_config.get("head_ontology"):
+            return None
+        return cls(
+            biocypher_config.get("cache_directory", ".cache"),
+            biocypher_config["head_ontology"],
+            biocypher_config.get("tail_ontologies"),
+            schema_config_path,
+            keep_rdf=biocypher_config.get("dbms") == "owl",
+        )
+
+    def _sources(self) -> list[dict]:
+        return [self.head_ontology, *self.tail_ontologies.values()]
+
+    def compute_key(self) -> str:
+        """Derive the cache key from everything the parsed ontology depends on."""
+        files = []
+        for source in self._sources():
+            if is_url(source["url"]):
+                continue
+            stat = Path(source["url"]).stat()
+            files.append([source["url"], stat.st_size, stat.st_mtime_ns])
+        return make_key(
+            CACHE_FORMAT_VERSION,
+            biocypher.__version__,
+            self.head_ontology,
+            self.tail_ontologies,
+            hashlib.sha256(self.schema_config_path.read_bytes()).hexdigest(),
+            files,
+            self.keep_rdf,
+        )[:16]
+
+    def load(self) -> Ontology | None:
+        """
+        Load the cached ontology.
+
+        Returns:
+            The ontology, or None if it is not cached or cannot be read
+        """
+        try:
+            with open(self.path, "rb") as f:
+                ontology = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Removing unreadable ontology cache {self.path}: {e}")
+            self.clear()
+            return None
+        logger.info(f"Loaded ontology from cache {self.path}")
+        return ontology
+
+    def build(self) -> Ontology:
+        """
+        Parse the ontologies and the schema configuration and store the result.
+
+        Returns:
+            The ontology
+        """
+        started = time.perf_counter()
+        files = self.directory / "files"
+
+        def localize(meta: dict) -> dict:
+            if is_url(meta["url"]):
+                return dict(meta, url=str(download_ontology(meta["url"], files)))
+            return meta
+
+        ontology = Ontology(
+            head_ontology=localize(self.head_ontology),
+            ontology_mapping=OntologyMapping(config_file=str(self.schema_config_path)),
+            tail_ontologies={name: localize(meta) for name, meta in self.tail_ontologies.items()} or None,
+        )
+        if not self.keep_rdf:
+            # Ontology has no public way to release the RDF graphs
+            for adapter in [ontology._head_ontology, *(ontology._tail_ontologies or {}).values()]:
+                adapter._rdf_graph = None
+        logger.info(f"Parsed ontology in {time.perf_counter() - started:.1f}s")
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        partial = self.path.with_name(self.path.name + ".part")
+        with open(partial, "wb") as f:
+            pickle.dump(ontology, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(partial, self.path)
+        for path in self.directory.glob("*.pkl"):
+            if path != self.path:
+                logger.info(f"Removing outdated ontology cache {path}")
+                path.unlink(missing_ok=True)
+        return ontology
+
+    def get(self) -> Ontology:
+        """Load the cached ontology, building it first if needed."""
+        return self.load() or self.build()
+
+    def clear(self):
+        """Remove the cached ontology, so the next `get` builds it again."""
+        self.path.unlink(missing_ok=True)
+        self.path.with_name(self.path.name + ".part").unlink(missing_ok=True)
+
+
+def attach_ontology(bc, ontology: Ontology) -> bool:
+    """
+    Make a BioCypher instance use an ontology instead of parsing its own.
+
+    BioCypher creates its ontology lazily on first use and offers no public
+    way to pass one in, so the ontology and its schema mapping are set on
+    the instance before anything is written.
+
+    Args:
+        bc: BioCypher instance
+        ontology: Ontology as returned by `OntologyCache.get`
+
+    Returns:
+        Whether the ontology was attached; False if this BioCypher version
+        keeps its ontology elsewhere, in which case it parses its own
+    """
+    if not hasattr(bc, "_ontology") or not hasattr(bc, "_ontology_mapping"):
+        logger.warning("This BioCypher version does not support a cached ontology, parsing it instead")
+        return False
+    bc._ontology_mapping = ontology.mapping
+    bc._ontology = ontology
+    return True
+
+
+def parse_ontology(bc):
+    """
+    Make a BioCypher instance parse its ontology now instead of on first use.
+
+    Used when the ontology cache cannot be used, so a broken ontology
+    configuration is reported before anything is written.
+
+    Args:
+        bc: BioCypher instance
+    """
+    if hasattr(bc, "_get_ontology"):
+        bc._get_ontology()
@@ -0,0 +1,288 @@
+"""
+Parallel extraction for {{ cookiecutter.project_name }}.
+
+Input files are split into shards (whole files, line-aligned byte ranges of
+a large CSV file or row groups of a Parquet file) that are parsed and
+converted in a process pool. Workers spill every converted chunk to a
+temporary file instead of returning the whole shard, and the number of
+shards in flight is bounded by their size in bytes. Results are yielded in
+shard order, so the output is the same as for a sequential run.
+"""
+
+import io
+import logging
+import os
+import pickle
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from .fetch import is_url
+from .readers import get_row_group_offsets
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD_SIZE = 64 * 1024 * 1024
+
+
+class ByteRangeReader(io.RawIOBase):
+    """
+    Read-only file object exposing the header line plus a byte range of a file.
+
+    The range must be aligned to line starts, see `split_byte_ranges`.
+    """
+
+    def __init__(self, path: str | Path, start: int, end: int, header: bytes = b""):
+        self._file = open(path, "rb")
+        self._file.seek(start)
+        self._header = header
+        self._remaining = end - start
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if self._header:
+            n = min(len(buffer), len(self._header))
+            buffer[:n] = self._header[:n]
+            self._header = self._header[n:]
+            return n
+        n = min(len(buffer), self._remaining)
+        if n <= 0:
+            return 0
+        data = self._file.read(n)
+        buffer[:len(data)] = data
+        self._remaining -= len(data)
+        return len(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def _next_line_start(f, offset: int) -> int:
+    """Return the offset of the first line starting at or after `offset`."""
+    if offset <= 0:
+        return 0
+    f.seek(offset - 1)
+    f.readline()
+    return f.tell()
+
+
+def split_byte_ranges(path: str | Path, shard_size: int = DEFAULT_SHARD_SIZE) -> list[tuple]:
+    """
+    Split a CSV file into line-aligned byte ranges.
+
+    The first range starts after the header line. Quoted fields containing
+    newlines are not supported, as a range boundary could fall inside them.
+
+    Args:
+        path: Path to an uncompressed CSV file
+        shard_size: Approximate size of a range in bytes
+
+    Returns:
+        List of (path, start, end) tuples covering all data rows
+    """
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        data_start = len(f.readline())
+        offsets = [data_start]
+        while offsets[-1] + shard_size < size:
+            aligned = _next_line_start(f, offsets[-1] + shard_size)
+            if aligned >= size:
+                break
+            offsets.append(aligned)
+    offsets.append(size)
+    return [(Path(path), start, end) for start, end in zip(offsets, offsets[1:])]
+
+
+def read_header(path: str | Path) -> bytes:
+    """Return the header line of a CSV file including the line break."""
+    with open(path, "rb") as f:
+        return f.readline()
+
+
+def split_row_groups(path: str | Path, shard_size: int = DEFAULT_SHARD_SIZE) -> list[tuple]:
+    """
+    Split a Parquet file into byte ranges of whole row groups.
+
+    A range holds the row groups starting within it, see
+    `readers.read_arrow_batches`; only the file footer is read.
+
+    Args:
+        path: Path to a Parquet file
+        shard_size: Approximate size of a range in bytes
+
+    Returns:
+        List of (path, start, end) tuples covering all row groups; a single
+        whole-file shard (path, 0, None) for a file without row groups
+    """
+    offsets = get_row_group_offsets(path)
+    if not offsets:
+        return [(Path(path), 0, None)]
+    starts = [offsets[0]]
+    for offset in offsets[1:]:
+        if offset - starts[-1] >= shard_size:
+            starts.append(offset)
+    ends = starts[1:] + [os.path.getsize(path)]
+    return [(Path(path), start, end) for start, end in zip(starts, ends)]
+
+
+def get_shard_bytes(shard: tuple) -> int:
+    """Return the approximate input size of a shard in bytes; API resources count as one default shard."""
+    path, start, end = shard
+    if end is not None:
+        return end - start
+    if is_url(path):
+        return DEFAULT_SHARD_SIZE
+    return os.path.getsize(path)
+
+
+def _spill_chunks(adapter, kind: str, mapping: dict, shard: tuple, columnar: bool, skip: int, path: str) -> str:
+    """
+    Worker entry point: convert one shard chunk by chunk and spill every chunk to a file.
+
+    Only one chunk is held in memory at a time. See `get_shard_chunks`.
+
+    Returns:
+        The path of the spill file
+    """
+    with open(path, "wb") as f:
+        for chunk in adapter.get_shard_chunks(kind, mapping, shard, columnar, skip):
+            pickle.dump(chunk, f, protocol=pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_chunks(path: str | Path):
+    """Yield the chunks of a file written by `_spill_chunks` one at a time and delete the file."""
+    try:
+        with open(path, "rb") as f:
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
+    finally:
+        Path(path).unlink(missing_ok=True)
+
+
+def map_shards(function, tasks, workers: int, max_pending_bytes: int | None = None):
+    """
+    Call a function for every task in a process pool.
+
+    Tasks are submitted as long as the input size of the tasks in flight
+    (running, or finished and not yet consumed) stays within
+    `max_pending_bytes`. A task larger than that is only submitted once no
+    other task is in flight, so at least one task always makes progress.
+
+    Args:
+        function: Picklable worker entry point
+        tasks: Iterable of (size, arguments) tuples, one per call: the
+            approximate input size of the task in bytes and the argument
+            tuple for `function`
+        workers: Number of worker processes
+        max_pending_bytes: Budget for the input size of the tasks in
+            flight; `2 * workers * DEFAULT_SHARD_SIZE` by default
+
+    Yields:
+        The results in the order of `tasks`
+    """
+    if max_pending_bytes is None:
+        max_pending_bytes = 2 * workers * DEFAULT_SHARD_SIZE
+    tasks = iter(tasks)
+    task = next(tasks, None)
+    pending = deque()
+    pending_bytes = 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while pending or task is not None:
+            while task is not None and (not pending or pending_bytes + task[0] <= max_pending_bytes):
+                size, arguments = task
+                pending.append((size, executor.submit(function, *arguments)))
+                pending_bytes += size
+                task = next(tasks, None)
+
+            size, future = pending.popleft()
+            yield future.result()
+            pending_bytes -= size
+
+
+def _spill_tasks(adapter, kind: str, tasks, directory: str, columnar: bool):
+    """Turn (mapping, shard, skip) tuples into `map_shards` tasks for `_spill_chunks`."""
+    for number, (mapping, shard, skip) in enumerate(tasks):
+        path = str(Path(directory) / f"shard-{number:06d}.pkl")
+        yield get_shard_bytes(shard), (adapter, kind, mapping, shard, columnar, skip, path)
+
+
+def extract_parallel(
+    adapter,
+    kind: str,
+    workers: int,
+    shard_size: int = DEFAULT_SHARD_SIZE,
+    entries: list[str] | None = None,
+    columnar: bool = False,
+    max_pending_bytes: int | None = None,
+):
+    """
+    Extract nodes or edges from all shards of the adapter in a process pool.
+
+    Workers spill every converted chunk to a temporary file, which is read
+    back chunk by chunk, so memory use stays at about one chunk per worker
+    whatever the size of a shard. The spilled data waiting to be read is
+    bounded by `max_pending_bytes` of input, see `map_shards`.
+
+    Args:
+        adapter: Adapter providing `get_shards` and `get_shard_chunks`
+        kind: Either "node" or "edge"
+        workers: Number of worker processes
+        shard_size: Approximate size of a byte-range shard in bytes
+        entries: Names of the schema entries to extract; all by default
+        columnar: Pass `columnar.ColumnarBatch` objects from the workers
+            instead of tuples, which are much cheaper to pickle
+        max_pending_bytes: Budget for the input size of the shards in flight
+
+    Yields:
+        Node or edge tuples (or columnar batches) in the same order as a
+        sequential run
+    """
+    shards = adapter.get_shards(kind, shard_size, entries=entries)
+    for chunks in extract_chunks_parallel(
+        adapter, kind, [(mapping, shard, 0) for mapping, shard in shards], workers, columnar, max_pending_bytes
+    ):
+        for chunk in chunks:
+            if columnar:
+                yield chunk
+            else:
+                yield from chunk
+
+
+def extract_chunks_parallel(
+    adapter,
+    kind: str,
+    tasks: list[tuple],
+    workers: int,
+    columnar: bool = False,
+    max_pending_bytes: int | None = None,
+):
+    """
+    Extract the chunks of some shards in a process pool.
+
+    Args:
+        adapter: Adapter providing `get_shard_chunks`
+        kind: Either "node" or "edge"
+        tasks: List of (mapping, shard, skip) tuples; the first `skip`
+            chunks of a shard are left out
+        workers: Number of worker processes
+        columnar: Extract columnar batches instead of lists of tuples
+        max_pending_bytes: Budget for the input size of the shards in flight
+
+    Yields:
+        An iterator over the chunks of every task, in order; consume it
+        before requesting the next one, as it reads a spill file that is
+        removed once this generator is exhausted
+    """
+    with tempfile.TemporaryDirectory(prefix="shards-") as directory:
+        arguments = _spill_tasks(adapter, kind, tasks, directory, columnar)
+        for path in map_shards(_spill_chunks, arguments, workers, max_pending_bytes):
+            yield _read_chunks(path)
@@ -0,0 +1,170 @@
+"""
+Pipelined extraction for {{ cookiecutter.project_name }}.
+
+Runs the extraction of a stage (the nodes or edges of one schema entry) in a
+background thread or process that hands batches of tuples to the writer
+through a bounded queue, so parsing and writing overlap. The queue applies
+backpressure: a producer that runs ahead of the writer blocks once `depth`
+batches are waiting, which bounds the memory held per stage to about
+`depth * batch_size` tuples.
+
+Threads are cheap but share the GIL with the writer, so they mostly overlap
+I/O, decompression and pandas' parsing; processes overlap everything at the
+cost of pickling the batches.
+"""
+
+import logging
+import multiprocessing
+import queue
+import threading
+import traceback
+
+logger = logging.getLogger(__name__)
+
+PIPELINE_MODES = ("thread", "process")
+DEFAULT_BATCH_SIZE = 10_000
+DEFAULT_DEPTH = 8
+
+
+def _produce(extract, put, batch_size: int):
+    """
+    Run `extract` and pass its tuples to `put` in batches, followed by an end marker.
+
+    Stops early once `put` returns False.
+    """
+    batch = []
+    for item in extract():
+        batch.append(item)
+        if len(batch) >= batch_size:
+            if put(("batch", batch)) is False:
+                return
+            batch = []
+    if batch and put(("batch", batch)) is False:
+        return
+    put(("done", None))
+
+
+def _produce_in_process(extract, results, batch_size: int):
+    """Process entry point; errors are sent as text, as not every exception pickles."""
+    try:
+        _produce(extract, results.put, batch_size)
+    except BaseException:
+        results.put(("error", traceback.format_exc()))
+
+
+class BackgroundStage:
+    """
+    Extraction of one stage in a background thread or process.
+
+    The producer starts on `start()`, or when iteration begins. Iterating
+    yields the tuples in the order `extract` produced them.
+    """
+
+    def __init__(
+        self,
+        extract,
+        mode: str = "thread",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        depth: int = DEFAULT_DEPTH,
+        name: str = "stage",
+    ):
+        """
+        Initialize the stage.
+
+        Args:
+            extract: Callable returning an iterable of tuples; for the
+                process mode it must be picklable, e.g. a
+                `functools.partial` of an adapter method
+            mode: Either "thread" or "process"
+            batch_size: Number of tuples per batch passed through the queue
+            depth: Maximum number of batches waiting in the queue
+            name: Name used in log messages and for the thread or process
+        """
+        if mode not in PIPELINE_MODES:
+            raise ValueError(f"Unknown pipeline mode '{mode}', expected one of {PIPELINE_MODES}")
+        self.extract = extract
+        self.mode = mode
+        self.batch_size = batch_size
+        self.depth = depth
+        self.name = name
+        self._worker = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start the producer, if it is not running yet."""
+        if self._worker is not None:
+            return
+        if self.mode == "thread":
+            self._queue = queue.Queue(maxsize=self.depth)
+            self._worker = threading.Thread(
+                target=self._produce_in_thread,
+                name=f"extract-{self.name}",
+                daemon=True,
+            )
+        else:
+            self._queue = multiprocessing.Queue(maxsize=self.depth)
+            self._worker = multiprocessing.Process(
+                target=_produce_in_process,
+                args=(self.extract, self._queue, self.batch_size),
+                name=f"extract-{self.name}",
+            )
+        self._worker.start()
+        logger.debug(f"Started {self.mode} producer for '{self.name}'")
+
+    def _produce_in_thread(self):
+        try:
+            _produce(self.extract, self._put, self.batch_size)
+        except Exception as e:
+            self._put(("error", e))
+
+    def _put(self, message: tuple) -> bool:
+        """Put a message on the thread queue; returns False once the stage is closed."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(message, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self) -> tuple:
+        """Take the next message, detecting a producer process that died."""
+        while True:
+            try:
+                return self._queue.get(timeout=1)
+            except queue.Empty:
+                if self.mode == "process" and not self._worker.is_alive():
+                    raise RuntimeError(
+                        f"Extraction process for '{self.name}' exited with code {self._worker.exitcode}"
+                    )
+
+    def __iter__(self):
+        self.start()
+        try:
+            while True:
+                kind, payload = self._get()
+                if kind == "batch":
+                    yield from payload
+                elif kind == "done":
+                    return
+                elif isinstance(payload, Exception):
+                    raise payload
+                else:
+                    raise RuntimeError(f"Extraction of '{self.name}' failed in a background process:\n{payload}")
+        finally:
+            self.close()
+
+    def close(self):
+        """Stop the producer and release its resources."""
+        if self._worker is None:
+            return
+        self._stop.set()
+        if self.mode == "process":
+            if self._worker.is_alive():
+                self._worker.terminate()
+            self._worker.join()
+            self._queue.close()
+            self._queue.cancel_join_thread()
+        else:
+            self._worker.join()
+        self._worker = None
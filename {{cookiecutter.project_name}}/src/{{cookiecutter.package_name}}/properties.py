@@ -0,0 +1,230 @@
+"""
+Property type validation for {{ cookiecutter.project_name }}.
+
+The schema configuration declares a type for every property, but adapters
+hand BioCypher whatever Python values they have, so a mismatch only shows up
+when the database import fails. `PropertyValidator` compiles the schema once
+into the declared property types per label and checks the nodes and edges on
+their way to the writer, batch by batch and property by property rather than
+value by value: a columnar batch by the dtype of each array, a list of tuples
+by the set of Python types of each property. Only properties with values of
+another type are coerced, with `convert.coerce_column`; values that cannot be
+coerced are dropped. Properties the schema does not declare are counted as
+unknown and left to BioCypher.
+"""
+
+import logging
+from collections import defaultdict
+from itertools import islice, repeat
+from operator import itemgetter
+
+import pandas as pd
+
+from .columnar import ColumnarBatch, to_numpy_column
+from .convert import PANDAS_DTYPES, coerce_column
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BLOCK_SIZE = 10_000
+
+# Python types of valid values and NumPy dtype kinds of valid columnar
+# arrays per pandas dtype; integers are valid floats
+PYTHON_TYPES = {
+    "Int64": {int},
+    "float64": {float, int},
+    "boolean": {bool},
+    "string": {str},
+}
+NUMPY_KINDS = {
+    "Int64": "i",
+    "float64": "fi",
+    "boolean": "b",
+    "string": "O",
+}
+
+
+def compile_property_types(schema: dict) -> dict[str, dict[str, str | None]]:
+    """
+    Collect the declared property types per label.
+
+    Entries without declared properties are left out, as BioCypher takes
+    their properties from the data. Types that cannot be checked, e.g. arrays
+    like `str[]`, are kept as None; misspelled types are reported.
+
+    Args:
+        schema: Schema configuration as returned by `load_schema_config`
+
+    Returns:
+        Dictionary mapping every input label to a dictionary of property
+        names and schema types
+    """
+    rules = {}
+    for name, entry in schema.items():
+        properties = entry.get("properties")
+        if not properties:
+            continue
+        types = {}
+        for prop, schema_type in properties.items():
+            if schema_type not in PANDAS_DTYPES and not str(schema_type).endswith("[]"):
+                logger.warning(f"Property '{prop}' of '{name}' has the unknown type '{schema_type}' and is not checked")
+            types[prop] = schema_type if schema_type in PANDAS_DTYPES else None
+        labels = entry.get("input_label", name)
+        for label in labels if isinstance(labels, list) else [labels]:
+            rules[label] = types
+    return rules
+
+
+class PropertyValidator:
+    """
+    Checks and coerces the property types of nodes and edges.
+
+    Violations are counted per label and property: `coerced` values had
+    another type but could be converted, `invalid` values could not and were
+    dropped, `unknown` values belong to properties the schema does not
+    declare.
+    """
+
+    def __init__(self, schema: dict, block_size: int = DEFAULT_BLOCK_SIZE):
+        """
+        Compile the validator.
+
+        Args:
+            schema: Schema configuration as returned by `load_schema_config`
+            block_size: Number of tuples checked at a time by `validate_stream`
+        """
+        self.types = compile_property_types(schema)
+        self.block_size = block_size
+        self.counts = defaultdict(lambda: {
+            "rows": 0,
+            "coerced": defaultdict(int),
+            "invalid": defaultdict(int),
+            "unknown": defaultdict(int),
+        })
+
+    def validate(self, batch, kind: str):
+        """
+        Check the properties of a batch.
+
+        Args:
+            batch: `ColumnarBatch` or list of node or edge tuples; coerced
+                in place
+            kind: Either "node" or "edge"
+
+        Returns:
+            The batch
+        """
+        if isinstance(batch, ColumnarBatch):
+            return self._validate_columnar(batch)
+        label_index = 1 if kind == "node" else 2
+        labels = set(map(itemgetter(label_index), batch))
+        if len(labels) == 1:
+            self._validate_records(labels.pop(), list(map(itemgetter(-1), batch)))
+            return batch
+        groups = defaultdict(list)
+        for item in batch:
+            groups[item[label_index]].append(item[-1])
+        for label, records in groups.items():
+            self._validate_records(label, records)
+        return batch
+
+    def validate_stream(self, tuples, kind: str):
+        """
+        Check the properties of a stream of tuples, block by block.
+
+        Args:
+            tuples: Iterable of node or edge tuples
+            kind: Either "node" or "edge"
+
+        Yields:
+            The tuples, with coerced properties
+        """
+        tuples = iter(tuples)
+        while block := list(islice(tuples, self.block_size)):
+            yield from self.validate(block, kind)
+
+    def _validate_records(self, label: str, records: list[dict]):
+        """Check the property dictionaries of tuples of one label."""
+        counts = self.counts[label]
+        counts["rows"] += len(records)
+        types = self.types.get(label)
+        if types is None or not records:
+            return
+        keys = set().union(*records)
+        for key in keys - types.keys():
+            counts["unknown"][key] += sum(1 for record in records if key in record)
+        for key in keys & types.keys():
+            schema_type = types[key]
+            if schema_type is None:
+                continue
+            valid = PYTHON_TYPES[PANDAS_DTYPES[schema_type]]
+            if set(map(type, map(dict.get, records, repeat(key)))) - {type(None)} <= valid:
+                continue
+            values = list(map(dict.get, records, repeat(key)))
+            self._coerce_records(records, key, values, schema_type, valid, counts)
+
+    @staticmethod
+    def _coerce_records(records: list[dict], key: str, values: list, schema_type: str, valid: set, counts: dict):
+        """Coerce the values of one property that have another type."""
+        cast, _ = coerce_column(pd.Series(values, dtype=object, name=key), schema_type)
+        cast = cast.astype(object).where(cast.notna(), None).tolist()
+        for record, value, new in zip(records, values, cast):
+            if value is None or type(value) in valid:
+                continue
+            if new is None:
+                del record[key]
+                counts["invalid"][key] += 1
+            else:
+                record[key] = new
+                counts["coerced"][key] += 1
+
+    def _validate_columnar(self, batch: ColumnarBatch) -> ColumnarBatch:
+        """Check the property arrays of a columnar batch."""
+        counts = self.counts[batch.label]
+        counts["rows"] += len(batch)
+        types = self.types.get(batch.label)
+        if types is None:
+            return batch
+        for key, values in batch.properties.items():
+            nulls = batch.nulls.get(key)
+            present = len(values) - (int(nulls.sum()) if nulls is not None else 0)
+            if key not in types:
+                counts["unknown"][key] += present
+                continue
+            schema_type = types[key]
+            if schema_type is None or values.dtype.kind in NUMPY_KINDS[PANDAS_DTYPES[schema_type]]:
+                continue
+            column = pd.Series(values, dtype=object)
+            if nulls is not None:
+                column = column.mask(nulls)
+            cast, invalid = coerce_column(column, schema_type)
+            batch.properties[key], mask = to_numpy_column(cast)
+            if mask is None:
+                batch.nulls.pop(key, None)
+            else:
+                batch.nulls[key] = mask
+            counts["coerced"][key] += present - invalid
+            counts["invalid"][key] += invalid
+        return batch
+
+    def report(self) -> dict:
+        """
+        Summarize the violations.
+
+        Returns:
+            Dictionary mapping every label to its number of `rows` and the
+            `coerced`, `invalid` and `unknown` values per property
+        """
+        return {
+            label: {
+                "rows": counts["rows"],
+                **{violation: dict(counts[violation]) for violation in ("coerced", "invalid", "unknown")},
+            }
+            for label, counts in self.counts.items()
+        }
+
+    def log_summary(self):
+        """Log the labels with property violations."""
+        for label, counts in self.report().items():
+            for violation in ("coerced", "invalid", "unknown"):
+                if counts[violation]:
+                    logger.warning(f"Properties of '{label}' with {violation} values: {counts[violation]}")
@@ -0,0 +1,345 @@
+"""
+Input format helpers for {{ cookiecutter.project_name }}.
+
+Detects the format of an input file from its suffix and reads columnar
+formats (Parquet, Feather, Arrow IPC) through pyarrow datasets with column
+projection and predicate pushdown. pyarrow is an optional dependency,
+install it with `pip install -e ".[arrow]"`.
+
+Delimited text files may be compressed with gzip, bzip2 or zstd (e.g.
+`proteins.csv.gz`, `genes.tsv.zst`). They are decompressed while being read,
+in a background thread so that decompression overlaps with parsing; nothing
+is written to disk. zstd needs the `zstandard` package on Python < 3.14,
+install it with `pip install -e ".[zstd]"`.
+"""
+
+import bz2
+import gzip
+import io
+import logging
+import queue
+import sys
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    ".csv": "csv",
+    ".tsv": "csv",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".feather": "ipc",
+    ".arrow": "ipc",
+    ".ipc": "ipc",
+}
+
+COMPRESSIONS = {
+    ".gz": "gzip",
+    ".bz2": "bz2",
+    ".zst": "zstd",
+}
+
+DEFAULT_BLOCK_SIZE = 1024 * 1024
+DEFAULT_PREFETCH = 4
+
+
+def get_compression(path: str | Path) -> str | None:
+    """Return the compression of a file from its suffix: "gzip", "bz2", "zstd" or None."""
+    return COMPRESSIONS.get(Path(path).suffix.lower())
+
+
+def strip_compression(path: str | Path) -> Path:
+    """Return the path without its compression suffix, e.g. `genes.tsv` for `genes.tsv.zst`."""
+    path = Path(path)
+    return path.with_suffix("") if get_compression(path) else path
+
+
+def get_format(path: str | Path) -> str:
+    """
+    Determine the input format of a file from its suffix.
+
+    A compression suffix is ignored, so `proteins.csv.gz` is a CSV file.
+
+    Args:
+        path: Path or glob pattern of an input file
+
+    Returns:
+        One of "csv", "parquet" or "ipc"; unknown suffixes are treated as CSV
+    """
+    return FORMATS.get(strip_compression(path).suffix.lower(), "csv")
+
+
+def get_delimiter(path: str | Path) -> str:
+    """Return the field delimiter of a delimited text file."""
+    return "\t" if strip_compression(path).suffix.lower() == ".tsv" else ","
+
+
+def _import_zstd():
+    """Import a zstd implementation, the standard library one from Python 3.14 on."""
+    if sys.version_info >= (3, 14):
+        from compression import zstd
+        return zstd
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "Reading zstd-compressed input requires zstandard. "
+            "Install it with: pip install -e \".[zstd]\""
+        ) from e
+    return zstandard
+
+
+class PrefetchReader(io.RawIOBase):
+    """
+    Read-only file object that reads ahead from a stream in a background thread.
+
+    Used for decompressing streams: zlib, bz2 and zstd release the GIL while
+    decompressing, so the next blocks are decompressed while the current one
+    is parsed. At most `prefetch` blocks are buffered.
+    """
+
+    def __init__(self, stream, block_size: int = DEFAULT_BLOCK_SIZE, prefetch: int = DEFAULT_PREFETCH):
+        self._stream = stream
+        self._block_size = block_size
+        self._queue = queue.Queue(maxsize=prefetch)
+        self._stop = threading.Event()
+        self._block = memoryview(b"")
+        self._exhausted = False
+        self._thread = threading.Thread(target=self._read_ahead, daemon=True)
+        self._thread.start()
+
+    def _read_ahead(self):
+        try:
+            while not self._stop.is_set():
+                block = self._stream.read(self._block_size)
+                self._put(block)
+                if not block:
+                    return
+        except Exception as e:
+            self._put(e)
+
+    def _put(self, item):
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        if not self._block:
+            if self._exhausted:
+                return 0
+            item = self._queue.get()
+            if isinstance(item, Exception):
+                self._exhausted = True
+                raise item
+            if not item:
+                self._exhausted = True
+                return 0
+            self._block = memoryview(item)
+        n = min(len(buffer), len(self._block))
+        buffer[:n] = self._block[:n]
+        self._block = self._block[n:]
+        return n
+
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self._thread.join()
+            self._stream.close()
+        super().close()
+
+
+def open_input(path: str | Path, prefetch: bool = True):
+    """
+    Open an input file for binary reading, decompressing it on the fly.
+
+    Args:
+        path: Path to the input file
+        prefetch: Decompress in a background thread
+
+    Returns:
+        A binary file object
+    """
+    compression = get_compression(path)
+    if compression is None:
+        return open(path, "rb")
+    if compression == "gzip":
+        stream = gzip.open(path, "rb")
+    elif compression == "bz2":
+        stream = bz2.open(path, "rb")
+    else:
+        stream = _import_zstd().open(path, "rb")
+    if not prefetch:
+        return stream
+    return io.BufferedReader(PrefetchReader(stream), buffer_size=DEFAULT_BLOCK_SIZE)
+
+
+def read_columns(path: str | Path, block_size: int = 64 * 1024) -> list[str]:
+    """
+    Return the column names of an input file without reading the whole file.
+
+    Delimited text files are only read (and decompressed) block by block
+    until the end of the header line is found; for Parquet and
+    Arrow IPC files only the schema is read.
+
+    Args:
+        path: Path to the input file
+        block_size: Number of bytes read at a time
+
+    Returns:
+        List of column names
+    """
+    file_format = get_format(path)
+    if file_format != "csv":
+        return get_arrow_columns(path, file_format)
+    header = b""
+    with open_input(path, prefetch=False) as f:
+        while b"\n" not in header:
+            block = f.read(block_size)
+            if not block:
+                break
+            header += block
+    header = header.split(b"\n", 1)[0]
+    return pd.read_csv(io.BytesIO(header), nrows=0, sep=get_delimiter(path)).columns.tolist()
+
+
+def filter_dataframe(df: pd.DataFrame, filters: dict | None) -> pd.DataFrame:
+    """
+    Keep the rows of a DataFrame that match all filters.
+
+    Args:
+        df: DataFrame to filter
+        filters: Mapping of column name to an accepted value or list of values
+
+    Returns:
+        The filtered DataFrame
+    """
+    if not filters:
+        return df
+    mask = pd.Series(True, index=df.index)
+    for column, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            mask &= df[column].isin(list(value))
+        else:
+            mask &= df[column] == value
+    return df[mask]
+
+
+def _import_pyarrow():
+    """Import pyarrow lazily, as it is an optional dependency."""
+    try:
+        import pyarrow.dataset as ds
+        import pyarrow.fs as fs
+    except ImportError as e:
+        raise ImportError(
+            "Reading Parquet/Feather/Arrow input requires pyarrow. "
+            "Install it with: pip install -e \".[arrow]\""
+        ) from e
+    return ds, fs
+
+
+def build_arrow_filter(filters: dict | None):
+    """
+    Translate filters into a pyarrow dataset expression.
+
+    Args:
+        filters: Mapping of column name to an accepted value or list of values
+
+    Returns:
+        A pyarrow compute expression, or None without filters
+    """
+    if not filters:
+        return None
+    ds, _ = _import_pyarrow()
+    expression = None
+    for column, value in filters.items():
+        if isinstance(value, (list, tuple, set)):
+            condition = ds.field(column).isin(list(value))
+        else:
+            condition = ds.field(column) == value
+        expression = condition if expression is None else expression & condition
+    return expression
+
+
+def get_arrow_columns(path: str | Path, file_format: str) -> list[str]:
+    """Return the column names of a Parquet or Arrow IPC file."""
+    ds, _ = _import_pyarrow()
+    return ds.dataset(str(path), format=file_format).schema.names
+
+
+def _row_group_offsets(metadata) -> list[int]:
+    """Return the byte offset of the first page of every row group in Parquet file metadata."""
+    offsets = []
+    for index in range(metadata.num_row_groups):
+        column = metadata.row_group(index).column(0)
+        offsets.append(column.dictionary_page_offset if column.has_dictionary_page else column.data_page_offset)
+    return offsets
+
+
+def get_row_group_offsets(path: str | Path) -> list[int]:
+    """
+    Return the byte offsets at which the row groups of a Parquet file start.
+
+    Only the file footer is read. A byte range of the file selects the row
+    groups starting within it, see `read_arrow_batches`.
+
+    Args:
+        path: Path to a Parquet file
+
+    Returns:
+        Offsets in increasing order, one per row group
+    """
+    ds, _ = _import_pyarrow()
+    fragment = next(ds.dataset(str(path), format="parquet").get_fragments())
+    return _row_group_offsets(fragment.metadata)
+
+
+def read_arrow_batches(
+    path: str | Path,
+    file_format: str,
+    columns: list[str],
+    filters: dict | None = None,
+    batch_size: int = 100_000,
+    byte_range: tuple[int, int] | None = None,
+):
+    """
+    Stream a Parquet or Arrow IPC file as DataFrames.
+
+    Files are memory-mapped, only `columns` are read and `filters` are
+    pushed down to the scanner, so row groups that cannot match are skipped
+    for Parquet input.
+
+    Args:
+        path: Path to the input file
+        file_format: Either "parquet" or "ipc"
+        columns: Columns to read
+        filters: Mapping of column name to an accepted value or list of values
+        batch_size: Maximum number of rows per batch
+        byte_range: (start, end) byte offsets of a Parquet file; only the row
+            groups starting within the range are read
+
+    Yields:
+        DataFrames of at most `batch_size` rows
+    """
+    ds, fs = _import_pyarrow()
+    dataset = ds.dataset(str(path), format=file_format, filesystem=fs.LocalFileSystem(use_mmap=True))
+    expression = build_arrow_filter(filters)
+    if byte_range is None:
+        batches = dataset.to_batches(columns=columns, filter=expression, batch_size=batch_size)
+    else:
+        start, end = byte_range
+        fragment = next(dataset.get_fragments())
+        row_groups = [i for i, offset in enumerate(_row_group_offsets(fragment.metadata)) if start <= offset < end]
+        fragment = fragment.subset(row_group_ids=row_groups)
+        batches = fragment.to_batches(columns=columns, filter=expression, batch_size=batch_size)
+    for batch in batches:
+        if batch.num_rows:
+            yield batch.to_pandas()
@@ -0,0 +1,235 @@
+"""
+Adapter registry for {{ cookiecutter.project_name }}.
+
+The adapters of the knowledge graph are listed in `config/adapters.yaml`,
+each with its own class, data source and options, and the schema entries it
+extracts. Several adapters may list the same schema entry, e.g. proteins
+from two sources; its nodes or edges are then the union of theirs. At most
+one adapter may leave out `entries` and takes all schema entries not listed
+by the others.
+
+`run_adapters` extracts several adapters at once, each in a worker process of
+its own. A worker spills the tuples of every finished stage (the nodes or
+edges of one schema entry) to disk and reports it, so the writer can take
+up the stages of fast adapters while slow ones are still running. A failing,
+crashing or timed out adapter is reported as failed without affecting the
+others.
+"""
+
+import importlib
+import logging
+import multiprocessing
+import multiprocessing.connection
+import pickle
+import time
+import traceback
+from collections import deque
+from pathlib import Path
+
+import yaml
+
+from .columnar import ColumnarBatch
+from .schema import get_input_mappings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REGISTRY_PATH = "config/adapters.yaml"
+SPILL_BLOCK_SIZE = 10_000
+
+
+def import_object(path: str):
+    """Import an object by its dotted path, e.g. `package.module.ClassName`."""
+    module_name, _, attribute = path.rpartition(".")
+    if not module_name:
+        raise ValueError(f"Expected a dotted path like 'package.module.ClassName', got '{path}'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def load_adapter_registry(path: str | Path, schema: dict) -> list[dict]:
+    """
+    Load the adapter registry and assign the schema entries to the adapters.
+
+    Args:
+        path: Path to the registry YAML file
+        schema: Schema configuration as returned by `load_schema_config`
+
+    Returns:
+        List of enabled adapter specifications with the keys `name`,
+        `class` (dotted path), `data_source`, `options` (further keyword
+        arguments of the adapter), `timeout` (seconds, or None) and
+        `entries` (names of the schema entries the adapter extracts; an
+        entry may be extracted by several adapters)
+    """
+    with open(path, "r") as f:
+        config = yaml.safe_load(f) or {}
+
+    specs = []
+    for name, entry in (config.get("adapters") or {}).items():
+        entry = entry or {}
+        if not entry.get("enabled", True):
+            logger.info(f"Adapter '{name}' is disabled")
+            continue
+        missing = [key for key in ("class", "data_source") if key not in entry]
+        if missing:
+            raise ValueError(f"Adapter '{name}' in {path} is missing {missing}")
+        specs.append({
+            "name": name,
+            "class": entry["class"],
+            "data_source": entry["data_source"],
+            "options": dict(entry.get("options") or {}),
+            "timeout": entry.get("timeout"),
+            "entries": entry.get("entries"),
+        })
+
+    available = [mapping["name"] for kind in ("node", "edge") for mapping in get_input_mappings(schema, kind)]
+    claimed = set()
+    for spec in specs:
+        for entry in spec["entries"] or []:
+            if entry not in available:
+                raise ValueError(f"Adapter '{spec['name']}' lists unknown schema entry '{entry}'")
+            claimed.add(entry)
+
+    unassigned = [spec for spec in specs if spec["entries"] is None]
+    if len(unassigned) > 1:
+        raise ValueError(
+            f"Only one adapter may leave out `entries`, found {[spec['name'] for spec in unassigned]}"
+        )
+    for spec in unassigned:
+        spec["entries"] = [entry for entry in available if entry not in claimed]
+    return specs
+
+
+def create_adapter(spec: dict, **common):
+    """
+    Instantiate the adapter of a registry specification.
+
+    Args:
+        spec: Adapter specification, see `load_adapter_registry`
+        **common: Keyword arguments passed to every adapter, e.g. the schema
+            configuration path; the adapter's own `options` take precedence
+
+    Returns:
+        The adapter instance
+    """
+    adapter_class = import_object(spec["class"])
+    return adapter_class(data_source=spec["data_source"], **{**common, **spec["options"]})
+
+
+def write_spill(tuples, path: str | Path) -> int:
+    """
+    Write tuples or columnar batches to a file in pickled blocks.
+
+    Returns:
+        Number of rows written; a `ColumnarBatch` counts with its length
+    """
+    rows = 0
+    block, block_rows = [], 0
+    with open(path, "wb") as f:
+        for item in tuples:
+            block.append(item)
+            block_rows += len(item) if isinstance(item, ColumnarBatch) else 1
+            if block_rows >= SPILL_BLOCK_SIZE:
+                pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+                rows += block_rows
+                block, block_rows = [], 0
+        if block:
+            pickle.dump(block, f, protocol=pickle.HIGHEST_PROTOCOL)
+            rows += block_rows
+    return rows
+
+
+def read_spill(path: str | Path):
+    """Yield the tuples of a file written by `write_spill`."""
+    with open(path, "rb") as f:
+        while True:
+            try:
+                yield from pickle.load(f)
+            except EOFError:
+                return
+
+
+def _run_adapter(spec: dict, common: dict, stages: list[tuple], extract, directory: str, connection):
+    """Worker process entry point: extract the stages of one adapter and report each one."""
+    started = time.perf_counter()
+    try:
+        adapter = create_adapter(spec, **common)
+        for number, (kind, name) in enumerate(stages):
+            stage_started = time.perf_counter()
+            path = Path(directory) / f"{spec['name']}-{number:03d}-{kind}.pkl"
+            rows = write_spill(extract(adapter, kind, [name]), path)
+            connection.send(("stage", spec["name"], (kind, name, path, rows, time.perf_counter() - stage_started)))
+        connection.send(("done", spec["name"], (time.perf_counter() - started, None)))
+    except BaseException:
+        connection.send(("failed", spec["name"], (time.perf_counter() - started, traceback.format_exc())))
+
+
+def run_adapters(jobs: list[tuple], extract, workers: int, directory: str | Path):
+    """
+    Extract the stages of several adapters in parallel worker processes.
+
+    Stages are reported as soon as they are spilled to disk; the consumer
+    reads them with `read_spill` and should delete the file afterwards.
+    Every worker reports through a pipe of its own, so terminating a timed
+    out worker cannot corrupt the messages of the others.
+
+    Args:
+        jobs: List of (spec, common, stages) tuples: adapter specification,
+            keyword arguments for `create_adapter` and the (kind, name)
+            stages to extract, in order
+        extract: Picklable callable `extract(adapter, kind, entries)`
+            returning the tuples of some schema entries
+        workers: Maximum number of adapters extracted at once
+        directory: Directory for the spilled stages
+
+    Yields:
+        Tuples of ("stage", adapter, (kind, name, path, rows, seconds)) for
+        every finished stage, and ("done", adapter, (seconds, None)) or
+        ("failed", adapter, (seconds, error)) once an adapter finished
+    """
+    pending = deque(jobs)
+    running = {}
+
+    def stop(connection):
+        name, process, started, _ = running.pop(connection)
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        connection.close()
+        return name, time.perf_counter() - started
+
+    try:
+        while pending or running:
+            while pending and len(running) < workers:
+                spec, common, stages = pending.popleft()
+                reader, writer = multiprocessing.Pipe(duplex=False)
+                process = multiprocessing.Process(
+                    target=_run_adapter,
+                    args=(spec, common, stages, extract, str(directory), writer),
+                    name=f"adapter-{spec['name']}",
+                )
+                process.start()
+                writer.close()
+                running[reader] = (spec["name"], process, time.perf_counter(), spec["timeout"])
+                logger.info(f"Started adapter '{spec['name']}' with {len(stages)} stages")
+
+            for connection in multiprocessing.connection.wait(list(running), timeout=0.5):
+                try:
+                    status, name, payload = connection.recv()
+                except EOFError:
+                    process = running[connection][1]
+                    process.join()
+                    name, seconds = stop(connection)
+                    yield ("failed", name, (seconds, f"Worker process exited with code {process.exitcode}"))
+                    continue
+                if status != "stage":
+                    stop(connection)
+                yield (status, name, payload)
+
+            now = time.perf_counter()
+            for connection, (name, _, started, timeout) in list(running.items()):
+                if timeout is not None and now - started > timeout:
+                    name, seconds = stop(connection)
+                    yield ("failed", name, (seconds, f"Timed out after {timeout}s"))
+    finally:
+        for connection in list(running):
+            stop(connection)
@@ -0,0 +1,295 @@
+"""
+Node samples and schema coverage for {{ cookiecutter.project_name }}.
+
+Iterating on the schema configuration does not need the whole knowledge
+graph. A `NodeSample` keeps a hash-stable subset of the nodes: a node is
+sampled if the hash of its ID is small enough, either below a fixed
+fraction of the hash range or among the `size` smallest hashes of its
+schema entry. The same nodes are sampled on every run and in every process.
+An edge is kept if its source is sampled, so sampled nodes keep their
+outgoing edges; sampling both endpoints independently would keep only a tiny
+share of the edges. For a sample of fixed size, which takes a pass over all
+IDs anyway, the targets of kept edges are pulled into the sample as well, so
+it has no dangling edges of its own. A fraction is applied to the rows as
+they are read, without any extra pass, and an edge target is only sampled if
+its own hash is small enough. Rows are dropped right after they are read,
+before they are converted or written.
+
+`SchemaCoverage` reports which schema entries and properties the written
+data actually populates.
+"""
+
+import logging
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+from .schema import get_input_mappings
+from .validation import hash_ids
+
+logger = logging.getLogger(__name__)
+
+HASH_RANGE = 2**64
+NO_HASHES = np.empty(0, dtype=np.uint64)
+
+
+def hash_id_column(ids) -> np.ndarray:
+    """
+    Hash a column of node IDs into the 64-bit range.
+
+    IDs are converted to strings first, as they are written, and hashed like
+    the node IDs of edge validation; the hashes are the same across runs,
+    processes and machines.
+
+    Args:
+        ids: Sequence or Series of IDs
+
+    Returns:
+        Array of uint64 hashes
+    """
+    return hash_ids(pd.Series(ids).astype(str).to_numpy(dtype=object))
+
+
+class NodeSample:
+    """
+    Hash-stable sample of node IDs.
+
+    For a sample of fixed size, the IDs of every node entry have to be
+    passed to `add_ids` and the sample finalized, then the source and target
+    IDs of every edge entry passed to `add_edges`, before rows are filtered.
+    With `fraction`, nodes are sampled by hash alone and nothing has to be
+    passed beforehand; the input rows are counted by `filter_chunk`.
+    """
+
+    def __init__(self, fraction: float | None = None, size: int | None = None):
+        """
+        Initialize the sample.
+
+        Args:
+            fraction: Fraction of the nodes of every schema entry to sample
+            size: Number of nodes to sample per schema entry
+        """
+        if (fraction is None) == (size is None):
+            raise ValueError("Pass either a fraction or a size")
+        if fraction is not None and not 0 < fraction <= 1:
+            raise ValueError(f"The sample fraction must be in (0, 1], got {fraction}")
+        if size is not None and size < 1:
+            raise ValueError(f"The sample size must be positive, got {size}")
+        self.fraction = fraction
+        self.size = size
+        # Hashes below the threshold are sampled; None samples everything
+        self.threshold = None
+        if fraction is not None and int(fraction * HASH_RANGE) < HASH_RANGE:
+            self.threshold = np.uint64(int(fraction * HASH_RANGE))
+        self._smallest = {}
+        self.thresholds = {}
+        self.hashes = NO_HASHES
+        # Hashes of the targets of sampled edges, which are sampled as well
+        self.targets = NO_HASHES
+        # Input rows per schema entry, before sampling
+        self.rows = defaultdict(int)
+
+    def __str__(self) -> str:
+        if self.fraction is not None:
+            return f"{self.fraction:g} of the nodes"
+        return f"{self.size} nodes per schema entry"
+
+    def add_ids(self, name: str, ids):
+        """
+        Pass node IDs of a schema entry to the sample.
+
+        Only the `size` smallest distinct hashes per entry are kept, so
+        memory use does not depend on the size of the input. Ignored for a
+        fraction.
+
+        Args:
+            name: Name of the node schema entry
+            ids: Sequence or Series of IDs
+        """
+        if self.size is None:
+            return
+        self.rows[name] += len(ids)
+        hashes = np.unique(np.concatenate([self._smallest.get(name, NO_HASHES), hash_id_column(ids)]))
+        self._smallest[name] = hashes[:self.size]
+
+    def finalize(self):
+        """Fix the sampled nodes of a sample of fixed size once all IDs were added."""
+        if self.size is None:
+            return
+        self.thresholds = {name: hashes[-1] for name, hashes in self._smallest.items() if len(hashes)}
+        self.hashes = np.unique(np.concatenate([NO_HASHES, *self._smallest.values()]))
+        logger.info(f"Sampled {len(self.hashes)} nodes of {len(self.thresholds)} schema entries")
+
+    def add_edges(self, name: str, sources, targets):
+        """
+        Pull the targets of sampled edges of a schema entry into the sample.
+
+        Ignored for a fraction.
+
+        Args:
+            name: Name of the edge schema entry
+            sources: Sequence or Series of source IDs
+            targets: Sequence or Series of target IDs, aligned with `sources`
+        """
+        if self.size is None:
+            return
+        self.rows[name] += len(sources)
+        sampled = self._is_sampled(hash_id_column(sources))
+        if sampled.any():
+            self.targets = np.union1d(self.targets, hash_id_column(targets)[sampled])
+
+    def _is_sampled(self, hashes: np.ndarray) -> np.ndarray:
+        """Return whether nodes of any entry are sampled, by hash."""
+        if self.size is not None:
+            return np.isin(hashes, self.hashes)
+        if self.threshold is None:
+            return np.ones(len(hashes), dtype=bool)
+        return hashes < self.threshold
+
+    def node_mask(self, name: str, ids) -> np.ndarray:
+        """Return whether the nodes of a schema entry are sampled, or targets of sampled edges."""
+        hashes = hash_id_column(ids)
+        if self.size is None:
+            mask = self._is_sampled(hashes)
+        elif name in self.thresholds:
+            mask = hashes <= self.thresholds[name]
+        else:
+            mask = np.zeros(len(hashes), dtype=bool)
+        if len(self.targets):
+            mask |= np.isin(hashes, self.targets)
+        return mask
+
+    def edge_mask(self, sources) -> np.ndarray:
+        """Return whether edges are sampled, by their sources."""
+        return self._is_sampled(hash_id_column(sources))
+
+    def filter_chunk(self, chunk: pd.DataFrame, mapping: dict) -> pd.DataFrame:
+        """
+        Keep the sampled rows of a chunk of input rows.
+
+        For a fraction, the rows are counted per schema entry before they
+        are filtered; this only reaches `rows` of the sample in the process
+        that reads them.
+
+        Args:
+            chunk: Chunk of input rows
+            mapping: Input mapping as returned by `schema.get_input_mappings`
+
+        Returns:
+            The rows of sampled nodes, or of edges from sampled nodes
+        """
+        columns = mapping["columns"]
+        if self.size is None:
+            self.rows[mapping["name"]] += len(chunk)
+        if "id" in columns:
+            mask = self.node_mask(mapping["name"], chunk[columns["id"]])
+        else:
+            mask = self.edge_mask(chunk[columns["source"]])
+        return chunk[mask]
+
+
+class SchemaCoverage:
+    """
+    Rows and populated properties per schema entry of a build.
+
+    An entry counts as populated if any row was written for it, a property
+    if it is set on any row; properties with null values are left out of
+    the tuples. Entries whose input rows were all dropped by the sample are
+    reported as filtered out rather than unpopulated.
+    """
+
+    def __init__(self, schema: dict, input_rows: dict[str, int] | None = None):
+        """
+        Initialize the coverage.
+
+        Args:
+            schema: Schema configuration as returned by `load_schema_config`
+            input_rows: Input rows per schema entry before sampling, see
+                `NodeSample.rows`
+        """
+        self.input_rows = input_rows or {}
+        self.mappings = {
+            mapping["name"]: (kind, mapping)
+            for kind in ("node", "edge")
+            for mapping in get_input_mappings(schema, kind)
+        }
+        self.without_input = [name for name in schema if name not in self.mappings]
+        self.rows = defaultdict(int)
+        self.properties = defaultdict(lambda: defaultdict(int))
+
+    def track(self, tuples, name: str):
+        """
+        Count rows and set properties of a schema entry while they are written.
+
+        Args:
+            tuples: Iterable of node or edge tuples
+            name: Name of the schema entry
+
+        Yields:
+            The tuples from `tuples`
+        """
+        counts = self.properties[name]
+        rows = 0
+        try:
+            for item in tuples:
+                rows += 1
+                for key in item[-1]:
+                    counts[key] += 1
+                yield item
+        finally:
+            self.rows[name] += rows
+
+    def report(self) -> dict:
+        """
+        Summarize the coverage.
+
+        Returns:
+            Dictionary with `entries` (kind, label, rows and the fraction of
+            rows setting each declared property, per schema entry),
+            `unpopulated_entries`, `filtered_entries` (entries with input rows
+            that were all dropped by the sample), `unpopulated_properties`
+            (per entry) and `without_input` (schema entries without an input
+            mapping)
+        """
+        entries = {}
+        for name, (kind, mapping) in self.mappings.items():
+            rows = self.rows.get(name, 0)
+            counts = self.properties.get(name, {})
+            entries[name] = {
+                "kind": kind,
+                "label": mapping["label"],
+                "rows": rows,
+                "properties": {prop: round(counts.get(prop, 0) / rows, 4) if rows else 0.0 for prop in mapping["properties"]},
+            }
+        unpopulated_properties = {
+            name: [prop for prop, fraction in entry["properties"].items() if not fraction]
+            for name, entry in entries.items()
+            if entry["rows"]
+        }
+        empty = [name for name, entry in entries.items() if not entry["rows"]]
+        return {
+            "entries": entries,
+            "unpopulated_entries": [name for name in empty if not self.input_rows.get(name)],
+            "filtered_entries": [name for name in empty if self.input_rows.get(name)],
+            "unpopulated_properties": {name: props for name, props in unpopulated_properties.items() if props},
+            "without_input": self.without_input,
+        }
+
+    def log_summary(self):
+        """Log the unpopulated schema entries and properties."""
+        report = self.report()
+        for name, entry in report["entries"].items():
+            populated = sum(1 for fraction in entry["properties"].values() if fraction)
+            logger.info(
+                f"Coverage of '{name}': {entry['rows']} rows, "
+                f"{populated} of {len(entry['properties'])} properties populated"
+            )
+        if report["unpopulated_entries"]:
+            logger.warning(f"Schema entries without any rows: {report['unpopulated_entries']}")
+        if report["filtered_entries"]:
+            logger.info(f"Schema entries filtered out by the sample: {report['filtered_entries']}")
+        for name, props in report["unpopulated_properties"].items():
+            logger.warning(f"Properties of '{name}' never set: {props}")
+        if report["without_input"]:
+            logger.info(f"Schema entries without input mapping: {report['without_input']}")
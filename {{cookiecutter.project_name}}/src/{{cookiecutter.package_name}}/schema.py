@@ -0,0 +1,85 @@
+"""
+Schema helpers for {{ cookiecutter.project_name }}.
+
+Reads `config/schema_config.yaml` and extracts the adapter-specific input
+mapping, i.e. which file or API resource and which columns feed each node
+and edge type. BioCypher ignores the `input_*`, `pagination` and
+`merge_strategy` keys, so they can live next to the regular schema
+definition.
+"""
+
+import logging
+from pathlib import Path
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCHEMA_CONFIG_PATH = "config/schema_config.yaml"
+
+
+def load_schema_config(path: str | Path = DEFAULT_SCHEMA_CONFIG_PATH) -> dict:
+    """
+    Load the BioCypher schema configuration.
+
+    Args:
+        path: Path to the schema configuration YAML file
+
+    Returns:
+        Dictionary of schema entries keyed by BioCypher class name
+    """
+    with open(path, "r") as f:
+        schema = yaml.safe_load(f) or {}
+    return {k: v for k, v in schema.items() if isinstance(v, dict)}
+
+
+def get_input_mappings(schema: dict, represented_as: str) -> list[dict]:
+    """
+    Collect the input mappings of all schema entries of one kind.
+
+    Only entries that declare `input_columns` are returned. Properties that
+    are not renamed in `input_columns` are read from a column of the same
+    name.
+
+    Args:
+        schema: Schema configuration as returned by `load_schema_config`
+        represented_as: Either "node" or "edge"
+
+    Returns:
+        List of mapping dictionaries with the keys `name`, `label`, `file`,
+        `url`, `records` and `pagination` (API resource, see `fetch`),
+        `columns` (tuple field -> column), `properties` (property -> column),
+        `types` (property -> declared type) and `merge_strategy` (how
+        duplicate nodes are merged, see `dedup`)
+    """
+    id_fields = ("id",) if represented_as == "node" else ("source", "target")
+    mappings = []
+
+    for name, entry in schema.items():
+        if entry.get("represented_as") != represented_as:
+            continue
+        input_columns = entry.get("input_columns")
+        if not input_columns:
+            continue
+
+        missing = [field for field in id_fields if field not in input_columns]
+        if missing:
+            raise ValueError(
+                f"Schema entry '{name}' is missing input_columns for {missing}"
+            )
+
+        types = dict(entry.get("properties") or {})
+        mappings.append({
+            "name": name,
+            "label": entry.get("input_label", name),
+            "file": entry.get("input_file"),
+            "url": entry.get("input_url"),
+            "records": entry.get("input_records"),
+            "pagination": entry.get("pagination"),
+            "columns": {field: input_columns[field] for field in id_fields},
+            "properties": {prop: input_columns.get(prop, prop) for prop in types},
+            "types": types,
+            "merge_strategy": entry.get("merge_strategy", "first"),
+        })
+
+    return mappings
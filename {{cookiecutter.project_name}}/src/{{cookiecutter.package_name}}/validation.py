@@ -0,0 +1,181 @@
+"""
+Streaming edge endpoint validation.
+
+Node IDs are recorded as 64-bit hashes while nodes stream to BioCypher, one
+raw file per schema entry, so the index costs 8 bytes per node on disk and
+nothing in the Python heap. Before edges are written, the files are merged
+into one sorted, memory-mapped array that edge endpoints are looked up in
+with a vectorized binary search, batch by batch.
+
+Two different IDs hashing to the same value would let a dangling edge pass;
+with 500M nodes the chance of a single collision is below 1%.
+"""
+
+import logging
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 100_000
+
+
+def hash_ids(ids: list[str]) -> np.ndarray:
+    """Hash a list of IDs to unsigned 64-bit integers."""
+    return pd.util.hash_array(np.asarray(ids, dtype=object), categorize=False)
+
+
+def _batched(items, batch_size: int):
+    """Group an iterable into lists of at most `batch_size` items."""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class NodeIdIndex:
+    """
+    Compact on-disk index of node IDs for checking edge endpoints.
+
+    The per-entry ID files are kept between runs, so entries skipped by an
+    incremental build still contribute their IDs.
+    """
+
+    def __init__(self, directory: str | Path, batch_size: int = DEFAULT_BATCH_SIZE):
+        """
+        Initialize the index.
+
+        Args:
+            directory: Directory holding the ID hash files
+            batch_size: Number of tuples hashed or checked at a time
+        """
+        self.directory = Path(directory)
+        self.batch_size = batch_size
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._sorted = None
+        self.dangling = 0
+
+    def _entry_path(self, entry: str) -> Path:
+        return self.directory / f"{entry}.ids"
+
+    def has_entry(self, entry: str) -> bool:
+        """Whether node IDs were recorded for a schema entry."""
+        return self._entry_path(entry).exists()
+
+    def track(self, nodes, entry: str):
+        """
+        Record the IDs of nodes passing through.
+
+        The ID file of the entry is replaced once the nodes are exhausted.
+
+        Args:
+            nodes: Iterable of node tuples
+            entry: Name of the schema entry the nodes belong to
+
+        Yields:
+            The node tuples from `nodes`
+        """
+        tmp_path = self._entry_path(entry).with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            for batch in _batched(nodes, self.batch_size):
+                hash_ids([node[0] for node in batch]).tofile(f)
+                yield from batch
+        tmp_path.replace(self._entry_path(entry))
+        self._sorted = None
+
+    def finalize(self, entries: list[str]) -> int:
+        """
+        Merge the ID files of the given entries into one sorted array.
+
+        The merged file is sorted in place through a memory map, so the index
+        does not have to fit into memory.
+
+        Args:
+            entries: Names of the node schema entries to include
+
+        Returns:
+            Number of indexed node IDs
+        """
+        merged_path = self.directory / "index.sorted"
+        with open(merged_path, "wb") as merged:
+            for entry in entries:
+                path = self._entry_path(entry)
+                if path.exists():
+                    with open(path, "rb") as f:
+                        shutil.copyfileobj(f, merged)
+                else:
+                    logger.warning(f"No node IDs recorded for '{entry}'")
+
+        if merged_path.stat().st_size == 0:
+            self._sorted = np.empty(0, dtype=np.uint64)
+        else:
+            self._sorted = np.memmap(merged_path, dtype=np.uint64, mode="r+")
+            self._sorted.sort()
+        logger.info(f"Indexed {len(self._sorted)} node IDs for edge validation")
+        return len(self._sorted)
+
+    def contains(self, ids: list[str]) -> np.ndarray:
+        """
+        Check which IDs are in the index.
+
+        Args:
+            ids: IDs to look up
+
+        Returns:
+            Boolean array, True for IDs of known nodes
+        """
+        if self._sorted is None:
+            raise RuntimeError("NodeIdIndex.finalize() must be called before checking edges")
+        if len(self._sorted) == 0:
+            return np.zeros(len(ids), dtype=bool)
+        hashes = hash_ids(ids)
+        positions = np.searchsorted(self._sorted, hashes)
+        positions[positions == len(self._sorted)] = 0
+        return self._sorted[positions] == hashes
+
+    def check_edges(self, edges, drop: bool = True, report_path: str | Path | None = None):
+        """
+        Check edge endpoints against the index.
+
+        Args:
+            edges: Iterable of (source_id, target_id, label, type, properties) tuples
+            drop: Drop dangling edges instead of passing them on
+            report_path: Append dangling edges to this tab-separated file
+
+        Yields:
+            The valid edges, and the dangling ones unless `drop` is set
+        """
+        report = None
+        if report_path:
+            Path(report_path).parent.mkdir(parents=True, exist_ok=True)
+            report = open(report_path, "a")
+        dangling = 0
+        try:
+            for batch in _batched(edges, self.batch_size):
+                valid = self.contains([edge[0] for edge in batch]) & self.contains([edge[1] for edge in batch])
+                if valid.all():
+                    yield from batch
+                    continue
+
+                invalid = np.flatnonzero(~valid)
+                dangling += len(invalid)
+                if report:
+                    report.writelines(f"{batch[i][0]}\t{batch[i][1]}\t{batch[i][2]}\n" for i in invalid)
+                if drop:
+                    yield from (batch[i] for i in np.flatnonzero(valid))
+                else:
+                    yield from batch
+        finally:
+            if report:
+                report.close()
+            self.dangling += dangling
+            if dangling:
+                action = "dropped" if drop else "kept"
+                logger.warning(f"Found {dangling} edges with unknown endpoints ({action})")
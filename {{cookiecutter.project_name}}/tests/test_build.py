@@ -0,0 +1,144 @@
+"""
+Tests for whole knowledge graph builds.
+"""
+
+import json
+import pickle
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+import yaml
+
+from create_knowledge_graph import parse_args
+from {{ cookiecutter.package_name }}.build import KnowledgeGraphBuild
+from {{ cookiecutter.package_name }}.ontology import OntologyCache
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+EXAMPLE_DATA = PROJECT_ROOT / "data" / "example"
+ADAPTER_CLASS = "{{ cookiecutter.package_name }}.adapters.{{ cookiecutter.adapter_name }}.{{ cookiecutter.__adapter_class_name }}"
+
+ONTOLOGY = """\
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix ex: <https://example.org/> .
+ex:Entity a owl:Class ; rdfs:label "entity" .
+ex:NamedThing a owl:Class ; rdfs:label "named thing" ; rdfs:subClassOf ex:Entity .
+ex:Protein a owl:Class ; rdfs:label "protein" ; rdfs:subClassOf ex:NamedThing .
+ex:Gene a owl:Class ; rdfs:label "gene" ; rdfs:subClassOf ex:NamedThing .
+ex:OrganismTaxon a owl:Class ; rdfs:label "organism taxon" ; rdfs:subClassOf ex:NamedThing .
+ex:Association a owl:Class ; rdfs:label "association" ; rdfs:subClassOf ex:Entity .
+"""
+
+
+class TestKnowledgeGraphBuild:
+    """Test builds of the example data against a local ontology."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / "ontology.ttl").write_text(ONTOLOGY)
+        # Entries fetched from an API are left out, the tests run offline
+        with open(PROJECT_ROOT / "config" / "schema_config.yaml") as f:
+            schema = {name: entry for name, entry in yaml.safe_load(f).items() if "input_url" not in entry}
+        self.schema = self.root / "schema_config.yaml"
+        self.schema.write_text(yaml.safe_dump(schema, sort_keys=False))
+    
+        with open(PROJECT_ROOT / "config" / "biocypher_config.yaml") as f:
+            config = yaml.safe_load(f)
+        config["biocypher"].update({
+            "schema_config_path": str(self.schema),
+            "head_ontology": {"url": str(self.root / "ontology.ttl"), "root_node": "entity"},
+            "log_to_disk": False,
+            "output_directory": str(self.root / "output"),
+            "cache_directory": str(self.root / ".cache"),
+        })
+        self.config = self.root / "biocypher_config.yaml"
+        self.config.write_text(yaml.safe_dump(config))
+        self.registry = self.root / "adapters.yaml"
+        self.write_registry({"example": {"class": ADAPTER_CLASS, "data_source": str(EXAMPLE_DATA)}})
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def write_registry(self, adapters: dict):
+        self.registry.write_text(yaml.safe_dump({"adapters": adapters}))
+    
+    def run_build(self, monkeypatch, *argv) -> int:
+        """Run a build in the temporary directory, which also receives the logs."""
+        monkeypatch.chdir(self.root)
+        build = KnowledgeGraphBuild(
+            parse_args(list(argv)),
+            biocypher_config_path=str(self.config),
+            schema_config_path=str(self.schema),
+            registry_path=str(self.registry),
+        )
+        return build.run()
+    
+    def read_ids(self, label: str) -> list[str]:
+        """Return the node IDs written for a label, whichever delimiter BioCypher was configured with."""
+        parts = sorted((self.root / "output").glob(f"{label}-part*.csv"))
+        return [
+            node_id
+            for part in parts
+            for node_id in pd.read_csv(part, sep=None, engine="python", header=None, dtype=str)[0]
+        ]
+    
+    def test_incremental_build(self, monkeypatch):
+        """Test that a build writes the parts and the manifest, and that a second build skips unchanged entries."""
+        assert self.run_build(monkeypatch) == 0
+    
+        output = self.root / "output"
+        assert sorted(self.read_ids("Protein")) == sorted(pd.read_csv(EXAMPLE_DATA / "proteins.csv")["accession"])
+        manifest = json.loads((output / "build_manifest.json").read_text())
+        assert set(manifest["entries"]) == {"protein", "gene", "protein_encoded_by_gene"}
+        for entry in manifest["entries"].values():
+            assert entry["outputs"] and all((output / name).exists() for name in entry["outputs"])
+        written = {path.name: path.stat().st_mtime_ns for path in output.glob("*-part*.csv")}
+    
+        assert self.run_build(monkeypatch) == 0
+    
+        assert {path.name: path.stat().st_mtime_ns for path in output.glob("*-part*.csv")} == written
+        assert json.loads((output / "build_manifest.json").read_text())["entries"] == manifest["entries"]
+    
+    @pytest.mark.parametrize("options", [[], ["--parallel-adapters", "2"]])
+    def test_deduplicate_merges_sources(self, monkeypatch, options):
+        """Test that nodes of one label from two adapters with overlapping IDs are merged."""
+        for source, ids in (("uniprot", ["P1", "P2", "P3"]), ("trembl", ["P2", "P3", "P4"])):
+            (self.root / source).mkdir()
+            pd.DataFrame({"accession": ids, "name": [f"{source} {i}" for i in ids]}).to_csv(
+                self.root / source / "proteins.csv", index=False
+            )
+        self.write_registry({
+            "example": {"class": ADAPTER_CLASS, "data_source": str(EXAMPLE_DATA)},
+            "uniprot": {"class": ADAPTER_CLASS, "data_source": str(self.root / "uniprot"), "entries": ["protein"]},
+            "trembl": {"class": ADAPTER_CLASS, "data_source": str(self.root / "trembl"), "entries": ["protein"]},
+        })
+    
+        assert self.run_build(monkeypatch, "--full", "--deduplicate", *options) == 0
+    
+        assert sorted(self.read_ids("Protein")) == ["P1", "P2", "P3", "P4"]
+        assert len(self.read_ids("Gene")) == len(pd.read_csv(EXAMPLE_DATA / "genes.csv"))
+    
+    def test_ontology_cache_failure_falls_back_to_biocypher(self, monkeypatch):
+        """Test that a build whose ontology cannot be cached lets BioCypher parse it and removes the cache file."""
+        def fail(cache):
+            cache.path.parent.mkdir(parents=True, exist_ok=True)
+            cache.path.write_bytes(b"partial")
+            raise pickle.PicklingError("cannot pickle")
+        monkeypatch.setattr(OntologyCache, "build", fail)
+    
+        assert self.run_build(monkeypatch, "--full") == 0
+    
+        assert not list((self.root / ".cache" / "ontology").glob("*.pkl"))
+        assert self.read_ids("Gene")
+    
+    def test_broken_ontology_is_reported(self, monkeypatch, caplog):
+        """Test that an ontology missing a schema class fails the build with an error instead of a traceback."""
+        (self.root / "ontology.ttl").write_text(ONTOLOGY.replace('rdfs:label "protein"', 'rdfs:label "polypeptide"'))
+    
+        assert self.run_build(monkeypatch, "--full") == 1
+    
+        assert "Could not load the ontology" in caplog.text
+        assert not (self.root / "output").exists() or not list((self.root / "output").glob("*.csv"))
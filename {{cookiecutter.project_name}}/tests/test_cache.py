@@ -0,0 +1,147 @@
+"""
+Tests for the on-disk batch cache.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.package_name }}.adapters.{{ cookiecutter.adapter_name }} import {{ cookiecutter.__adapter_class_name }}
+from {{ cookiecutter.package_name }}.cache import BatchCache, compute_namespace
+from {{ cookiecutter.package_name }}.columnar import iter_tuples
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCHEMA_CONFIG = PROJECT_ROOT / "config" / "schema_config.yaml"
+EXAMPLE_DATA = PROJECT_ROOT / "data" / "example"
+
+
+class TestBatchCache:
+    """Test storing, replaying and evicting cached batches."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def test_put_and_get(self):
+        """Test that a shard is replayed only after it was fully consumed."""
+        cache = BatchCache(self.root, "ns")
+        batches = [[("P1", "protein", {})], [("P2", "protein", {"name": "B"})]]
+        
+        stored = cache.put("key", iter(batches))
+        next(stored)
+        assert cache.get("key") is None
+        list(stored)
+        
+        assert list(cache.get("key")) == batches
+    
+    def test_namespace_change_drops_old_entries(self):
+        """Test that opening a new namespace removes the previous one."""
+        list(BatchCache(self.root, "old").put("key", [[1]]))
+        
+        cache = BatchCache(self.root, "new")
+        
+        assert cache.get("key") is None
+        assert not (self.root / "batches" / "old").exists()
+    
+    def test_evicts_least_recently_used(self):
+        """Test that the size cap evicts the shard used least recently."""
+        cache = BatchCache(self.root, "ns", max_size=10**9)
+        for key in ("a", "b", "c"):
+            list(cache.put(key, [[key * 1000]]))
+        for age, key in enumerate(("c", "a", "b")):
+            for path in cache.directory.glob(f"{key}*"):
+                os.utime(path, (1000 + age, 1000 + age))
+        
+        cache.max_size = cache.size() - 1
+        cache.evict()
+        
+        assert cache.get("c") is None
+        assert cache.get("a") is not None
+        assert cache.get("b") is not None
+    
+    def test_eviction_spares_shards_being_written(self):
+        """Test that shards without an index yet are not evicted."""
+        cache = BatchCache(self.root, "ns")
+        list(cache.put("done", [["a" * 1000], ["b" * 1000]]))
+        writing = cache.put("writing", iter([["c" * 1000], ["d" * 1000]]))
+        next(writing)
+        
+        cache.max_size = 0
+        cache.evict()
+        
+        assert cache.get("done") is None
+        cache.max_size = 10**9
+        assert len(list(writing)) == 1
+        assert list(cache.get("writing")) == [["c" * 1000], ["d" * 1000]]
+    
+    def test_chunks_are_opened_lazily(self):
+        """Test that a replay only opens a chunk file once it reaches it."""
+        cache = BatchCache(self.root, "ns")
+        list(cache.put("key", [[1], [2]]))
+        replay = cache.get("key")
+        
+        assert next(replay) == [1]
+        for path in cache.directory.glob("key-*"):
+            path.unlink()
+        with pytest.raises(FileNotFoundError):
+            next(replay)
+    
+    def test_columnar_batches_are_stored_as_arrow(self):
+        """Test that columnar batches are written as Arrow IPC files and replay the same tuples."""
+        pytest.importorskip("pyarrow")
+        cache = BatchCache(self.root, "ns")
+        adapter = {{ cookiecutter.__adapter_class_name }}(EXAMPLE_DATA, schema_config_path=SCHEMA_CONFIG)
+        batches = list(adapter.get_node_batches())
+        
+        list(cache.put("key", batches))
+        
+        assert {path.suffix for path in cache.directory.glob("key-*")} == {".arrow"}
+        replayed = list(cache.get("key"))
+        assert [batch.label for batch in replayed] == [batch.label for batch in batches]
+        assert list(iter_tuples(replayed)) == list(iter_tuples(batches))
+    
+    def test_missing_chunks_are_a_miss(self):
+        """Test that a shard with missing chunk files is treated as not cached."""
+        cache = BatchCache(self.root, "ns")
+        list(cache.put("key", [[1], [2]]))
+        
+        next(cache.directory.glob("key-*")).unlink()
+        
+        assert cache.get("key") is None
+    
+    def test_compute_namespace_tracks_schema(self):
+        """Test that the namespace changes with the schema configuration."""
+        schema = self.root / "schema_config.yaml"
+        schema.write_text("protein: {}\n")
+        before = compute_namespace(schema)
+        schema.write_text("gene: {}\n")
+        
+        assert compute_namespace(schema) != before
+    
+    def test_adapter_replays_from_cache(self):
+        """Test that a second extraction is served from the cache."""
+        cache = BatchCache(self.root, "ns")
+        adapter = {{ cookiecutter.__adapter_class_name }}(EXAMPLE_DATA, schema_config_path=SCHEMA_CONFIG, cache=cache)
+        nodes = list(adapter.get_nodes())
+        
+        adapter._read_chunks = None  # Any attempt to parse would fail now
+        
+        assert list(adapter.get_nodes()) == nodes
+    
+    def test_adapter_reads_chunks_evicted_during_replay(self):
+        """Test that a replay whose chunk files are evicted part way through continues from the input."""
+        cache = BatchCache(self.root, "ns")
+        adapter = {{ cookiecutter.__adapter_class_name }}(EXAMPLE_DATA, schema_config_path=SCHEMA_CONFIG, cache=cache, chunk_size=2)
+        batches = list(adapter.get_node_batches(["protein"]))
+        
+        replay = adapter.get_node_batches(["protein"])
+        first = next(replay)
+        cache.max_size = 0
+        cache.evict()
+        
+        assert list(iter_tuples([first, *replay])) == list(iter_tuples(batches))
@@ -0,0 +1,137 @@
+"""
+Tests for checkpoints of resumable builds.
+"""
+
+import tempfile
+from pathlib import Path
+
+from {{ cookiecutter.package_name }}.adapters.{{ cookiecutter.adapter_name }} import {{ cookiecutter.__adapter_class_name }}
+from {{ cookiecutter.package_name }}.checkpoint import (
+    CHECKPOINT_NAME,
+    BuildCheckpoint,
+    CheckpointedStream,
+    iter_shard_chunks,
+    remove_orphaned_parts,
+)
+
+BUILD = {"schema_hash": "abc", "adapter_version": "1.0", "shard_size": 256}
+
+
+def make_chunks(sizes: list[int], key: str = "proteins.csv:0:None"):
+    """Yield chunks of node tuples as `iter_shard_chunks` does for one shard."""
+    row = 0
+    for number, size in enumerate(sizes, start=1):
+        yield key, number, [(f"P{row + i}", "protein", {}) for i in range(size)]
+        row += size
+    yield key, None, []
+
+
+def write_segments(stream: CheckpointedStream) -> list[tuple]:
+    """Consume the segments of a stream, returning their lengths and the progress after each."""
+    return [(len(list(segment)), dict(stream.progress)) for segment in stream.segments(stream.tuples())]
+
+
+class TestCheckpointedStream:
+    """Test cutting a stream of chunks into checkpointed segments."""
+    
+    def test_segments_end_on_chunk_boundaries(self):
+        """Test that segments hold whole chunks and progress matches what was written."""
+        stream = CheckpointedStream(make_chunks([3, 3, 0, 3, 2]), {}, segment_rows=5)
+    
+        segments = write_segments(stream)
+    
+        assert [rows for rows, _ in segments] == [6, 5]
+        assert segments[0][1] == {"proteins.csv:0:None": {"chunks": 2, "complete": False}}
+        assert stream.progress == {"proteins.csv:0:None": {"chunks": 5, "complete": True}}
+    
+    def test_resume_after_interruption(self):
+        """Test that resuming from the progress of a segment writes every tuple exactly once."""
+        sizes = [4, 1, 4, 3, 2]
+        stream = CheckpointedStream(make_chunks(sizes), {}, segment_rows=4)
+        written = [item for segment in stream.segments(stream.tuples()) for item in segment]
+    
+        stream = CheckpointedStream(make_chunks(sizes), {}, segment_rows=4)
+        segments = stream.segments(stream.tuples())
+        first = list(next(segments))
+        progress = dict(stream.progress)
+        chunks = progress["proteins.csv:0:None"]["chunks"]
+        remaining = [
+            (key, number, batch) for key, number, batch in make_chunks(sizes)
+            if number is None or number > chunks
+        ]
+        stream = CheckpointedStream(iter(remaining), progress, segment_rows=4)
+        resumed = [item for segment in stream.segments(stream.tuples()) for item in segment]
+    
+        assert first + resumed == written
+        assert len(written) == sum(sizes)
+
+
+class TestBuildCheckpoint:
+    """Test saving, invalidating and cleaning up checkpoints."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = Path(self.temp_dir.name) / "output"
+        self.inputs = {"proteins.csv": {"size": 10, "mtime_ns": 1}}
+        self.progress = {"proteins.csv:0:None": {"chunks": 2, "complete": False}}
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def test_progress_is_restored(self):
+        """Test that a saved checkpoint restores the progress of an entry."""
+        BuildCheckpoint(self.output, BUILD).update("protein", self.inputs, 100, self.progress, {"Protein-part000.csv"})
+    
+        checkpoint = BuildCheckpoint(self.output, BUILD)
+    
+        assert checkpoint.get_progress("protein", self.inputs, 100) == self.progress
+        assert checkpoint.list_outputs() == {"Protein-part000.csv"}
+        checkpoint.remove("protein")
+        assert not (self.output / CHECKPOINT_NAME).exists()
+    
+    def test_changes_invalidate_the_checkpoint(self):
+        """Test that changed inputs, chunk sizes or build settings start entries over."""
+        BuildCheckpoint(self.output, BUILD).update("protein", self.inputs, 100, self.progress, set())
+    
+        assert BuildCheckpoint(self.output, BUILD).get_progress("protein", {}, 100) == {}
+        assert BuildCheckpoint(self.output, BUILD).get_progress("protein", self.inputs, 50) == {}
+        assert BuildCheckpoint(self.output, dict(BUILD, shard_size=512)).entries == {}
+    
+    def test_remove_orphaned_parts(self):
+        """Test that only part and header files not recorded anywhere are removed."""
+        self.output.mkdir()
+        for name in ["Protein-header.csv", "Protein-part000.csv", "Protein-part001.csv", "Gene-header.csv", "import.sh"]:
+            (self.output / name).write_text("data")
+    
+        removed = remove_orphaned_parts(self.output, {"Protein-header.csv", "Protein-part000.csv"})
+    
+        assert removed == ["Gene-header.csv", "Protein-part001.csv"]
+        assert sorted(path.name for path in self.output.iterdir()) == ["Protein-header.csv", "Protein-part000.csv", "import.sh"]
+
+
+class TestShardChunks:
+    """Test extracting shards chunk by chunk from a checkpoint."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        data_dir = Path(self.temp_dir.name)
+        (data_dir / "proteins.csv").write_text(
+            "accession,name,organism\n" + "".join(f"P{i},Protein {i},Homo sapiens\n" for i in range(50))
+        )
+        self.adapter = {{ cookiecutter.__adapter_class_name }}(data_dir, chunk_size=5)
+        self.shards = self.adapter.get_shards("node", 512, entries=["protein"])
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def test_written_chunks_are_skipped(self):
+        """Test that complete shards and written chunks are left out, sequentially and in parallel."""
+        nodes = list(self.adapter.get_nodes(["protein"]))
+        first = len(list(self.adapter.get_shard_nodes(*self.shards[0])))
+        keys = [f"{path}:{start}:{end}" for _, (path, start, end) in self.shards]
+        progress = {keys[0]: {"chunks": 4, "complete": True}, keys[1]: {"chunks": 2, "complete": False}}
+    
+        for workers in (1, 2):
+            chunks = iter_shard_chunks(self.adapter, "node", self.shards, progress, workers=workers)
+            resumed = [item for _, _, batch in chunks for item in batch]
+            assert resumed == nodes[first + 2 * 5:]
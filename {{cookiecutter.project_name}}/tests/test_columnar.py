@@ -0,0 +1,140 @@
+"""
+Tests for columnar node and edge batches.
+"""
+
+import pickle
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.package_name }}.adapters.{{ cookiecutter.adapter_name }} import {{ cookiecutter.__adapter_class_name }}
+from {{ cookiecutter.package_name }}.columnar import (
+    ColumnarBatch,
+    dataframe_to_edge_batch,
+    dataframe_to_node_batch,
+    iter_tuples,
+)
+from {{ cookiecutter.package_name }}.convert import dataframe_to_edges, dataframe_to_nodes
+from {{ cookiecutter.package_name }}.parallel import extract_parallel
+
+NODE_MAPPING = {
+    "name": "gene",
+    "label": "gene",
+    "columns": {"id": "gene_id"},
+    "properties": {"symbol": "symbol", "start": "start", "score": "score", "curated": "curated"},
+    "types": {"symbol": "string", "start": "integer", "score": "float", "curated": "boolean"},
+}
+EDGE_MAPPING = {
+    "name": "encoded_by",
+    "label": "encoded_by",
+    "columns": {"source": "accession", "target": "gene_id"},
+    "properties": {"confidence": "confidence"},
+    "types": {"confidence": "float"},
+}
+
+
+def make_chunk() -> pd.DataFrame:
+    return pd.DataFrame({
+        "gene_id": ["G1", "G2", "G3", "G4"],
+        "accession": ["P1", "P2", "P3", "P4"],
+        "symbol": ["TP53", None, "BRCA1", "EGFR"],
+        "start": ["100", "200", None, "x"],
+        "score": [0.5, None, 1.5, 2.0],
+        "curated": [True, False, None, True],
+        "confidence": [0.9, 0.8, None, 0.7],
+    })
+
+
+class TestColumnarBatch:
+    """Test conversion to and from columnar batches."""
+
+    def test_tuples_match_row_conversion(self):
+        """Test that a batch yields the same tuples as the per-row conversion."""
+        chunk = make_chunk()
+    
+        nodes = dataframe_to_node_batch(chunk, NODE_MAPPING)
+        edges = dataframe_to_edge_batch(chunk, EDGE_MAPPING)
+    
+        assert len(nodes) == 4
+        assert list(nodes) == dataframe_to_nodes(chunk, NODE_MAPPING)
+        assert list(edges) == dataframe_to_edges(chunk, EDGE_MAPPING)
+        assert list(iter_tuples([nodes, nodes])) == dataframe_to_nodes(chunk, NODE_MAPPING) * 2
+
+    def test_columns_are_typed_arrays(self):
+        """Test that properties are stored as typed arrays with null masks and the schema once."""
+        batch = dataframe_to_node_batch(make_chunk(), NODE_MAPPING)
+    
+        assert batch.properties["start"].dtype == "int64"
+        assert batch.properties["score"].dtype == "float64"
+        assert batch.nulls["start"].tolist() == [False, False, True, True]
+        assert "symbol" in batch.nulls and batch.schema is NODE_MAPPING["types"]
+        assert pickle.loads(pickle.dumps(batch)).ids["id"].tolist() == ["G1", "G2", "G3", "G4"]
+
+    def test_batch_without_properties(self):
+        """Test that every row gets its own empty property dictionary."""
+        mapping = dict(NODE_MAPPING, properties={}, types={})
+    
+        nodes = list(ColumnarBatch.from_dataframe(make_chunk(), mapping, "node"))
+    
+        assert nodes[0] == ("G1", "gene", {})
+        assert nodes[0][2] is not nodes[1][2]
+
+    def test_to_arrow(self):
+        """Test the conversion into an Arrow RecordBatch."""
+        pa = pytest.importorskip("pyarrow")
+    
+        record_batch = dataframe_to_node_batch(make_chunk(), NODE_MAPPING).to_arrow()
+    
+        assert record_batch.schema.names == ["id", "symbol", "start", "score", "curated"]
+        assert record_batch.schema.field("start").type == pa.int64()
+        assert record_batch.column("start").to_pylist() == [100, 200, None, None]
+        assert record_batch.schema.metadata[b"label"] == b"gene"
+
+    def test_from_arrow(self):
+        """Test that a batch converted to Arrow and back yields the same tuples and null masks."""
+        pytest.importorskip("pyarrow")
+        chunk = make_chunk()
+        chunk["aliases"] = [["p53"], ["a", "b"], None, []]
+        mapping = {**NODE_MAPPING, "properties": {**NODE_MAPPING["properties"], "aliases": "aliases"}}
+    
+        for batch in (dataframe_to_node_batch(chunk, mapping), dataframe_to_edge_batch(chunk, EDGE_MAPPING)):
+            restored = ColumnarBatch.from_arrow(batch.to_arrow())
+    
+            assert (restored.kind, restored.label, restored.schema) == (batch.kind, batch.label, batch.schema)
+            assert sorted(restored.nulls) == sorted(batch.nulls)
+            assert list(restored) == list(batch)
+
+
+class TestAdapterBatches:
+    """Test the columnar batch interface of the adapter."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        data_dir = Path(self.temp_dir.name)
+        (data_dir / "proteins.csv").write_text(
+            "accession,name,organism\n" + "".join(f"P{i},Protein {i},Homo sapiens\n" for i in range(50))
+        )
+        (data_dir / "genes.csv").write_text("gene_id,symbol,start_position\nG1,TP53,100\nG2,BRCA1,\n")
+        (data_dir / "protein_gene.csv").write_text("protein_id,gene_id,confidence\nP1,G1,0.9\nP2,G2,\n")
+        self.adapter = {{ cookiecutter.__adapter_class_name }}(data_dir, chunk_size=20)
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def test_batches_match_tuples(self):
+        """Test that the batches hold the same nodes and edges as get_nodes/get_edges."""
+        batches = list(self.adapter.get_node_batches(["protein"]))
+    
+        assert [len(batch) for batch in batches] == [20, 20, 10]
+        assert list(iter_tuples(batches)) == list(self.adapter.get_nodes(["protein"]))
+        assert list(iter_tuples(self.adapter.get_node_batches())) == list(self.adapter.get_nodes())
+        assert list(iter_tuples(self.adapter.get_edge_batches())) == list(self.adapter.get_edges())
+
+    def test_parallel_batches(self):
+        """Test that worker processes can pass columnar batches."""
+        batches = list(extract_parallel(self.adapter, "node", 2, shard_size=256, entries=["protein"], columnar=True))
+    
+        assert all(isinstance(batch, ColumnarBatch) for batch in batches)
+        assert list(iter_tuples(batches)) == list(self.adapter.get_nodes(["protein"]))
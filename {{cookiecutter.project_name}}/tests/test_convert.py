@@ -0,0 +1,68 @@
+"""
+Tests for the batch DataFrame-to-tuple conversion.
+"""
+
+import pandas as pd
+
+from {{ cookiecutter.package_name }}.convert import cast_column, dataframe_to_edges, dataframe_to_nodes
+
+GENE_MAPPING = {
+    "name": "gene",
+    "label": "gene",
+    "columns": {"id": "gene_id"},
+    "properties": {"symbol": "symbol", "chromosome": "chr", "start_position": "start_position"},
+    "types": {"symbol": "string", "chromosome": "string", "start_position": "integer"},
+}
+
+EDGE_MAPPING = {
+    "name": "protein_encoded_by_gene",
+    "label": "encoded_by",
+    "columns": {"source": "protein_id", "target": "gene_id"},
+    "properties": {"confidence": "confidence"},
+    "types": {"confidence": "float"},
+}
+
+
+class TestConvert:
+    """Test the conversion functions."""
+    
+    def test_dataframe_to_nodes_casts_and_drops_nulls(self):
+        """Test that properties are cast per schema type and nulls are left out."""
+        chunk = pd.DataFrame({
+            'gene_id': ['G1', 'G2'],
+            'symbol': ['INS', None],
+            'chr': ['11', '12'],
+            'start_position': [2157796.0, None],
+        })
+        
+        nodes = dataframe_to_nodes(chunk, GENE_MAPPING)
+        
+        assert nodes == [
+            ('G1', 'gene', {'symbol': 'INS', 'chromosome': '11', 'start_position': 2157796}),
+            ('G2', 'gene', {'chromosome': '12'}),
+        ]
+        assert type(nodes[0][2]['start_position']) is int
+    
+    def test_dataframe_to_edges(self):
+        """Test that edges carry the input label as label and type."""
+        chunk = pd.DataFrame({'protein_id': ['P1'], 'gene_id': ['G1'], 'confidence': ['0.5']})
+        
+        edges = dataframe_to_edges(chunk, EDGE_MAPPING)
+        
+        assert edges == [('P1', 'G1', 'encoded_by', 'encoded_by', {'confidence': 0.5})]
+    
+    def test_missing_property_columns_are_skipped(self):
+        """Test that properties without a column in the chunk are not emitted."""
+        chunk = pd.DataFrame({'gene_id': ['G1']})
+        
+        assert dataframe_to_nodes(chunk, GENE_MAPPING) == [('G1', 'gene', {})]
+    
+    def test_cast_column_drops_invalid_values(self):
+        """Test that values not matching the schema type become null."""
+        column = pd.Series(['1', 'two', '3.5'], name='start_position')
+        
+        cast = cast_column(column, 'integer')
+        
+        assert str(cast.dtype) == 'Int64'
+        assert cast[0] == 1
+        assert cast.isna().tolist() == [False, True, True]
@@ -0,0 +1,95 @@
+"""
+Tests for the streaming node deduplication.
+"""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.package_name }}.dedup import NodeDeduplicator, get_list_properties
+
+NODES = [
+    ("P2", "protein", {"name": "B", "synonyms": ["b"]}),
+    ("P1", "protein", {"name": "A", "synonyms": ["a1"]}),
+    ("P2", "protein", {"name": "B2", "organism": "human"}),
+    ("P3", "protein", {}),
+    ("P1", "protein", {"name": "A", "synonyms": ["a2", "a1"]}),
+]
+
+
+class TestNodeDeduplicator:
+    """Test merging of duplicate nodes."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def deduplicate(self, strategy: str, max_nodes: int = 100) -> dict:
+        deduplicator = NodeDeduplicator(
+            strategy,
+            {"synonyms"},
+            max_nodes=max_nodes,
+            directory=self.temp_dir.name,
+        )
+        nodes = list(deduplicator.deduplicate(iter(NODES)))
+        assert deduplicator.duplicates == 2
+        assert deduplicator.conflicts == (1 if strategy == "union" else 2)
+        return {node_id: properties for node_id, _, properties in nodes}
+    
+    def test_first_wins(self):
+        """Test that the first value of a property is kept and gaps are filled."""
+        nodes = self.deduplicate("first")
+        
+        assert nodes["P2"] == {"name": "B", "synonyms": ["b"], "organism": "human"}
+        assert nodes["P1"]["synonyms"] == ["a1"]
+        assert list(nodes) == ["P2", "P1", "P3"]
+    
+    def test_last_wins(self):
+        """Test that later values overwrite earlier ones."""
+        nodes = self.deduplicate("last")
+        
+        assert nodes["P2"]["name"] == "B2"
+        assert nodes["P1"]["synonyms"] == ["a2", "a1"]
+    
+    def test_union_of_lists(self):
+        """Test that list-typed properties are unioned."""
+        nodes = self.deduplicate("union")
+        
+        assert nodes["P1"]["synonyms"] == ["a1", "a2"]
+        assert nodes["P2"]["name"] == "B"
+    
+    @pytest.mark.parametrize("strategy", ["first", "last", "union"])
+    def test_none_values_are_missing(self, strategy):
+        """Test that None values neither win nor count as conflicts."""
+        deduplicator = NodeDeduplicator(strategy, {"synonyms"})
+        
+        earlier = deduplicator.merge(("P1", "protein", {"name": None}), ("P1", "protein", {"name": "X"}))
+        later = deduplicator.merge(("P1", "protein", {"name": "X", "synonyms": ["a"]}), ("P1", "protein", {"name": None, "synonyms": None}))
+        
+        assert earlier[2] == {"name": "X"}
+        assert later[2] == {"name": "X", "synonyms": ["a"]}
+        assert deduplicator.conflicts == 0
+    
+    @pytest.mark.parametrize("strategy", ["first", "last", "union"])
+    def test_spilling_matches_in_memory(self, strategy):
+        """Test that the external merge gives the same result as the in-memory merge."""
+        in_memory = self.deduplicate(strategy)
+        spilled = self.deduplicate(strategy, max_nodes=1)
+        
+        assert spilled == in_memory
+        assert list(spilled) == ["P1", "P2", "P3"]
+        assert list(Path(self.temp_dir.name).iterdir()) == []
+    
+    def test_list_properties_from_schema(self):
+        """Test that list types are read from the input mapping."""
+        mapping = {"types": {"name": "str", "synonyms": "str[]"}}
+        
+        assert get_list_properties(mapping) == {"synonyms"}
+    
+    def test_unknown_strategy(self):
+        """Test that an unknown strategy is rejected."""
+        with pytest.raises(ValueError):
+            NodeDeduplicator("newest")
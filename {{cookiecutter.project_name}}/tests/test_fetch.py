@@ -0,0 +1,223 @@
+"""
+Tests for fetching paginated API resources, against a local stand-in server.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+import yaml
+
+pytest.importorskip("aiohttp")
+
+from {{ cookiecutter.package_name }}.adapters.{{ cookiecutter.adapter_name }} import {{ cookiecutter.__adapter_class_name }}
+from {{ cookiecutter.package_name }}.fetch import ApiClient, ResponseCache, get_next_url, set_query_params
+
+RECORDS = [
+    {"accession": f"P{i:03d}", "organism": {"scientificName": "Homo sapiens" if i % 2 else "Mus musculus"}}
+    for i in range(25)
+]
+SLOW_DELAY = 0.3
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves RECORDS with offset and link pagination, slowly on /slow, and a flaky endpoint."""
+    
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        query = {key: values[0] for key, values in parse_qs(parts.query).items()}
+        self.server.requests.append(self.path)
+        self.server.request_times.append(time.perf_counter())
+        headers = {}
+    
+        if parts.path == "/offset":
+            offset, limit = int(query["offset"]), int(query["limit"])
+            body = {"data": {"items": RECORDS[offset:offset + limit]}}
+        elif parts.path in ("/link", "/slow"):
+            if parts.path == "/slow":
+                time.sleep(SLOW_DELAY)
+            page = int(query.get("page", 0))
+            body = {"results": RECORDS[page * 10:(page + 1) * 10]}
+            if (page + 1) * 10 < len(RECORDS):
+                next_url = set_query_params(f"http://{self.headers['Host']}{parts.path}", {**query, "page": page + 1})
+                headers["Link"] = f'<{next_url}>; rel="next"'
+        elif parts.path == "/flaky" and self.server.requests.count(self.path) < 3:
+            self.send_response(503)
+            self.send_header("Retry-After", "0")
+            self.end_headers()
+            return
+        elif parts.path == "/flaky":
+            body = RECORDS[:3]
+        else:
+            self.send_response(404)
+            self.end_headers()
+            return
+    
+        content = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(content)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class TestApiClient:
+    """Test the concurrent API client."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+        self.server.requests = []
+        self.server.request_times = []
+        self.base_url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+    
+    def teardown_method(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.temp_dir.cleanup()
+    
+    def test_offset_pagination(self):
+        """Test that numbered pages are fetched in windows and yielded in order."""
+        client = ApiClient(concurrency=4)
+        pagination = {"type": "offset", "size": 10}
+    
+        pages = list(client.iter_pages(f"{self.base_url}/offset", "data.items", pagination))
+    
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert [record for page in pages for record in page] == RECORDS
+        assert len(self.server.requests) == 4
+    
+    def test_link_pagination(self):
+        """Test that next links from the Link header are followed."""
+        pages = list(ApiClient().iter_pages(f"{self.base_url}/link"))
+    
+        assert [record for page in pages for record in page] == RECORDS
+        assert len(self.server.requests) == 3
+    
+    def test_link_pagination_prefetches(self):
+        """Test that the next page is requested while the current one is consumed."""
+        consumed = []
+        for page in ApiClient().iter_pages(f"{self.base_url}/slow"):
+            time.sleep(SLOW_DELAY)
+            consumed.append(time.perf_counter())
+    
+        assert len(consumed) == 3
+        # Every further request starts before the previous page was consumed
+        assert all(requested < done for requested, done in zip(self.server.request_times[1:], consumed))
+    
+    def test_retries(self):
+        """Test that failing requests are retried and give up after the retry limit."""
+        assert list(ApiClient(retries=2, backoff=0).iter_pages(f"{self.base_url}/flaky")) == [RECORDS[:3]]
+    
+        with pytest.raises(RuntimeError, match="failed after 1 retries"):
+            list(ApiClient(retries=1, backoff=0).iter_pages(f"{self.base_url}/flaky?other=1"))
+    
+    def test_response_cache(self):
+        """Test that cached responses are replayed without requests."""
+        client = ApiClient(cache_directory=self.temp_dir.name)
+        first = list(client.iter_pages(f"{self.base_url}/link"))
+        requests = len(self.server.requests)
+    
+        assert list(client.iter_pages(f"{self.base_url}/link")) == first
+        assert len(self.server.requests) == requests
+    
+    def test_response_cache_is_pruned(self):
+        """Test that expired responses and the oldest ones beyond the size cap are removed."""
+        cache = ResponseCache(self.temp_dir.name, max_age=3600, max_size=10**9)
+        for age, url in enumerate(("expired", "old", "new")):
+            cache.put(url, RECORDS, None)
+            mtime = time.time() - (4000 if url == "expired" else 100 - age)
+            os.utime(cache._path(url), (mtime, mtime))
+    
+        cache.max_size = cache._path("new").stat().st_size * 3 // 2
+        cache.prune()
+    
+        assert [url for url in ("expired", "old", "new") if cache._path(url).exists()] == ["new"]
+    
+    def test_adapter_reads_api_entries(self):
+        """Test that schema entries with an input_url produce node tuples."""
+        schema = {
+            "protein": {
+                "represented_as": "node",
+                "input_label": "protein",
+                "input_url": "offset",
+                "input_records": "data.items",
+                "pagination": {"type": "offset", "size": 10},
+                "input_columns": {"id": "accession", "organism": "organism.scientificName"},
+                "properties": {"organism": "string"},
+            }
+        }
+        schema_path = Path(self.temp_dir.name) / "schema_config.yaml"
+        schema_path.write_text(yaml.safe_dump(schema))
+        adapter = {{ cookiecutter.__adapter_class_name }}(
+            data_source=self.temp_dir.name,
+            schema_config_path=schema_path,
+            chunk_size=7,
+            filters={"protein": {"organism.scientificName": "Homo sapiens"}},
+            base_url=self.base_url,
+            api_client=ApiClient(),
+        )
+    
+        nodes = list(adapter.get_nodes())
+    
+        assert [node[0] for node in nodes] == [r["accession"] for r in RECORDS if r["organism"]["scientificName"] == "Homo sapiens"]
+        assert nodes[0][1:] == ("protein", {"organism": "Homo sapiens"})
+        assert adapter.get_input_files("node") == {"protein": []}
+    
+    def test_adapter_fetches_resources_concurrently(self):
+        """Test that the resources of an entry are fetched at once on one connection pool."""
+        schema_path = Path(self.temp_dir.name) / "schema_config.yaml"
+        schema_path.write_text(yaml.safe_dump({
+            "protein": {
+                "represented_as": "node",
+                "input_url": [f"slow?resource={i}" for i in range(3)],
+                "input_columns": {"id": "accession"},
+            },
+        }))
+        adapter = {{ cookiecutter.__adapter_class_name }}(
+            self.temp_dir.name,
+            schema_config_path=schema_path,
+            base_url=self.base_url,
+            api_client=ApiClient(),
+        )
+    
+        started = time.perf_counter()
+        nodes = list(adapter.get_nodes())
+        elapsed = time.perf_counter() - started
+    
+        assert [node[0] for node in nodes] == [record["accession"] for record in RECORDS] * 3
+        assert len(self.server.requests) == 9
+        # Three pages in sequence per resource, the resources side by side
+        assert elapsed < 6 * SLOW_DELAY
+        assert adapter._prefetched == {}
+    
+    def test_adapter_skips_api_entries_without_client(self):
+        """Test that entries with an input_url are skipped if no API client is configured."""
+        schema_path = Path(self.temp_dir.name) / "schema_config.yaml"
+        schema_path.write_text(yaml.safe_dump({
+            "protein": {"represented_as": "node", "input_url": f"{self.base_url}/link", "input_columns": {"id": "accession"}},
+        }))
+        adapter = {{ cookiecutter.__adapter_class_name }}(self.temp_dir.name, schema_config_path=schema_path)
+        
+        assert list(adapter.get_nodes()) == []
+        assert self.server.requests == []
+
+
+def test_url_helpers():
+    """Test query parameter and next link handling."""
+    assert set_query_params("http://x/a?q=1&offset=0", {"offset": 20}) == "http://x/a?q=1&offset=20"
+    assert get_next_url('<http://x/a?cursor=2>; rel="next"', {}) == "http://x/a?cursor=2"
+    assert get_next_url(None, {"next": "http://x/b"}) == "http://x/b"
+    assert get_next_url(None, []) is None
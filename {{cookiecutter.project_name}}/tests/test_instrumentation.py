@@ -0,0 +1,82 @@
+"""
+Tests for the pipeline instrumentation.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from {{ cookiecutter.package_name }}.instrumentation import PipelineMetrics, get_peak_rss
+
+
+class TestPipelineMetrics:
+    """Test stage timing, row counts and report output."""
+    
+    def test_instrument_counts_rows_per_label(self):
+        """Test that tuples pass through unchanged and are counted per label."""
+        metrics = PipelineMetrics()
+        nodes = [("P1", "protein", {}), ("P2", "protein", {}), ("G1", "gene", {})]
+        edges = [("P1", "G1", "encoded_by", "encoded_by", {})]
+        
+        assert list(metrics.instrument(iter(nodes), "node", "nodes")) == nodes
+        assert list(metrics.instrument(iter(edges), "edge", "edges")) == edges
+        
+        node_stage, edge_stage = metrics.stages
+        assert node_stage["rows"] == 3
+        assert node_stage["labels"]["protein"]["rows"] == 2
+        assert edge_stage["labels"] == {"encoded_by": edge_stage["labels"]["encoded_by"]}
+        assert node_stage["adapter_s"] >= 0 and node_stage["writer_s"] >= 0
+    
+    def test_write_json_and_prometheus(self):
+        """Test that the JSON report and the Prometheus textfile are written."""
+        metrics = PipelineMetrics()
+        list(metrics.instrument([("P1", "protein", {})], "node", "protein"))
+        metrics.record_properties({"protein": {"rows": 1, "coerced": {"length": 1}, "invalid": {}, "unknown": {}}})
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report_path = metrics.write_json(temp_dir)
+            prom_path = Path(temp_dir) / "metrics" / "pipeline.prom"
+            metrics.write_prometheus(prom_path)
+            
+            report = json.loads(report_path.read_text())
+            prom = prom_path.read_text()
+        
+        assert report["stages"][0]["name"] == "protein"
+        assert 'biocypher_pipeline_rows{stage="protein",kind="node",label="protein"} 1' in prom
+        assert 'component="writer"' in prom
+        assert report["properties"]["protein"]["coerced"] == {"length": 1}
+        assert 'biocypher_pipeline_property_violations{label="protein",property="length",violation="coerced"} 1' in prom
+    
+    def test_adapter_outcomes(self):
+        """Test that adapter outcomes are reported with their row counts."""
+        metrics = PipelineMetrics()
+        list(metrics.instrument([("P1", "protein", {})], "node", "protein", adapter="uniprot"))
+        metrics.record_adapter("uniprot", "done", 1.5)
+        metrics.record_adapter("chembl", "failed", 0.2, error="ValueError: corrupt input")
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            prom_path = Path(temp_dir) / "pipeline.prom"
+            metrics.write_prometheus(prom_path)
+            prom = prom_path.read_text()
+        
+        adapters = metrics.report()["adapters"]
+        assert adapters["uniprot"] == {"status": "done", "seconds": 1.5, "error": None, "rows": 1}
+        assert adapters["chembl"]["rows"] == 0
+        assert 'biocypher_pipeline_adapter_failed{adapter="chembl"} 1' in prom
+    
+    def test_label_values_are_escaped(self):
+        """Test that quotes, backslashes and line feeds in names keep the textfile parseable."""
+        metrics = PipelineMetrics()
+        list(metrics.instrument([("P1", "protein", {})], "node", 'say "hi"\\\n'))
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            prom_path = Path(temp_dir) / "pipeline.prom"
+            metrics.write_prometheus(prom_path)
+            prom = prom_path.read_text()
+        
+        assert 'stage="say \\"hi\\"\\\\\\n"' in prom
+        assert all(line.startswith(("#", "biocypher_pipeline_")) for line in prom.splitlines())
+    
+    def test_get_peak_rss(self):
+        """Test that the peak RSS of this process is reported."""
+        assert get_peak_rss()["self"] > 0
@@ -0,0 +1,184 @@
+"""
+Tests for bulk loading the output into Neo4j.
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.package_name }}.load import (
+    build_import_command,
+    find_import_files,
+    get_import_settings,
+    load_graph,
+    parse_import_summary,
+    shard_import_files,
+)
+
+NEO4J_IMAGE = "neo4j:5.15-community"
+
+IMPORT_OUTPUT = """\
+IMPORT DONE in 1s 618ms.
+Imported:
+  120 nodes
+  40 relationships
+  600 properties
+Peak memory usage: 1.031GiB
+"""
+
+FAKE_NEO4J_ADMIN = f"""\
+#!{sys.executable}
+import json, sys
+from pathlib import Path
+Path(__file__).with_name("arguments.json").write_text(json.dumps(sys.argv[1:]))
+print({IMPORT_OUTPUT!r})
+"""
+
+
+def write_output(directory: Path, proteins: int = 120):
+    """Write BioCypher-style CSV import files for proteins, genes and edges between them."""
+    (directory / "Protein-header.csv").write_text(":ID;name;:LABEL")
+    (directory / "Protein-part000.csv").write_text("".join(f"P{i};'Protein {i}';Protein\n" for i in range(proteins)))
+    (directory / "Gene-header.csv").write_text(":ID;symbol;:LABEL")
+    (directory / "Gene-part000.csv").write_text("G1;'TP53';Gene\n")
+    (directory / "Gene-part001.csv").write_text("G2;'BRCA1';Gene\n")
+    (directory / "Protein_encoded_by_gene-header.csv").write_text(":START_ID;id;confidence:double;:END_ID;:TYPE")
+    (directory / "Protein_encoded_by_gene-part000.csv").write_text("P1;e1;0.9;G1;Protein_encoded_by_gene\n")
+    (directory / "build_manifest.json").write_text("{}")
+
+
+def docker_available() -> bool:
+    if shutil.which("docker") is None:
+        return False
+    return subprocess.run(["docker", "info"], capture_output=True).returncode == 0
+
+
+class TestImportFiles:
+    """Test collecting, sharding and importing the output files."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = Path(self.temp_dir.name) / "output"
+        self.output.mkdir()
+        write_output(self.output)
+        self.settings = get_import_settings({"delimiter": ";", "quote_character": "'", "wipe": True})
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def test_find_import_files(self):
+        """Test that files are grouped per label and classified as nodes or edges by their header."""
+        files = find_import_files(self.output)
+        
+        assert [(group["kind"], group["label"], len(group["parts"])) for group in files] == [
+            ("node", "Gene", 2),
+            ("node", "Protein", 1),
+            ("edge", "Protein_encoded_by_gene", 1),
+        ]
+        assert files[0]["header"] == self.output / "Gene-header.csv"
+    
+    def test_large_parts_are_sharded(self):
+        """Test that large part files are split at line boundaries and small ones are kept."""
+        original = (self.output / "Protein-part000.csv").read_text()
+        
+        files = shard_import_files(find_import_files(self.output), self.output / "staging", shard_size=500)
+        
+        shards = files[1]["parts"]
+        assert len(shards) > 1 and all(path.parent.name == "staging" for path in shards)
+        assert "".join(path.read_text() for path in shards) == original
+        assert all(path.read_text().endswith("\n") for path in shards)
+        assert files[0]["parts"] == [self.output / "Gene-part000.csv", self.output / "Gene-part001.csv"]
+    
+    def test_build_import_command(self):
+        """Test the neo4j-admin call with container paths and tuning flags."""
+        files = find_import_files(self.output)
+        
+        command = build_import_command(files, self.settings, self.output, "/var/lib/neo4j/import", threads=8, high_parallel_io="on")
+        
+        assert command[:6] == ["neo4j-admin", "database", "import", "full", "--threads=8", "--high-parallel-io=on"]
+        assert "--overwrite-destination=true" in command and "--delimiter=;" in command and "--quote='" in command
+        assert "--nodes=/var/lib/neo4j/import/Gene-header.csv,/var/lib/neo4j/import/Gene-part000.csv,/var/lib/neo4j/import/Gene-part001.csv" in command
+        assert command[-2] == "--relationships=/var/lib/neo4j/import/Protein_encoded_by_gene-header.csv,/var/lib/neo4j/import/Protein_encoded_by_gene-part000.csv"
+        assert command[-1] == "neo4j"
+    
+    def test_parse_import_summary(self):
+        """Test reading the imported counts from the neo4j-admin output."""
+        assert parse_import_summary(IMPORT_OUTPUT) == {"nodes": 120, "relationships": 40, "properties": 600}
+        assert parse_import_summary("failed") == {"nodes": None, "relationships": None, "properties": None}
+    
+    def test_load_graph_locally(self):
+        """Test a local load end to end with a stand-in neo4j-admin."""
+        bin_directory = Path(self.temp_dir.name) / "bin"
+        bin_directory.mkdir()
+        script = bin_directory / "neo4j-admin"
+        script.write_text(FAKE_NEO4J_ADMIN)
+        script.chmod(0o755)
+        neo4j_config = {"delimiter": ";", "import_call_bin_prefix": f"{bin_directory}/", "database_name": "kg"}
+        
+        result = load_graph(self.output, neo4j_config, mode="local", threads=2, shard_size=500)
+        
+        arguments = json.loads((bin_directory / "arguments.json").read_text())
+        assert arguments[-1] == "kg" and "--threads=2" in arguments
+        assert any(argument.startswith(f"--nodes={self.output}/Protein-header.csv,") for argument in arguments)
+        assert (result["nodes"], result["relationships"], result["threads"]) == (120, 40, 2)
+        assert result["files"] == 3 + 3 + len(list((self.output / "neo4j-import").iterdir()))  # headers, small parts, shards
+        assert result["rows_per_s"] > 0
+    
+    def test_missing_files(self):
+        """Test that loading an empty output directory fails."""
+        with pytest.raises(ValueError, match="No import files"):
+            load_graph(Path(self.temp_dir.name), {}, mode="local")
+
+
+@pytest.mark.skipif(not docker_available(), reason="needs a local Docker daemon")
+class TestNeo4jContainer:
+    """Test importing into and querying a local Neo4j container."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.output = Path(self.temp_dir.name)
+        os.chmod(self.output, 0o755)
+        write_output(self.output)
+        self.volume = f"biocypher-test-{uuid.uuid4().hex[:8]}"
+        self.container = None
+    
+    def teardown_method(self):
+        if self.container:
+            subprocess.run(["docker", "rm", "-f", self.container], capture_output=True)
+        subprocess.run(["docker", "volume", "rm", "-f", self.volume], capture_output=True)
+        self.temp_dir.cleanup()
+    
+    def test_import_and_query(self):
+        """Test that the loaded graph can be queried once Neo4j starts."""
+        runner = [
+            "docker", "run", "--rm",
+            "-v", f"{self.output}:/var/lib/neo4j/import:ro",
+            "-v", f"{self.volume}:/data",
+            NEO4J_IMAGE,
+        ]
+        neo4j_config = {"delimiter": ";", "quote_character": "'", "wipe": True}
+        
+        result = load_graph(self.output, neo4j_config, runner=runner, file_prefix="/var/lib/neo4j/import", shard_size=500)
+        
+        assert (result["nodes"], result["relationships"]) == (122, 1)
+        self.container = subprocess.run(
+            ["docker", "run", "-d", "-e", "NEO4J_AUTH=none", "-v", f"{self.volume}:/data", NEO4J_IMAGE],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+        query = ["docker", "exec", self.container, "cypher-shell", "--format", "plain", "MATCH (p:Protein)-[r]->(g:Gene) RETURN p.name, g.symbol"]
+        deadline = time.monotonic() + 120
+        while True:
+            answer = subprocess.run(query, capture_output=True, text=True)
+            if answer.returncode == 0 or time.monotonic() > deadline:
+                break
+            time.sleep(2)
+        assert answer.returncode == 0, answer.stderr
+        assert '"Protein 1", "TP53"' in answer.stdout
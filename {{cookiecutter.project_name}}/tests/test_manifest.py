@@ -0,0 +1,76 @@
+"""
+Tests for the incremental build manifest.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from {{ cookiecutter.package_name }}.manifest import MANIFEST_NAME, BuildManifest
+
+
+def make_manifest(root: Path, version: str = "1.0", checksum: bool = False) -> BuildManifest:
+    """Create a manifest for a build in a temporary project directory."""
+    return BuildManifest(root / "output", root / "schema_config.yaml", version, checksum=checksum)
+
+
+def build(manifest: BuildManifest, input_files: dict) -> list[str]:
+    """Simulate a build writing one output file per stale entry."""
+    stale = manifest.get_stale_entries(input_files)
+    manifest.remove_outputs(stale)
+    for name in stale:
+        existing = manifest.list_outputs()
+        manifest.output_directory.mkdir(exist_ok=True)
+        (manifest.output_directory / f"{name}-part000.csv").write_text("data")
+        manifest.record(name, input_files[name], manifest.list_outputs() - existing)
+    manifest.save()
+    return stale
+
+
+class TestBuildManifest:
+    """Test change detection and output bookkeeping."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        (self.root / "schema_config.yaml").write_text("protein: {}\n")
+        self.proteins = self.root / "proteins.csv"
+        self.genes = self.root / "genes.csv"
+        self.proteins.write_text("id\nP1\n")
+        self.genes.write_text("id\nG1\n")
+        self.inputs = {"protein": [self.proteins], "gene": [self.genes]}
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def test_first_build_is_full(self):
+        """Test that everything is stale without a previous manifest."""
+        assert build(make_manifest(self.root), self.inputs) == ["protein", "gene"]
+        assert (self.root / "output" / MANIFEST_NAME).exists()
+    
+    def test_unchanged_inputs_are_skipped(self):
+        """Test that only entries with changed inputs are rebuilt and old outputs kept."""
+        build(make_manifest(self.root), self.inputs)
+        self.genes.write_text("id\nG1\nG2\n")
+        
+        assert build(make_manifest(self.root), self.inputs) == ["gene"]
+        assert build(make_manifest(self.root), self.inputs) == []
+        assert (self.root / "output" / "protein-part000.csv").exists()
+        assert make_manifest(self.root).entries["gene"]["outputs"] == ["gene-part000.csv"]
+    
+    def test_schema_or_version_change_rebuilds_everything(self):
+        """Test that a changed schema or adapter version invalidates all entries."""
+        build(make_manifest(self.root), self.inputs)
+        
+        assert build(make_manifest(self.root, version="2.0"), self.inputs) == ["protein", "gene"]
+        (self.root / "schema_config.yaml").write_text("gene: {}\n")
+        assert build(make_manifest(self.root, version="2.0"), self.inputs) == ["protein", "gene"]
+    
+    def test_checksum_ignores_touched_files(self):
+        """Test that content hashing treats rewritten identical files as unchanged."""
+        build(make_manifest(self.root, checksum=True), self.inputs)
+        self.proteins.write_text("id\nP1\n")
+        os.utime(self.proteins, ns=(0, 0))
+        
+        assert build(make_manifest(self.root, checksum=True), self.inputs) == []
+        assert build(make_manifest(self.root), self.inputs) == ["protein", "gene"]
@@ -0,0 +1,129 @@
+"""
+Tests for the warm cache of the parsed ontology.
+"""
+
+import functools
+import tempfile
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from biocypher import BioCypher
+
+from {{ cookiecutter.package_name }} import ontology as ontology_module
+from {{ cookiecutter.package_name }}.ontology import OntologyCache, attach_ontology
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCHEMA_CONFIG = PROJECT_ROOT / "config" / "schema_config.yaml"
+
+ONTOLOGY = """\
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix ex: <https://example.org/> .
+ex:Entity a owl:Class ; rdfs:label "entity" .
+ex:NamedThing a owl:Class ; rdfs:label "named thing" ; rdfs:subClassOf ex:Entity .
+ex:Protein a owl:Class ; rdfs:label "protein" ; rdfs:subClassOf ex:NamedThing .
+ex:Gene a owl:Class ; rdfs:label "gene" ; rdfs:subClassOf ex:NamedThing .
+ex:OrganismTaxon a owl:Class ; rdfs:label "organism taxon" ; rdfs:subClassOf ex:NamedThing .
+ex:Association a owl:Class ; rdfs:label "association" ; rdfs:subClassOf ex:Entity .
+"""
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """Serves the test directory and counts the requests."""
+    
+    requests = 0
+    
+    def do_GET(self):
+        QuietHandler.requests += 1
+        super().do_GET()
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class TestOntologyCache:
+    """Test building, loading and invalidating the ontology cache."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self.temp_dir.name)
+        self.ontology_file = self.root / "mini.ttl"
+        self.ontology_file.write_text(ONTOLOGY)
+        self.schema = self.root / "schema_config.yaml"
+        self.schema.write_text(SCHEMA_CONFIG.read_text())
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def make_cache(self, url: str | None = None, **kwargs) -> OntologyCache:
+        head = {"url": url or str(self.ontology_file), "root_node": "entity"}
+        return OntologyCache(self.root / "cache", head, schema_config_path=self.schema, **kwargs)
+    
+    def test_build_then_load(self, monkeypatch):
+        """Test that a second run loads the ontology without parsing it."""
+        built = self.make_cache().get()
+        monkeypatch.setattr(ontology_module, "Ontology", None)  # Any attempt to parse would fail now
+        
+        loaded = self.make_cache().get()
+        
+        assert list(loaded.get_ancestors("protein")) == list(built.get_ancestors("protein"))
+        assert "protein_encoded_by_gene" in loaded._nx_graph
+        assert loaded._head_ontology.get_rdf_graph() is None
+        monkeypatch.undo()
+        assert self.make_cache(keep_rdf=True).get()._head_ontology.get_rdf_graph() is not None
+    
+    def test_schema_change_rebuilds(self):
+        """Test that editing the schema configuration invalidates the cache and removes the old entry."""
+        old = self.make_cache()
+        old.get()
+        self.schema.write_text(self.schema.read_text().replace("protein_encoded_by_gene", "protein_to_gene"))
+        
+        new = self.make_cache()
+        
+        assert new.key != old.key and new.load() is None
+        assert "protein_to_gene" in new.get()._nx_graph
+        assert not old.path.exists()
+    
+    def test_unreadable_cache_is_rebuilt(self):
+        """Test that a corrupt cache file is removed and the ontology parsed again."""
+        cache = self.make_cache()
+        cache.directory.mkdir(parents=True)
+        cache.path.write_bytes(b"not a pickle")
+        
+        assert cache.load() is None
+        assert not cache.path.exists()
+        assert "protein" in cache.get()._nx_graph
+    
+    def test_remote_ontology_is_downloaded_once(self):
+        """Test that a remote ontology file is only fetched for the first build."""
+        handler = functools.partial(QuietHandler, directory=str(self.root))
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/mini.ttl"
+        QuietHandler.requests = 0
+        try:
+            self.make_cache(url).get()
+            self.schema.write_text(self.schema.read_text() + "\n# edited\n")
+            self.make_cache(url).get()
+        finally:
+            server.shutdown()
+            server.server_close()
+        
+        assert QuietHandler.requests == 1
+        assert len(list((self.root / "cache" / "ontology").glob("*.pkl"))) == 1
+    
+    def test_from_config_and_attach(self):
+        """Test that BioCypher uses the attached ontology."""
+        config = {
+            "dbms": "neo4j",
+            "cache_directory": str(self.root / "cache"),
+            "head_ontology": {"url": str(self.ontology_file), "root_node": "entity"},
+        }
+        cache = OntologyCache.from_config(config, self.schema)
+        bc = BioCypher(offline=True, schema_config_path=str(self.schema), head_ontology=config["head_ontology"])
+        ontology = cache.get()
+        
+        assert attach_ontology(bc, ontology)
+        assert bc._get_ontology() is ontology
+        assert OntologyCache.from_config({"head_ontology": None}, self.schema) is None
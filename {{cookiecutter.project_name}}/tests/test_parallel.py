@@ -0,0 +1,130 @@
+"""
+Tests for sharded parallel extraction.
+"""
+
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from {{ cookiecutter.package_name }}.adapters.{{ cookiecutter.adapter_name }} import {{ cookiecutter.__adapter_class_name }}
+from {{ cookiecutter.package_name }}.parallel import extract_chunks_parallel, extract_parallel, map_shards, split_byte_ranges
+
+SCHEMA_CONFIG = Path(__file__).parent.parent / "config" / "schema_config.yaml"
+
+
+def write_proteins(path: Path, rows: int):
+    """Write a synthetic protein CSV file."""
+    pd.DataFrame({
+        'accession': [f'P{i:05d}' for i in range(rows)],
+        'name': [f'Protein {i}' for i in range(rows)],
+        'organism': ['Homo sapiens'] * rows,
+    }).to_csv(path, index=False)
+
+
+class TestParallel:
+    """Test byte-range sharding and parallel extraction."""
+    
+    def test_split_byte_ranges_covers_file(self):
+        """Test that byte ranges are line-aligned and cover all data rows."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "proteins.csv"
+            write_proteins(path, 100)
+            content = path.read_bytes()
+            
+            ranges = split_byte_ranges(path, shard_size=200)
+        
+        assert len(ranges) > 1
+        assert ranges[0][1] == content.index(b"\n") + 1
+        assert ranges[-1][2] == len(content)
+        for (_, _, end), (_, start, _) in zip(ranges, ranges[1:]):
+            assert end == start
+            assert content[start - 1:start] == b"\n"
+    
+    def test_sharded_extraction_matches_sequential(self):
+        """Test that byte-range shards yield the same nodes as a whole-file read."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            write_proteins(Path(temp_dir) / "proteins.csv", 100)
+            adapter = {{ cookiecutter.__adapter_class_name }}(temp_dir, schema_config_path=SCHEMA_CONFIG)
+            
+            sequential = list(adapter.get_nodes())
+            sharded = [
+                node
+                for mapping, shard in adapter.get_shards("node", shard_size=200)
+                for node in adapter.get_shard_nodes(mapping, shard)
+            ]
+        
+        assert len(sequential) == 100
+        assert sharded == sequential
+    
+    def test_extract_parallel_preserves_order(self):
+        """Test that the process pool yields tuples in sequential order."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            write_proteins(Path(temp_dir) / "proteins.csv", 100)
+            adapter = {{ cookiecutter.__adapter_class_name }}(temp_dir, schema_config_path=SCHEMA_CONFIG)
+            
+            parallel = list(extract_parallel(adapter, "node", workers=2, shard_size=200))
+            
+            assert parallel == list(adapter.get_nodes())
+    
+    def test_extract_chunks_parallel_streams_chunks(self):
+        """Test that workers hand over a shard chunk by chunk rather than as one list."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            write_proteins(Path(temp_dir) / "proteins.csv", 100)
+            adapter = {{ cookiecutter.__adapter_class_name }}(temp_dir, schema_config_path=SCHEMA_CONFIG, chunk_size=10)
+            tasks = [(mapping, shard, 2) for mapping, shard in adapter.get_shards("node", entries=["protein"])]
+            
+            chunks = []
+            for result in extract_chunks_parallel(adapter, "node", tasks, workers=2):
+                assert not isinstance(result, list)
+                chunks.extend(result)
+        
+        assert [len(chunk) for chunk in chunks] == [10] * 8
+        assert chunks[0][0][0] == "P00020"
+    
+    def test_map_shards_bounds_pending_bytes(self):
+        """Test that tasks are submitted while their total size fits the budget, and big ones alone."""
+        submitted = []
+        
+        def tasks():
+            for size, value in [(4, -1), (4, -2), (4, -3), (20, -4), (1, -5)]:
+                submitted.append(value)
+                yield size, (value,)
+        
+        results = map_shards(abs, tasks(), workers=2, max_pending_bytes=10)
+        
+        assert next(results) == 1
+        assert submitted == [-1, -2, -3]
+        assert list(results) == [2, 3, 4, 5]
+    
+    def test_parquet_shards_by_row_group(self):
+        """Test that a Parquet file is split into shards of whole row groups."""
+        pa = pytest.importorskip("pyarrow")
+        pq = pytest.importorskip("pyarrow.parquet")
+        with tempfile.TemporaryDirectory() as temp_dir:
+            write_proteins(Path(temp_dir) / "proteins.csv", 100)
+            table = pa.Table.from_pandas(pd.read_csv(Path(temp_dir) / "proteins.csv", dtype=str), preserve_index=False)
+            pq.write_table(table, Path(temp_dir) / "proteins.parquet", row_group_size=10)
+            adapter = {{ cookiecutter.__adapter_class_name }}(temp_dir, schema_config_path=SCHEMA_CONFIG)
+            expected = list(adapter.get_nodes(entries=["protein"]))
+            adapter.schema["protein"]["input_file"] = "proteins.parquet"
+            
+            shards = adapter.get_shards("node", shard_size=300, entries=["protein"])
+            parallel = list(extract_parallel(adapter, "node", workers=2, shard_size=300, entries=["protein"]))
+        
+        assert len(shards) > 1
+        assert all(end is not None for _, (_, _, end) in shards)
+        assert parallel == expected
+    
+    def test_glob_input_file_shards_by_file(self):
+        """Test that a glob pattern in input_file yields one shard per file."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for i in range(3):
+                write_proteins(Path(temp_dir) / f"part-{i}.csv", 5)
+            adapter = {{ cookiecutter.__adapter_class_name }}(temp_dir, schema_config_path=SCHEMA_CONFIG)
+            adapter.schema["protein"]["input_file"] = "part-*.csv"
+            
+            shards = adapter.get_shards("node")
+        
+        assert [shard[0].name for _, shard in shards] == ["part-0.csv", "part-1.csv", "part-2.csv"]
@@ -0,0 +1,79 @@
+"""
+Tests for the pipelined background extraction.
+"""
+
+import itertools
+import time
+from functools import partial
+
+import pytest
+
+from {{ cookiecutter.package_name }}.pipeline import BackgroundStage
+
+
+def make_nodes(count: int, delay: float = 0.0, batch: int = 1):
+    """Yield `count` node tuples, sleeping `delay` seconds every `batch` nodes."""
+    for i in range(count):
+        if delay and i % batch == 0:
+            time.sleep(delay)
+        yield (f"P{i}", "protein", {"rank": i})
+
+
+def fail_after(count: int):
+    """Yield `count` nodes, then fail like a corrupt input file."""
+    yield from make_nodes(count)
+    raise ValueError("corrupt input")
+
+
+class TestBackgroundStage:
+    """Test extraction through a bounded queue."""
+    
+    @pytest.mark.parametrize("mode", ["thread", "process"])
+    def test_tuples_arrive_in_order(self, mode):
+        """Test that all tuples are passed on in their original order."""
+        stage = BackgroundStage(partial(make_nodes, 1000), mode=mode, batch_size=64, depth=2)
+        
+        assert list(stage) == list(make_nodes(1000))
+    
+    def test_parsing_and_writing_overlap(self):
+        """Test that the producer works ahead while the consumer is busy."""
+        batches, delay = 8, 0.05
+        stage = BackgroundStage(partial(make_nodes, batches * 10, delay, 10), batch_size=10, depth=4)
+        
+        started = time.perf_counter()
+        for i, _ in enumerate(stage):
+            if i % 10 == 0:
+                time.sleep(delay)  # Writing a batch takes as long as producing it
+        elapsed = time.perf_counter() - started
+        
+        assert elapsed < 0.75 * 2 * batches * delay
+    
+    def test_backpressure(self):
+        """Test that a producer ahead of the consumer blocks once the queue is full."""
+        produced = itertools.count()
+        
+        def produce():
+            for i in produced:
+                yield (f"P{i}", "protein", {})
+        
+        stage = BackgroundStage(produce, batch_size=10, depth=2)
+        iterator = iter(stage)
+        next(iterator)
+        time.sleep(0.2)
+        
+        # Two batches queued, one being consumed and one waiting to be put
+        assert next(produced) <= 4 * 10 + 1
+        iterator.close()
+    
+    def test_errors_are_raised_in_the_consumer(self):
+        """Test that extraction errors surface where the tuples are consumed."""
+        with pytest.raises(ValueError, match="corrupt input"):
+            list(BackgroundStage(partial(fail_after, 25), batch_size=10))
+        
+        with pytest.raises(RuntimeError, match="corrupt input"):
+            list(BackgroundStage(partial(fail_after, 25), mode="process", batch_size=10))
+    
+    def test_unknown_mode(self):
+        """Test that an unknown mode is rejected."""
+        with pytest.raises(ValueError):
+            BackgroundStage(partial(make_nodes, 1), mode="fiber")
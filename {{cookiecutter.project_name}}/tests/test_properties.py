@@ -0,0 +1,118 @@
+"""
+Tests for property type validation.
+"""
+
+import numpy as np
+import pandas as pd
+
+from {{ cookiecutter.package_name }}.columnar import ColumnarBatch
+from {{ cookiecutter.package_name }}.properties import PropertyValidator, compile_property_types
+
+SCHEMA = {
+    "protein": {
+        "represented_as": "node",
+        "input_label": "uniprot_protein",
+        "properties": {"name": "str", "length": "int", "mass": "float", "reviewed": "bool", "synonyms": "str[]"},
+    },
+    "gene": {"represented_as": "node", "input_label": ["gene", "hgnc_gene"], "properties": {"start": "integer"}},
+    "pathway": {"represented_as": "node"},
+}
+
+
+class TestCompilePropertyTypes:
+    """Test compiling the schema into property types per label."""
+    
+    def test_types_per_input_label(self):
+        """Test that every input label gets the declared types and arrays are not checked."""
+        types = compile_property_types(SCHEMA)
+    
+        assert set(types) == {"uniprot_protein", "gene", "hgnc_gene"}
+        assert types["uniprot_protein"]["length"] == "int"
+        assert types["uniprot_protein"]["synonyms"] is None
+        assert types["hgnc_gene"] == {"start": "integer"}
+
+
+class TestPropertyValidator:
+    """Test checking and coercing the properties of tuples and columnar batches."""
+    
+    def test_valid_tuples_are_untouched(self):
+        """Test that tuples of the declared types pass unchanged, integers counting as floats."""
+        validator = PropertyValidator(SCHEMA)
+        nodes = [("P1", "uniprot_protein", {"name": "A", "length": 10, "mass": 5, "reviewed": True}), ("P2", "uniprot_protein", {})]
+        expected = [(node_id, label, dict(properties)) for node_id, label, properties in nodes]
+    
+        assert validator.validate(nodes, "node") == expected
+        assert validator.report() == {"uniprot_protein": {"rows": 2, "coerced": {}, "invalid": {}, "unknown": {}}}
+    
+    def test_mismatched_values_are_coerced_or_dropped(self):
+        """Test that values of other types are converted and those that cannot be are removed."""
+        validator = PropertyValidator(SCHEMA)
+        nodes = [
+            ("P1", "uniprot_protein", {"length": "10", "reviewed": "yes", "name": 7}),
+            ("P2", "uniprot_protein", {"length": "ten", "reviewed": False, "mass": "1.5"}),
+            ("P3", "uniprot_protein", {"length": 2.5, "color": "red"}),
+            ("G1", "hgnc_gene", {"start": np.int64(5)}),
+        ]
+    
+        validator.validate(nodes, "node")
+        report = validator.report()
+    
+        assert [properties for _, _, properties in nodes] == [
+            {"length": 10, "reviewed": True, "name": "7"},
+            {"reviewed": False, "mass": 1.5},
+            {"color": "red"},
+            {"start": 5},
+        ]
+        assert type(nodes[3][2]["start"]) is int
+        assert report["uniprot_protein"]["coerced"] == {"length": 1, "reviewed": 1, "name": 1, "mass": 1}
+        assert report["uniprot_protein"]["invalid"] == {"length": 2}
+        assert report["uniprot_protein"]["unknown"] == {"color": 1}
+        assert report["hgnc_gene"]["coerced"] == {"start": 1}
+    
+    def test_validate_stream(self):
+        """Test that a stream is validated block by block and keeps its order."""
+        validator = PropertyValidator(SCHEMA, block_size=3)
+        edges = [(f"P{i}", f"G{i}", "unknown_edge", "unknown_edge", {"score": i}) for i in range(7)]
+        nodes = [("G1", "gene", {"start": "1"}), ("P1", "uniprot_protein", {"length": "2"})]
+    
+        assert list(validator.validate_stream(iter(edges), "edge")) == edges
+        assert [properties for _, _, properties in validator.validate_stream(nodes, "node")] == [{"start": 1}, {"length": 2}]
+        assert validator.report()["unknown_edge"]["rows"] == 7
+    
+    def test_columnar_batches(self):
+        """Test that columns of other dtypes are coerced and their null masks updated."""
+        validator = PropertyValidator(SCHEMA)
+        batch = ColumnarBatch(
+            "node",
+            "uniprot_protein",
+            {"id": np.array(["P1", "P2", "P3"], dtype=object)},
+            {
+                "length": np.array(["1", "x", None], dtype=object),
+                "mass": np.array([1.0, 2.0, 3.0]),
+                "color": np.array(["red", "blue", None], dtype=object),
+            },
+            {"length": np.array([False, False, True]), "color": np.array([False, False, True])},
+            SCHEMA["protein"]["properties"],
+        )
+    
+        validator.validate(batch, "node")
+        report = validator.report()["uniprot_protein"]
+    
+        assert batch.properties["length"].dtype == np.int64
+        assert batch.nulls["length"].tolist() == [False, True, True]
+        assert [properties for _, _, properties in batch] == [
+            {"length": 1, "mass": 1.0, "color": "red"},
+            {"mass": 2.0, "color": "blue"},
+            {"mass": 3.0},
+        ]
+        assert (report["coerced"], report["invalid"], report["unknown"]) == ({"length": 1}, {"length": 1}, {"color": 2})
+    
+    def test_cast_columns_pass(self):
+        """Test that columns cast by `convert` need no coercion."""
+        validator = PropertyValidator(SCHEMA)
+        mapping = {"label": "uniprot_protein", "columns": {"id": "id"}, "properties": {"length": "length", "reviewed": "reviewed"}, "types": SCHEMA["protein"]["properties"]}
+        chunk = pd.DataFrame({"id": ["P1", "P2"], "length": ["3", None], "reviewed": ["true", "0"]})
+    
+        validator.validate(ColumnarBatch.from_dataframe(chunk, mapping, "node"), "node")
+    
+        assert validator.report()["uniprot_protein"]["coerced"] == {}
@@ -0,0 +1,66 @@
+"""
+Tests for the input format helpers.
+"""
+
+import gzip
+import io
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.package_name }}.readers import PrefetchReader, get_delimiter, get_format, open_input, read_columns
+
+
+class FailingStream(io.RawIOBase):
+    """Stream that returns one block and then fails, like a corrupt archive."""
+    
+    def __init__(self):
+        self.blocks = [b"a,b\n1,2\n"]
+        self.closed_by_reader = False
+    
+    def read(self, size=-1):
+        if self.blocks:
+            return self.blocks.pop()
+        raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+    
+    def close(self):
+        self.closed_by_reader = True
+
+
+class TestReaders:
+    """Test format detection and compressed input."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def test_format_ignores_compression_suffix(self):
+        """Test that compressed files are detected by their inner suffix."""
+        assert get_format("proteins.csv.gz") == "csv"
+        assert get_format("proteins.parquet") == "parquet"
+        assert get_delimiter("genes.tsv.zst") == "\t"
+        assert get_delimiter("genes.csv.bz2") == ","
+    
+    def test_open_input_decompresses(self):
+        """Test that gzip input is decompressed while reading."""
+        path = Path(self.temp_dir.name) / "genes.tsv.gz"
+        content = b"gene_id\tname\n" + b"".join(b"G%d\tgene %d\n" % (i, i) for i in range(100_000))
+        path.write_bytes(gzip.compress(content))
+        
+        with open_input(path) as f:
+            assert f.read() == content
+        assert read_columns(path) == ["gene_id", "name"]
+    
+    def test_prefetch_reader_raises_stream_errors(self):
+        """Test that errors of the background thread surface in the reader."""
+        stream = FailingStream()
+        reader = io.BufferedReader(PrefetchReader(stream))
+        
+        assert reader.readline() == b"a,b\n"
+        with pytest.raises(EOFError):
+            reader.read()
+        reader.close()
+        assert stream.closed_by_reader
@@ -0,0 +1,164 @@
+"""
+Tests for the adapter registry and the parallel execution of adapters.
+"""
+
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+import yaml
+
+from {{ cookiecutter.package_name }}.registry import (
+    create_adapter,
+    load_adapter_registry,
+    read_spill,
+    run_adapters,
+    write_spill,
+)
+
+SCHEMA = {
+    "protein": {"represented_as": "node", "input_columns": {"id": "accession"}},
+    "gene": {"represented_as": "node", "input_columns": {"id": "gene_id"}},
+    "encoded_by": {"represented_as": "edge", "input_columns": {"source": "accession", "target": "gene_id"}},
+    "unmapped": {"represented_as": "node"},
+}
+
+
+class StandInAdapter:
+    """Adapter whose behaviour is chosen by its data source: ok, broken, crash or slow."""
+
+    def __init__(self, data_source: str, size: int = 3, **kwargs):
+        self.data_source = data_source
+        self.size = size
+        self.config = kwargs
+
+    def get_nodes(self, entries=None):
+        if self.data_source == "broken":
+            yield ("N0", entries[0], {})
+            raise ValueError("corrupt input")
+        if self.data_source == "crash":
+            os._exit(3)
+        if self.data_source == "slow":
+            time.sleep(30)
+        for i in range(self.size):
+            yield (f"{self.data_source}-{i}", entries[0], {})
+
+    def get_edges(self, entries=None):
+        yield (f"{self.data_source}-0", f"{self.data_source}-1", entries[0], entries[0], {})
+
+
+def extract(adapter, kind: str, entries: list[str]):
+    return adapter.get_nodes(entries) if kind == "node" else adapter.get_edges(entries)
+
+
+def make_spec(name: str, data_source: str, timeout: float | None = None) -> dict:
+    return {
+        "name": name,
+        "class": f"{__name__}.StandInAdapter",
+        "data_source": data_source,
+        "options": {},
+        "timeout": timeout,
+        "entries": None,
+    }
+
+
+class TestAdapterRegistry:
+    """Test loading the registry and assigning schema entries."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.temp_dir.name) / "adapters.yaml"
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def load(self, adapters: dict) -> list[dict]:
+        self.path.write_text(yaml.safe_dump({"adapters": adapters}, sort_keys=False))
+        return load_adapter_registry(self.path, SCHEMA)
+
+    def test_entries_are_assigned(self):
+        """Test that an adapter without entries takes all entries not claimed by others."""
+        specs = self.load({
+            "main": {"class": "x.Main", "data_source": "data/main"},
+            "genes": {"class": "x.Genes", "data_source": "data/genes", "entries": ["gene"], "timeout": 60},
+            "old": {"class": "x.Old", "data_source": "data/old", "enabled": False},
+        })
+    
+        assert [spec["name"] for spec in specs] == ["main", "genes"]
+        assert specs[0]["entries"] == ["protein", "encoded_by"]
+        assert specs[1]["entries"] == ["gene"]
+        assert specs[1]["timeout"] == 60
+
+    def test_entries_may_be_shared(self):
+        """Test that several adapters may extract the same schema entry."""
+        specs = self.load({
+            "main": {"class": "x.Main", "data_source": "data/main"},
+            "uniprot": {"class": "x.Uniprot", "data_source": "data/uniprot", "entries": ["protein"]},
+            "ensembl": {"class": "x.Ensembl", "data_source": "data/ensembl", "entries": ["protein", "gene"]},
+        })
+    
+        assert [spec["entries"] for spec in specs] == [["encoded_by"], ["protein"], ["protein", "gene"]]
+
+    @pytest.mark.parametrize("adapters, message", [
+        ({"a": {"class": "x.A", "data_source": "a", "entries": ["missing"]}}, "unknown schema entry"),
+        ({"a": {"class": "x.A", "data_source": "a"}, "b": {"class": "x.B", "data_source": "b"}}, "Only one adapter"),
+        ({"a": {"class": "x.A"}}, "missing \\['data_source'\\]"),
+    ])
+    def test_invalid_registries(self, adapters, message):
+        """Test that unknown and incomplete adapter entries are rejected."""
+        with pytest.raises(ValueError, match=message):
+            self.load(adapters)
+
+    def test_create_adapter(self):
+        """Test that adapters are built from their class path with common and own options."""
+        spec = dict(make_spec("a", "data/a"), options={"size": 5})
+    
+        adapter = create_adapter(spec, size=1, schema_config_path="schema.yaml")
+    
+        assert isinstance(adapter, StandInAdapter)
+        assert (adapter.data_source, adapter.size) == ("data/a", 5)
+        assert adapter.config == {"schema_config_path": "schema.yaml"}
+
+
+class TestRunAdapters:
+    """Test parallel adapter execution with failure isolation."""
+
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+
+    def test_spill_round_trip(self):
+        """Test that spilled tuples are read back in order."""
+        path = Path(self.temp_dir.name) / "spill.pkl"
+        nodes = [(f"P{i}", "protein", {"rank": i}) for i in range(25_000)]
+    
+        assert write_spill(iter(nodes), path) == len(nodes)
+        assert list(read_spill(path)) == nodes
+
+    def test_failures_are_isolated(self):
+        """Test that failing, crashing and timed out adapters do not affect the others."""
+        stages = [("node", "protein"), ("edge", "encoded_by")]
+        jobs = [
+            (make_spec("ok", "ok"), {}, stages),
+            (make_spec("broken", "broken"), {}, stages),
+            (make_spec("crash", "crash"), {}, stages),
+            (make_spec("slow", "slow", timeout=0.5), {}, stages),
+        ]
+        started = time.perf_counter()
+    
+        messages = list(run_adapters(jobs, extract, workers=4, directory=self.temp_dir.name))
+    
+        assert time.perf_counter() - started < 10
+        outcomes = {name: payload for status, name, payload in messages if status != "stage"}
+        assert outcomes["ok"][1] is None
+        assert "ValueError: corrupt input" in outcomes["broken"][1]
+        assert "exited with code 3" in outcomes["crash"][1]
+        assert "Timed out" in outcomes["slow"][1]
+    
+        written = [payload for status, name, payload in messages if status == "stage"]
+        assert [(kind, name, rows) for kind, name, _, rows, _ in written] == [("node", "protein", 3), ("edge", "encoded_by", 1)]
+        assert list(read_spill(written[0][2])) == [(f"ok-{i}", "protein", {}) for i in range(3)]
@@ -0,0 +1,187 @@
+"""
+Tests for node samples and schema coverage.
+"""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from {{ cookiecutter.package_name }}.adapters.{{ cookiecutter.adapter_name }} import {{ cookiecutter.__adapter_class_name }}
+from {{ cookiecutter.package_name }}.sample import NodeSample, SchemaCoverage, hash_id_column
+from {{ cookiecutter.package_name }}.schema import load_schema_config
+
+PROJECT_ROOT = Path(__file__).parent.parent
+SCHEMA_CONFIG = PROJECT_ROOT / "config" / "schema_config.yaml"
+EXAMPLE_DATA = PROJECT_ROOT / "data" / "example"
+
+SCHEMA = {
+    "protein": {
+        "represented_as": "node",
+        "input_columns": {"id": "accession"},
+        "properties": {"name": "str", "organism": "str"},
+    },
+    "protein interacts with protein": {
+        "represented_as": "edge",
+        "input_columns": {"source": "source", "target": "target"},
+        "properties": {"score": "float"},
+    },
+    "gene": {"represented_as": "node"},
+}
+
+
+class TestNodeSample:
+    """Test drawing hash-stable node samples."""
+    
+    def test_hashes_are_stable(self):
+        """Test that IDs hash the same regardless of their type."""
+        assert hash_id_column(["1", "P1"]).tolist() == hash_id_column(np.array([1, "P1"], dtype=object)).tolist()
+        assert hash_id_column(["P1"]).dtype == np.uint64
+    
+    def test_fraction(self):
+        """Test that a fraction samples about that share of the nodes and their edges, without a pass over the IDs."""
+        ids = [f"P{i}" for i in range(10_000)]
+        sample = NodeSample(fraction=0.1)
+        sample.add_ids("protein", ids)
+        sample.add_edges("protein interacts with protein", ids, ids[::-1])
+    
+        mask = sample.node_mask("protein", ids)
+        sampled = {node for node, keep in zip(ids, mask) if keep}
+        edges = sample.edge_mask(ids)
+    
+        assert 800 < len(sampled) < 1200
+        assert mask.tolist() == NodeSample(fraction=0.1).node_mask("other", ids).tolist()
+        assert edges.tolist() == mask.tolist()
+        assert sample.rows == {}
+        assert NodeSample(fraction=1).node_mask("protein", ids).all()
+    
+    def test_size(self):
+        """Test that a fixed size samples that many nodes per entry, independent of input order."""
+        ids = [f"P{i}" for i in range(1_000)]
+        sample = NodeSample(size=50)
+        for start in range(0, len(ids), 300):
+            sample.add_ids("protein", ids[start:start + 300])
+        sample.add_ids("gene", ["G1", "G2"])
+        sample.finalize()
+        shuffled = NodeSample(size=50)
+        shuffled.add_ids("protein", ids[::-1])
+        shuffled.finalize()
+    
+        mask = sample.node_mask("protein", ids)
+    
+        assert mask.sum() == 50
+        assert mask.tolist() == shuffled.node_mask("protein", ids).tolist()
+        assert sample.node_mask("gene", ["G1", "G2"]).all()
+        assert not sample.node_mask("unknown", ids).any()
+        assert sample.edge_mask(["G1", "G3"]).tolist() == [True, False]
+        assert sample.rows["protein"] == 1_000
+    
+    def test_invalid_arguments(self):
+        """Test that exactly one of a valid fraction or size is required."""
+        for arguments in [{}, {"fraction": 0.1, "size": 5}, {"fraction": 0}, {"fraction": 1.5}, {"size": 0}]:
+            with pytest.raises(ValueError):
+                NodeSample(**arguments)
+
+
+class TestSampledAdapter:
+    """Test extracting a sample with the adapter."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        root = Path(self.temp_dir.name)
+        (root / "proteins.csv").write_text(
+            "accession,name,organism\n" + "".join(f"P{i},Protein {i},Homo sapiens\n" for i in range(200))
+        )
+        (root / "protein_gene.csv").write_text(
+            "protein_id,gene_id,confidence\n" + "".join(f"P{i},G{i % 20},0.5\n" for i in range(200))
+        )
+        (root / "genes.csv").write_text(
+            "gene_id,symbol,start_position\n" + "".join(f"G{i},S{i},{i}\n" for i in range(20))
+        )
+        self.root = root
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    @staticmethod
+    def draw(adapter, sample):
+        """Draw a sample from all node IDs and edge endpoints, as `KnowledgeGraphBuild` does."""
+        for name, ids in adapter.get_node_ids():
+            sample.add_ids(name, ids)
+        sample.finalize()
+        for name, sources, targets in adapter.get_edge_ids():
+            sample.add_edges(name, sources, targets)
+    
+    def test_sampled_nodes_and_edges(self):
+        """Test that the sampled nodes, their edges and the edge targets are extracted."""
+        sample = NodeSample(size=10)
+        adapter = {{ cookiecutter.__adapter_class_name }}(self.root, chunk_size=50, sample=sample)
+        self.draw(adapter, sample)
+    
+        nodes = {node[0] for node in adapter.get_nodes()}
+        proteins = {node[0] for node in adapter.get_nodes(["protein"])}
+        edges = list(adapter.get_edges())
+    
+        assert len(proteins) == 10
+        assert {source for source, *_ in edges} == proteins
+        assert all(target in nodes for _, target, *_ in edges)
+        assert list(adapter.get_node_batches())
+    
+    def test_example_data_keeps_edges(self):
+        """Test that a sample of one node per entry of the example data still writes edges."""
+        schema = load_schema_config(SCHEMA_CONFIG)
+        sample = NodeSample(size=1)
+        adapter = {{ cookiecutter.__adapter_class_name }}(EXAMPLE_DATA, schema_config_path=SCHEMA_CONFIG, sample=sample)
+        self.draw(adapter, sample)
+        coverage = SchemaCoverage(schema, sample.rows)
+    
+        nodes = {node[0] for node in adapter.get_nodes()}
+        edges = list(coverage.track(adapter.get_edges(), "protein_encoded_by_gene"))
+        report = coverage.report()
+    
+        assert edges
+        assert all(source in nodes and target in nodes for source, target, *_ in edges)
+        assert report["entries"]["protein_encoded_by_gene"]["rows"] == len(edges)
+        assert "protein_encoded_by_gene" not in report["unpopulated_entries"]
+    
+    def test_fraction_counts_rows_while_reading(self):
+        """Test that a fraction is applied to the rows as they are read and counts them for the coverage report."""
+        sample = NodeSample(fraction=0.2)
+        adapter = {{ cookiecutter.__adapter_class_name }}(self.root, chunk_size=50, sample=sample)
+    
+        proteins = [node[0] for node in adapter.get_nodes(["protein"])]
+        edges = list(adapter.get_edges())
+    
+        assert proteins == [f"P{i}" for i in range(200) if sample.node_mask("protein", [f"P{i}"])[0]]
+        assert 0 < len(proteins) < 100
+        assert {source for source, *_ in edges} <= set(proteins)
+        assert sample.rows == {"protein": 200, "protein_encoded_by_gene": 200}
+
+
+class TestSchemaCoverage:
+    """Test the schema coverage report."""
+    
+    def test_report(self):
+        """Test that rows and set properties are counted per schema entry."""
+        coverage = SchemaCoverage(SCHEMA)
+        nodes = [("P1", "protein", {"name": "A"}), ("P2", "protein", {"name": "B"}), ("P3", "protein", {})]
+    
+        assert list(coverage.track(iter(nodes), "protein")) == nodes
+        report = coverage.report()
+    
+        assert report["entries"]["protein"]["rows"] == 3
+        assert report["entries"]["protein"]["properties"] == {"name": 0.6667, "organism": 0.0}
+        assert report["unpopulated_entries"] == ["protein interacts with protein"]
+        assert report["filtered_entries"] == []
+        assert report["unpopulated_properties"] == {"protein": ["organism"]}
+        assert report["without_input"] == ["gene"]
+    
+    def test_filtered_entries(self):
+        """Test that entries with input rows but none in the sample are reported as filtered out."""
+        coverage = SchemaCoverage(SCHEMA, {"protein interacts with protein": 5})
+    
+        report = coverage.report()
+    
+        assert report["unpopulated_entries"] == ["protein"]
+        assert report["filtered_entries"] == ["protein interacts with protein"]
@@ -0,0 +1,68 @@
+"""
+Tests for the streaming edge endpoint validation.
+"""
+
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from {{ cookiecutter.package_name }}.validation import NodeIdIndex
+
+NODES = [("P1", "protein", {}), ("P2", "protein", {}), ("G1", "gene", {})]
+EDGES = [
+    ("P1", "G1", "encoded_by", "encoded_by", {}),
+    ("P2", "G2", "encoded_by", "encoded_by", {}),
+    ("P3", "G1", "encoded_by", "encoded_by", {}),
+]
+
+
+class TestNodeIdIndex:
+    """Test node ID tracking and edge checks."""
+    
+    def setup_method(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.directory = Path(self.temp_dir.name) / "node_ids"
+    
+    def teardown_method(self):
+        self.temp_dir.cleanup()
+    
+    def make_index(self) -> NodeIdIndex:
+        index = NodeIdIndex(self.directory, batch_size=2)
+        assert list(index.track(iter(NODES[:2]), "protein")) == NODES[:2]
+        assert list(index.track(iter(NODES[2:]), "gene")) == NODES[2:]
+        assert index.finalize(["protein", "gene"]) == 3
+        return index
+    
+    def test_drop_dangling_edges(self):
+        """Test that edges with an unknown endpoint are dropped and reported."""
+        index = self.make_index()
+        report = Path(self.temp_dir.name) / "logs" / "dangling.tsv"
+        
+        edges = list(index.check_edges(iter(EDGES), drop=True, report_path=report))
+        
+        assert edges == EDGES[:1]
+        assert index.dangling == 2
+        assert report.read_text().splitlines() == ["P2\tG2\tencoded_by", "P3\tG1\tencoded_by"]
+    
+    def test_report_only_keeps_edges(self):
+        """Test that report mode passes all edges on."""
+        index = self.make_index()
+        
+        assert list(index.check_edges(iter(EDGES), drop=False)) == EDGES
+        assert index.dangling == 2
+    
+    def test_ids_persist_across_runs(self):
+        """Test that a new index reuses the ID files of skipped entries."""
+        self.make_index()
+        
+        index = NodeIdIndex(self.directory)
+        assert index.has_entry("gene")
+        index.finalize(["protein", "gene"])
+        
+        assert index.contains(["P1", "G1", "X"]).tolist() == [True, True, False]
+    
+    def test_contains_requires_finalize(self):
+        """Test that lookups before finalize fail loudly."""
+        with pytest.raises(RuntimeError):
+            NodeIdIndex(self.directory).contains(["P1"])
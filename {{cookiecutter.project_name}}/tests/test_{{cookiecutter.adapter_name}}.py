@@ -1,21 +1,26 @@
 """
-Tests for PLACEHOLDER_ADAPTER_CLASS_NAME.
+Tests for {{ cookiecutter.__adapter_class_name }}.
 """
 
+import gzip
 import pytest
 from pathlib import Path
 import tempfile
 import pandas as pd
 
-from {{ cookiecutter.package_name }}.adapters.{{ cookiecutter.adapter_name }} import PLACEHOLDER_ADAPTER_CLASS_NAME
+from {{ cookiecutter.package_name }}.adapters.{{ cookiecutter.adapter_name }} import {{ cookiecutter.__adapter_class_name }}
 
+PROJECT_ROOT = Path(__file__).parent.parent
+SCHEMA_CONFIG = PROJECT_ROOT / "config" / "schema_config.yaml"
+EXAMPLE_DATA = PROJECT_ROOT / "data" / "example"
 
-class TestPLACEHOLDER_ADAPTER_CLASS_NAME:
-    """Test the PLACEHOLDER_ADAPTER_CLASS_NAME."""
+
+class Test{{ cookiecutter.__adapter_class_name }}:
+    """Test the {{ cookiecutter.__adapter_class_name }}."""
     
     def test_adapter_initialization(self):
         """Test that the adapter initializes correctly."""
-        adapter = PLACEHOLDER_ADAPTER_CLASS_NAME("test_data_source.csv")
+        adapter = {{ cookiecutter.__adapter_class_name }}("test_data_source.csv")
         
         assert adapter.data_source == "test_data_source.csv"
         assert adapter.config == {}
@@ -23,50 +28,59 @@ class TestPLACEHOLDER_ADAPTER_CLASS_NAME:
     def test_adapter_initialization_with_config(self):
         """Test that the adapter initializes with additional config."""
         config = {"param1": "value1", "param2": "value2"}
-        adapter = PLACEHOLDER_ADAPTER_CLASS_NAME("test_data_source.csv", **config)
+        adapter = {{ cookiecutter.__adapter_class_name }}("test_data_source.csv", **config)
         
         assert adapter.data_source == "test_data_source.csv"
         assert adapter.config == config
     
     def test_get_metadata(self):
         """Test that metadata is returned correctly."""
-        adapter = PLACEHOLDER_ADAPTER_CLASS_NAME("test_data_source.csv")
+        adapter = {{ cookiecutter.__adapter_class_name }}("test_data_source.csv")
         metadata = adapter.get_metadata()
         
-        assert metadata["name"] == "PLACEHOLDER_ADAPTER_CLASS_NAME"
+        assert metadata["name"] == "{{ cookiecutter.__adapter_class_name }}"
         assert metadata["data_source"] == "test_data_source.csv"
         assert metadata["data_type"] == "csv"
         assert metadata["version"] == "{{ cookiecutter.version }}"
-        assert metadata["adapter_class"] == "PLACEHOLDER_ADAPTER_CLASS_NAME"
+        assert metadata["adapter_class"] == "{{ cookiecutter.__adapter_class_name }}"
     
     def test_get_nodes_with_csv_file(self):
-        """Test node extraction from CSV file."""
-        # Create a temporary CSV file
+        """Test node extraction from the example CSV files."""
+        adapter = {{ cookiecutter.__adapter_class_name }}(EXAMPLE_DATA, schema_config_path=SCHEMA_CONFIG)
+        nodes = list(adapter.get_nodes())
+        
+        # Check that nodes are tuples with 3 elements (node_id, node_label, properties_dict)
+        assert len(nodes) == 4
+        assert isinstance(nodes[0], tuple)
+        assert len(nodes[0]) == 3
+        node_id, node_label, properties = nodes[0]
+        assert node_id == "P12345"
+        assert node_label == "protein"
+        assert properties["name"] == "Insulin"
+        assert properties["organism"] == "Homo sapiens"
+        
+        genes = {node[0]: node[2] for node in nodes if node[1] == "gene"}
+        assert genes["ENSG00000129965"]["chromosome"] == "11"
+        assert genes["ENSG00000129965"]["start_position"] == 2157796
+    
+    def test_get_nodes_in_chunks(self):
+        """Test that chunked reading yields the same nodes and drops empty properties."""
         test_data = pd.DataFrame({
-            'id': ['1', '2', '3'],
-            'name': ['Protein A', 'Gene B', 'Compound C'],
-            'type': ['protein', 'gene', 'compound']
+            'accession': ['P1', 'P2', 'P3'],
+            'name': ['Protein A', None, 'Protein C'],
+            'organism': ['Homo sapiens'] * 3,
+            'unused': ['x', 'y', 'z'],
         })
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            test_data.to_csv(f, index=False)
-            temp_file = f.name
-        
-        try:
-            adapter = PLACEHOLDER_ADAPTER_CLASS_NAME(temp_file)
-            nodes = list(adapter.get_nodes())
+        with tempfile.TemporaryDirectory() as temp_dir:
+            test_data.to_csv(Path(temp_dir) / "proteins.csv", index=False)
             
-            # Adapter now returns dummy data, not CSV data
-            # Check that nodes are tuples with 3 elements (node_id, node_label, properties_dict)
-            assert len(nodes) > 0
-            assert isinstance(nodes[0], tuple)
-            assert len(nodes[0]) == 3
-            node_id, node_label, properties = nodes[0]
-            assert isinstance(node_id, str)
-            assert isinstance(node_label, str)
-            assert isinstance(properties, dict)
-        finally:
-            Path(temp_file).unlink()
+            adapter = {{ cookiecutter.__adapter_class_name }}(temp_dir, schema_config_path=SCHEMA_CONFIG, chunk_size=1)
+            nodes = list(adapter.get_nodes())
+        
+        assert [node[0] for node in nodes] == ['P1', 'P2', 'P3']
+        assert nodes[0][2] == {'name': 'Protein A', 'organism': 'Homo sapiens'}
+        assert nodes[1][2] == {'organism': 'Homo sapiens'}
     
     def test_validate_data_source_with_existing_csv(self):
         """Test data source validation with existing CSV file."""
@@ -78,30 +92,120 @@ class TestPLACEHOLDER_ADAPTER_CLASS_NAME:
             temp_file = f.name
         
         try:
-            adapter = PLACEHOLDER_ADAPTER_CLASS_NAME(temp_file)
+            adapter = {{ cookiecutter.__adapter_class_name }}(temp_file)
             assert adapter.validate_data_source() is True
         finally:
             Path(temp_file).unlink()
     
     def test_validate_data_source_with_nonexistent_file(self):
         """Test data source validation with non-existent file."""
-        adapter = PLACEHOLDER_ADAPTER_CLASS_NAME("nonexistent_file.csv")
+        adapter = {{ cookiecutter.__adapter_class_name }}("nonexistent_file.csv")
         assert adapter.validate_data_source() is False
     
-    def test_get_edges_empty(self):
-        """Test that edges are returned."""
-        adapter = PLACEHOLDER_ADAPTER_CLASS_NAME("test_data_source.csv")
+    def test_get_edges_with_csv_file(self):
+        """Test edge extraction from the example CSV files."""
+        adapter = {{ cookiecutter.__adapter_class_name }}(EXAMPLE_DATA, schema_config_path=SCHEMA_CONFIG)
         edges = list(adapter.get_edges())
         
-        # Adapter now returns dummy edges
         # Check that edges are tuples with 5 elements (source_id, target_id, edge_label, edge_type, properties_dict)
         assert isinstance(edges, list)
-        assert len(edges) > 0
+        assert len(edges) == 2
         assert isinstance(edges[0], tuple)
         assert len(edges[0]) == 5
         source_id, target_id, edge_label, edge_type, properties = edges[0]
-        assert isinstance(source_id, str)
-        assert isinstance(target_id, str)
-        assert isinstance(edge_label, str)
-        assert isinstance(edge_type, str)
-        assert isinstance(properties, dict)
+        assert source_id == "P12345"
+        assert target_id == "ENSG00000129965"
+        assert edge_label == "encoded_by"
+        assert edge_type == "encoded_by"
+        assert properties == {"confidence": 0.95, "evidence": "experimental"}
+    
+    def test_missing_input_file_is_skipped(self):
+        """Test that schema entries without an input file yield nothing."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            adapter = {{ cookiecutter.__adapter_class_name }}(temp_dir, schema_config_path=SCHEMA_CONFIG)
+            assert list(adapter.get_nodes()) == []
+            assert list(adapter.get_edges()) == []
+    
+    def test_get_nodes_from_parquet_with_filters(self):
+        """Test Parquet input with column projection and a pushed-down filter."""
+        pytest.importorskip("pyarrow")
+        test_data = pd.DataFrame({
+            'accession': ['P1', 'P2', 'P3'],
+            'name': ['Protein A', 'Protein B', 'Protein C'],
+            'organism': ['Homo sapiens', 'Mus musculus', 'Homo sapiens'],
+            'unused': [1, 2, 3],
+        })
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            test_data.to_parquet(Path(temp_dir) / "proteins.parquet", index=False)
+            adapter = {{ cookiecutter.__adapter_class_name }}(
+                temp_dir,
+                schema_config_path=SCHEMA_CONFIG,
+                filters={"protein": {"organism": "Homo sapiens"}},
+            )
+            adapter.schema["protein"]["input_file"] = "proteins.parquet"
+            nodes = list(adapter.get_nodes())
+            
+            assert adapter.get_metadata()["data_type"] == "csv,parquet"
+        
+        assert nodes == [
+            ('P1', 'protein', {'name': 'Protein A', 'organism': 'Homo sapiens'}),
+            ('P3', 'protein', {'name': 'Protein C', 'organism': 'Homo sapiens'}),
+        ]
+    
+    def test_filters_apply_to_csv_input(self):
+        """Test that filters select the same rows for CSV input."""
+        adapter = {{ cookiecutter.__adapter_class_name }}(
+            EXAMPLE_DATA,
+            schema_config_path=SCHEMA_CONFIG,
+            filters={"gene": {"chromosome": ["12"]}},
+        )
+        
+        genes = [node[0] for node in adapter.get_nodes() if node[1] == "gene"]
+        
+        assert genes == ["ENSG00000117411"]
+    
+    @pytest.mark.parametrize("suffix", [".gz", ".bz2", ".zst"])
+    def test_compressed_input(self, suffix):
+        """Test that compressed CSV files are read like uncompressed ones."""
+        if suffix == ".zst":
+            pytest.importorskip("zstandard")
+        plain = list({{ cookiecutter.__adapter_class_name }}(EXAMPLE_DATA, schema_config_path=SCHEMA_CONFIG).get_nodes())
+        compression = {".gz": "gzip", ".bz2": "bz2", ".zst": "zstd"}[suffix]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name in ("proteins.csv", "genes.csv"):
+                pd.read_csv(EXAMPLE_DATA / name, dtype=str).to_csv(
+                    Path(temp_dir) / (name + suffix), index=False, compression=compression
+                )
+            adapter = {{ cookiecutter.__adapter_class_name }}(temp_dir, schema_config_path=SCHEMA_CONFIG, chunk_size=1)
+            adapter.schema["protein"]["input_file"] = "proteins.csv" + suffix
+            adapter.schema["gene"]["input_file"] = "genes.csv" + suffix
+            
+            assert list(adapter.get_nodes()) == plain
+            assert [shard for _, shard in adapter.get_shards("node", shard_size=1)] == [
+                (Path(temp_dir) / ("proteins.csv" + suffix), 0, None),
+                (Path(temp_dir) / ("genes.csv" + suffix), 0, None),
+            ]
+    
+    def test_validate_data_source_reads_only_the_header(self):
+        """Test that validation succeeds on a compressed file that is only intact at its start."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = Path(temp_dir) / "proteins.csv.gz"
+            rows = "".join(f"P{i},Protein {i}\n" for i in range(200_000))
+            with gzip.open(path, "wt") as f:
+                f.write("accession,name\n" + rows)
+            data = path.read_bytes()
+            path.write_bytes(data[:len(data) // 2])  # Truncated: decompressing it all would fail
+            
+            assert {{ cookiecutter.__adapter_class_name }}(path).validate_data_source()
+    
+    def test_validate_data_source_directory(self):
+        """Test that a directory is validated against the mapped ID columns."""
+        assert {{ cookiecutter.__adapter_class_name }}(EXAMPLE_DATA, schema_config_path=SCHEMA_CONFIG).validate_data_source()
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            pd.DataFrame({"id": ["P1"]}).to_csv(Path(temp_dir) / "proteins.csv", index=False)
+            adapter = {{ cookiecutter.__adapter_class_name }}(temp_dir, schema_config_path=SCHEMA_CONFIG)
+            
+            assert not adapter.validate_data_source()